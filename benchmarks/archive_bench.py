@@ -0,0 +1,48 @@
+# Archive report time (core/archive.py) over a directory of generated saved games:
+# parsed in one process, then with a worker pool, then again from the summary cache.
+# Usage: python -m benchmarks.archive_bench [games] [transactions per game]
+import os
+import random
+import sys
+import tempfile
+import time
+
+from core import archive
+from core.game_engine import MonopolyTracker
+from core.player import Player
+
+
+def generate(root, games, transactions):
+    random.seed(1)
+    for g in range(games):
+        tracker = MonopolyTracker(save_file=os.path.join(root, f"game-{g:05d}.json"))
+        players = [Player(name) for name in ("A", "B", "C", "D")]
+        for player in players:
+            tracker.add_player(player)
+            player.money = 10 ** 6
+        for prop in tracker.properties:
+            tracker.purchase_property(random.choice(players), prop)
+        for _ in range(transactions // 2):
+            payer = random.choice(players)
+            prop = random.choice(tracker.properties)
+            if prop.owner is not payer:
+                tracker.charge_rent(payer, prop)
+        tracker.save_game()
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    transactions = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    with tempfile.TemporaryDirectory() as root:
+        generate(root, games, transactions)
+        size = sum(os.path.getsize(os.path.join(root, name)) for name in os.listdir(root))
+        print(f"{games} games, {size / 2 ** 20:.0f} MB of saves")
+        for label, cache, workers in (("1 process", False, 1), (f"{os.cpu_count()} workers", None, None),
+                                      ("cached", None, None)):
+            start = time.perf_counter()
+            _, counts = archive.analyze(root, cache, workers)
+            print(f"{label}: {time.perf_counter() - start:.2f} s ({counts['parsed']} parsed)")
+
+
+if __name__ == "__main__":
+    main()
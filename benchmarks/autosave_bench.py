@@ -0,0 +1,53 @@
+# UI-thread cost of an autosave (capturing the state and handing it to the worker)
+# as the transaction log grows, next to the worker's write time.
+# Usage: python -m benchmarks.autosave_bench
+import os
+import tempfile
+import time
+
+from core.autosave import AutoSaver
+from core.game_engine import MonopolyTracker
+from core.player import Player
+
+SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+SAMPLES = 200
+
+
+def make_tracker(save_dir):
+    tracker = MonopolyTracker()
+    tracker.save_file = os.path.join(save_dir, "latest.json")
+    for i in range(6):
+        tracker.add_player(Player(f"Player {i}"))
+    for i, prop in enumerate(tracker.properties):
+        tracker.players[i % 6].add_property(prop)
+    return tracker
+
+
+def grow_log(tracker, size):
+    now = int(time.time())
+    log = tracker.transaction_log
+    while len(log) < size:
+        log.record("Player 0", -50, "Paid rent for Rue de la Paix", 1450, now)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as save_dir:
+        tracker = make_tracker(save_dir)
+        write_times = []
+
+        def write(state):
+            start = time.perf_counter()
+            tracker.write_state(state)
+            write_times.append(time.perf_counter() - start)
+
+        saver = AutoSaver(write, interval=0)
+        print(f"{'entries':>10} {'UI thread':>12} {'worker write':>14}")
+        for size in SIZES:
+            grow_log(tracker, size)
+            start = time.perf_counter()
+            for _ in range(SAMPLES):
+                saver.submit(tracker.capture_state({"loan_log": {}, "bank_loans": {}}))
+            ui_time = (time.perf_counter() - start) / SAMPLES
+            saver.flush()
+            print(f"{size:>10} {ui_time * 1e6:>9.1f} us {write_times[-1] * 1e3:>11.1f} ms")
+        saver.stop()
@@ -0,0 +1,58 @@
+# 10^5 transfers through MonopolyTracker.batch() vs. one transfer() call each, with
+# one take_changes() per action as the GUI refresh does. Also run journaled, where
+# every log entry becomes a journal record.
+# Usage: python -m benchmarks.batch_bench [transfers]
+import os
+import sys
+import tempfile
+import time
+
+from core.game_engine import MonopolyTracker
+from core.journal import TransactionJournal
+from core.player import Player
+
+
+def make_tracker(tmp, journaled):
+    tracker = MonopolyTracker(journaled=journaled)
+    tracker.save_file = os.path.join(tmp, "bench.json")
+    if journaled:
+        tracker.journal = TransactionJournal(os.path.join(tmp, "bench.journal"))
+    for i in range(6):
+        player = Player(f"Player {i}")
+        player.money = 10 ** 9
+        tracker.add_player(player)
+    tracker.save_game()
+    return tracker
+
+
+def per_call(tracker, count):
+    players = tracker.players
+    for i in range(count):
+        tracker.transfer(players[i % 6], players[(i + 1) % 6], 1)
+        tracker.take_changes()
+
+
+def batched(tracker, count):
+    players = tracker.players
+    with tracker.batch() as batch:
+        for i in range(count):
+            batch.transfer(players[i % 6], players[(i + 1) % 6], 1)
+    tracker.take_changes()
+
+
+if __name__ == "__main__":
+    count = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 5
+    print(f"{count} transfers ({2 * count} log entries)")
+    print(f"{'':<12} {'per call':>10} {'batch':>10} {'speedup':>8}")
+    for journaled in (False, True):
+        times = []
+        for run in (per_call, batched):
+            with tempfile.TemporaryDirectory() as tmp:
+                tracker = make_tracker(tmp, journaled)
+                start = time.perf_counter()
+                run(tracker, count)
+                times.append(time.perf_counter() - start)
+                if tracker.journal:
+                    tracker.journal.close()
+        print(f"{'journaled' if journaled else 'in memory':<12} {times[0]:>8.2f} s {times[1]:>8.2f} s "
+              f"{times[0] / times[1]:>7.1f}x")
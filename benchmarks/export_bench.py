@@ -0,0 +1,62 @@
+# Throughput and peak memory of core.export.export_log: rows written per second and
+# the extra memory the export allocates (tracemalloc peak, measured in a second run
+# since tracing slows it down), for CSV and columnar output, plain and gzipped.
+# Usage: python -m benchmarks.export_bench [rows]   (default 10 million)
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+
+from core.reasons import KINDS
+from core.transaction_log import TransactionLog
+
+PLAYERS = [f"Player {i}" for i in range(6)]
+REASONS = ["Paid rent for Rue de la Paix", "Received rent for Rue de la Paix", "Purchased Avenue Foch",
+           "Built house on Boulevard de Belleville", "Player created"]
+
+
+def make_log(rows):
+    # Built column-wise; recording 10^7 entries one by one would dominate the run
+    kinds = [KINDS.index(kind) for kind in ("rent_paid", "rent_received", "purchase", "build", "player_created")]
+    return TransactionLog.from_columns({
+        "timestamps": array("q", range(1700000000, 1700000000 + rows)),
+        "player_ids": array("i", [i % 6 for i in range(rows)]),
+        "amounts": array("i", [i % 400 - 200 for i in range(rows)]),
+        "balances": array("i", [1500 + i % 900 for i in range(rows)]),
+        "reason_ids": array("i", [i % 7 % 5 for i in range(rows)]),
+        "kinds": array("b", [kinds[i % 7 % 5] for i in range(rows)]),
+        "property_ids": array("h", [i % 28 for i in range(rows)]),
+        "player_names": PLAYERS,
+        "reasons": REASONS,
+    })
+
+
+if __name__ == "__main__":
+    from core.export import export_log
+    rows = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 7
+    log = make_log(rows)
+    cases = [
+        ("csv", dict(format="csv")),
+        ("csv.gz", dict(format="csv", compress=True)),
+        ("cols", dict(format="columns")),
+        ("cols.gz", dict(format="columns", compress=True)),
+        ("csv, one player", dict(format="csv", player="Player 1")),
+        ("cols, rent paid", dict(format="columns", reason_type="rent_paid")),
+    ]
+    print(f"{rows} entries")
+    print(f"{'output':<18} {'written':>10} {'time':>8} {'rows/s':>12} {'size':>10} {'peak mem':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, options in cases:
+            path = os.path.join(tmp, "export")
+            start = time.perf_counter()
+            written = export_log(log, path, **options)
+            elapsed = time.perf_counter() - start
+            size = os.path.getsize(path)
+            tracemalloc.start()
+            export_log(log, path, **options)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{name:<18} {written:>10} {elapsed:>6.1f} s {rows / elapsed:>12,.0f} "
+                  f"{size / 2 ** 20:>7.0f} MB {peak / 2 ** 20:>7.1f} MB")
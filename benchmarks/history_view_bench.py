@@ -0,0 +1,55 @@
+# Frame time of the transaction history view for appends and scrolling on a long
+# log. Needs a display, since it drives a real Tk window.
+# Usage: python -m benchmarks.history_view_bench [entries]
+import random
+import sys
+import time
+import tkinter as tk
+
+from core.transaction_log import TransactionLog
+from gui.history_view import TransactionHistoryView
+
+SAMPLES = 500
+
+
+def build_log(size):
+    log = TransactionLog()
+    now = int(time.time())
+    for i in range(size):
+        log.record("Player", -(i % 500), f"Paid rent for Property {i % 28}", 1500, now + i)
+    return log
+
+
+def frame_times(root, action):
+    times = []
+    for _ in range(SAMPLES):
+        start = time.perf_counter()
+        action()
+        root.update_idletasks()  # Include the redraw Tk does for the change
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2], times[int(len(times) * 0.99)]
+
+
+def report(name, times):
+    p50, p99 = times
+    print(f"{name:<16} p50 {p50 * 1e3:7.3f} ms   p99 {p99 * 1e3:7.3f} ms")
+
+
+if __name__ == "__main__":
+    size = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 6
+    log = build_log(size)
+    root = tk.Tk()
+    view = TransactionHistoryView(root, lambda: log)
+    view.refresh()
+    root.update()
+    print(f"{size} entries")
+
+    def append():
+        log.record("Player", 50, "Received rent for Property 1", 1550)
+        view.refresh()
+
+    report("append", frame_times(root, append))
+    report("scroll (wheel)", frame_times(root, lambda: view.scroll_by(random.choice((-3, 3)))))
+    report("scroll (jump)", frame_times(root, lambda: view.on_scroll("moveto", random.random())))
+    root.destroy()
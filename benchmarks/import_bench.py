@@ -0,0 +1,43 @@
+# CSV import throughput: core.importer.read_csv parsing an exported ledger into a
+# TransactionLog, then resolving properties and replaying it (the rest of
+# MonopolyTracker.rebuild_from_csv), and merging two overlapping exports.
+# Usage: python -m benchmarks.import_bench [rows]   (default 1 million)
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.timeline_bench import make_tracker
+from core import events
+from core.export import export_log
+from core.importer import read_csv, merge_logs, balance_gaps
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    rows = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 6
+    tracker = make_tracker(rows)
+    properties = tracker.load_france_properties()
+    with tempfile.TemporaryDirectory() as tmp:
+        full, half = os.path.join(tmp, "full.csv"), os.path.join(tmp, "half.csv")
+        export_log(tracker.transaction_log, full)
+        export_log(tracker.transaction_log, half, stop=len(tracker.transaction_log) // 2)
+        size = len(tracker.transaction_log)
+
+        log, elapsed = timed(read_csv, full)
+        print(f"read_csv:           {size} rows in {elapsed:.2f} s ({size / elapsed:,.0f} rows/s)")
+        _, elapsed = timed(events.resolve_properties, log, properties)
+        print(f"resolve_properties: {elapsed:.2f} s")
+        _, elapsed = timed(events.replay, events.initial_state(len(properties)), log, len(log))
+        print(f"replay:             {elapsed:.2f} s")
+        # make_tracker's players start with 10^8, so their first entries count as gaps
+        gaps, elapsed = timed(balance_gaps, log)
+        print(f"balance_gaps:       {elapsed:.2f} s ({len(gaps)} gaps)")
+        logs = [read_csv(half), read_csv(full)]
+        merged, elapsed = timed(merge_logs, logs)
+        print(f"merge_logs:         {len(logs[0]) + len(logs[1])} rows into {len(merged)} in {elapsed:.2f} s")
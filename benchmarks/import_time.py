@@ -0,0 +1,35 @@
+# Import cost of the core engine, measured with `python -X importtime`.
+# Usage: python -m benchmarks.import_time [module] [runs]
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def import_times(module):
+    # Returns {module name: (self us, cumulative us)} for one fresh interpreter
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if not fields[0].strip().isdigit():
+            continue  # Header line
+        times[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return times
+
+
+if __name__ == "__main__":
+    module = sys.argv[1] if len(sys.argv) > 1 else "core.game_engine"
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    totals = sorted(import_times(module)[module][1] for _ in range(runs))
+    times = import_times(module)
+    print(f"import {module}: median {totals[len(totals) // 2] / 1000:.1f} ms over {runs} runs")
+    print("slowest modules (cumulative):")
+    for name, (_, cumulative) in sorted(times.items(), key=lambda item: -item[1][1])[1:11]:
+        print(f"  {cumulative / 1000:7.1f} ms  {name}")
+    if "tkinter" in times:
+        print("warning: tkinter is imported")
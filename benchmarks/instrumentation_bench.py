@@ -0,0 +1,42 @@
+# Cost of the instrumentation layer (core/instrumentation.py) on the hottest engine
+# path: rent payments (charge_rent plus two log_transaction calls) with timers never
+# enabled, enabled, and disabled again.
+# Usage: python -m benchmarks.instrumentation_bench [payments]
+import sys
+import time
+
+from core import instrumentation
+from core.game_engine import MonopolyTracker
+from core.player import Player
+
+
+def run(tracker, payer, prop, payments):
+    start = time.perf_counter()
+    for _ in range(payments):
+        tracker.charge_rent(payer, prop)
+    return (time.perf_counter() - start) / payments * 1e6
+
+
+def main():
+    payments = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    tracker = MonopolyTracker()
+    owner, payer = Player("Owner"), Player("Payer")
+    tracker.add_player(owner)
+    tracker.add_player(payer)
+    prop = tracker.properties[0]
+    tracker.purchase_property(owner, prop)
+    payer.money = 10 ** 9
+    run(tracker, payer, prop, payments // 10)  # Warm up
+    print(f"never enabled: {run(tracker, payer, prop, payments):.2f} us per payment")
+    instrumentation.enable()
+    print(f"enabled: {run(tracker, payer, prop, payments):.2f} us per payment")
+    instrumentation.disable()
+    print(f"disabled again: {run(tracker, payer, prop, payments):.2f} us per payment")
+    metrics = instrumentation.snapshot()["metrics"]
+    for name in ("charge_rent", "log_transaction"):
+        print(f"{name}: {metrics[name]['count']} calls, p50 < {metrics[name]['p50']} us, "
+              f"p99 < {metrics[name]['p99']} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Insert throughput of the SQLite ledger (rows streamed through SQLiteLedger.add, as
+# log_transaction does) and latency of filtered queries on the resulting ledger.
+# Usage: python -m benchmarks.ledger_bench [rows]   (default 10 million, ~1.5 GB on disk)
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from core.catalog import load_catalog
+from core.ledger import SQLiteLedger
+from core.property import Property
+
+PLAYERS = [f"Player {i}" for i in range(6)]
+REASONS = ["Paid rent for {}", "Received rent for {}", "Purchased {}", "Built house on {}"]
+SAMPLES = 20
+
+
+def fill(ledger, rows, start):
+    names = [record["name"] for record in load_catalog()]
+    for i in range(rows):
+        ledger.add(start + i, PLAYERS[i % 6], -(i % 400), 1500 - i % 900,
+                   REASONS[i % 7 % 4].format(names[i % len(names)]))
+    ledger.flush()
+
+
+def timed_query(ledger, **filters):
+    times = []
+    for _ in range(SAMPLES):
+        t = time.perf_counter()
+        rows = ledger.query(limit=10000, **filters)
+        times.append(time.perf_counter() - t)
+    return len(rows), statistics.median(times), max(times)
+
+
+if __name__ == "__main__":
+    rows = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 7
+    start = 1700000000
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = SQLiteLedger(os.path.join(tmp, "ledger.db"))
+        properties = [Property(**record) for record in load_catalog()]
+        ledger.save_state([], properties)
+
+        t = time.perf_counter()
+        fill(ledger, rows, start)
+        elapsed = time.perf_counter() - t
+        print(f"insert: {rows} rows in {elapsed:.1f} s ({rows / elapsed:,.0f} rows/s)")
+
+        queries = {
+            "rent Player 1 paid on Green after 90%": dict(
+                player="Player 1", reason_type="rent_paid", color_group="Green", since=start + rows * 9 // 10),
+            "one player": dict(player="Player 2"),
+            "one property": dict(property="Rue de la Paix"),
+            "reason type in last 1%": dict(reason_type="purchase", since=start + rows * 99 // 100),
+            "time window of 1000 rows": dict(since=start + rows // 2, until=start + rows // 2 + 999),
+        }
+        print(f"{'query (newest 10000 rows)':<40} {'rows':>6} {'median':>10} {'max':>10}")
+        for name, filters in queries.items():
+            count, median, worst = timed_query(ledger, **filters)
+            print(f"{name:<40} {count:>6} {median * 1e3:>7.2f} ms {worst * 1e3:>7.2f} ms")
+        ledger.close()
@@ -0,0 +1,50 @@
+# Time to plan a liquidation for a player holding the whole catalog (every street
+# group with random buildings), over a range of debts. "Cold" clears the per-group
+# option cache first, as after the player's holdings change; "warm" reuses it.
+# Usage: python -m benchmarks.liquidation_bench [plans]
+import random
+import sys
+import time
+
+from core import liquidation
+from core.board import HOUSE_COSTS
+from core.game_engine import MonopolyTracker
+from core.player import Player
+
+
+def main():
+    plans = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    random.seed(1)
+    tracker = MonopolyTracker()
+    player = Player("Debtor")
+    tracker.add_player(player)
+    player.money = 10 ** 6
+    for prop in tracker.properties:
+        tracker.purchase_property(player, prop)
+    for prop in tracker.properties:
+        if prop.color_group in HOUSE_COSTS:
+            for _ in range(random.randint(0, 5)):
+                tracker.build_house(player, prop)
+    player.money = 0
+    tracker.liquidation_plan(player, 1)  # Landing probabilities are computed once per catalog
+    worth = tracker.liquidation_plan(player, 10 ** 6)["cash"]
+    mortgages = sum(liquidation.mortgage_value(prop) for prop in tracker.properties)
+    debts = [random.randint(1, worth + mortgages) for _ in range(plans)]
+    print(f"{len(player.properties)} properties, {sum(prop.houses for prop in tracker.properties)} buildings, "
+          f"up to ${worth + mortgages} to raise")
+
+    for label, clear in (("cold", True), ("warm", False)):
+        times = []
+        for debt in debts:
+            if clear:
+                liquidation._group_options.cache_clear()
+            start = time.perf_counter()
+            tracker.liquidation_plan(player, debt)
+            times.append(time.perf_counter() - start)
+        times.sort()
+        print(f"{label}: median {times[len(times) // 2] * 1000:.2f} ms, "
+              f"worst {times[-1] * 1000:.2f} ms over {plans} plans")
+
+
+if __name__ == "__main__":
+    main()
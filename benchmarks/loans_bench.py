@@ -0,0 +1,34 @@
+# Per-action cost of the loan book as the number of outstanding loans grows: lending,
+# checking one borrower after a balance change, and repaying a loan.
+# Usage: python -m benchmarks.loans_bench
+import random
+import time
+
+from core.loans import LoanBook
+
+SIZES = [10 ** 4, 10 ** 5, 10 ** 6]
+ACTIONS = 10000
+PLAYERS = [f"Player {i}" for i in range(8)]
+PAIRS = [(borrower, lender) for borrower in PLAYERS for lender in PLAYERS if borrower != lender]
+
+
+def per_action(func):
+    start = time.perf_counter()
+    for _ in range(ACTIONS):
+        func()
+    return (time.perf_counter() - start) / ACTIONS
+
+
+if __name__ == "__main__":
+    print(f"{'loans':>10} {'lend':>10} {'check':>10} {'repay':>10}")
+    for size in SIZES:
+        rng = random.Random(1)
+        book = LoanBook()
+        for _ in range(size):
+            book.add(*rng.choice(PAIRS), rng.randrange(1, 500))
+        lend = per_action(lambda: book.add(*rng.choice(PAIRS), rng.randrange(1, 500)))
+        # A balance change that does not cover the borrower's smallest loan
+        check = per_action(lambda: book.suggestions(rng.choice(PLAYERS), 0))
+        # Repays the smallest loan between a random pair (every pair has loans left)
+        repay = per_action(lambda: book.remove(*rng.choice(PAIRS)))
+        print(f"{size:>10} {lend * 1e6:>7.2f} us {check * 1e6:>7.2f} us {repay * 1e6:>7.2f} us")
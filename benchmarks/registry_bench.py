@@ -0,0 +1,53 @@
+# Compare the old linear-scan owner resolution and name lookups with Registry
+# on large synthetic boards.
+# Usage: python -m benchmarks.registry_bench
+import random
+import time
+
+from core.player import Player
+from core.property import Property
+from core.registry import Registry
+
+BOARDS = [(1000, 100), (5000, 300), (10000, 500)]  # (properties, players)
+
+
+def make_board(num_properties, num_players):
+    players = [Player(f"Player {i}") for i in range(num_players)]
+    properties = []
+    for i in range(num_properties):
+        prop = Property(f"Property {i}", 100, [10, 50, 150, 450, 625, 750], f"Group {i // 3}")
+        if i % 2:
+            owner = players[i % num_players]
+            prop.owner = owner.name  # Owners are names straight after loading a save
+            owner.properties.append(Property(prop.name, prop.price, prop.rent, prop.color_group, owner.name))
+        properties.append(prop)
+    return players, properties
+
+
+def legacy_resolve(players, properties):
+    for player in players:
+        player.properties = [next(prop for prop in properties if prop.name == p.name) for p in player.properties]
+    for prop in properties:
+        if prop.owner:
+            prop.owner = next(player for player in players if player.name == prop.owner)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print(f"{'properties':>10} {'players':>8} {'load (scan)':>12} {'load (index)':>13} {'lookup (scan)':>14} {'lookup (index)':>15}")
+    for num_properties, num_players in BOARDS:
+        legacy_load = timed(legacy_resolve, *make_board(num_properties, num_players))
+        players, properties = make_board(num_properties, num_players)
+        registry = Registry()
+        indexed_load = timed(registry.reset, players, properties)
+
+        names = [random.choice(players).name for _ in range(1000)]
+        scan = timed(lambda: [next(p for p in players if p.name == name) for name in names]) / len(names)
+        indexed = timed(lambda: [registry.players[name] for name in names]) / len(names)
+        print(f"{num_properties:>10} {num_players:>8} {legacy_load * 1e3:>9.1f} ms {indexed_load * 1e3:>10.1f} ms "
+              f"{scan * 1e6:>11.2f} us {indexed * 1e6:>12.2f} us")
@@ -0,0 +1,71 @@
+# Replication cost per change against game size: a leader with a log of `size`
+# transactions streams `changes` rent payments to a follower over a local socket.
+# Reports bytes sent and follower apply time per change, then the same for the
+# snapshot a follower that fell too far behind is sent instead.
+# Usage: python -m benchmarks.replication_bench [changes] [sizes...]
+import sys
+import time
+
+from core.game_engine import MonopolyTracker
+from core.player import Player
+from core.replication import ReplicationLog, ReplicationServer
+
+PORT = 8771
+
+
+def wait_for(follower, seq):
+    # Polls until the follower has applied seq; returns the time spent applying
+    applying = 0.0
+    while follower.seq < seq:
+        start = time.perf_counter()
+        if not follower.poll():
+            time.sleep(0.001)
+            continue
+        applying += time.perf_counter() - start
+    return applying
+
+
+def run(size, changes):
+    leader = MonopolyTracker()
+    players = [Player(name) for name in ("A", "B", "C", "D")]
+    for player in players:
+        leader.add_player(player)
+    for player in players:
+        player.money = 10000 + size
+    for prop in leader.properties[:12]:
+        leader.purchase_property(players[0], prop)
+    for i in range(size):
+        leader.transfer(players[1 + i % 3], players[0], 1)
+    log = leader.replication = ReplicationLog(leader, snapshot_interval=changes * 4)
+    server = ReplicationServer(log, port=PORT)
+    server.start()
+    follower = MonopolyTracker().follow(port=PORT)
+
+    start = time.perf_counter()
+    while not follower.poll():  # The follower starts from a snapshot
+        time.sleep(0.001)
+    snapshot_time = time.perf_counter() - start
+    snapshot_bytes = len(log._snapshot_line(log._snapshot))
+
+    first = log.seq + 1
+    applying = 0.0
+    for i in range(changes):
+        leader.charge_rent(players[1 + i % 3], leader.properties[i % 12])
+        applying += wait_for(follower, log.seq)
+    sent = sum(map(len, log.lines[first - log.first:]))
+    print(f"{len(leader.transaction_log):>8} transactions: {sent / changes:.0f} bytes and "
+          f"{applying / changes * 1e6:.0f} us to apply per change; snapshot {snapshot_bytes / 1024:.0f} KB "
+          f"in {snapshot_time * 1000:.1f} ms")
+    follower.stop()
+    server.close()
+
+
+def main():
+    changes = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    sizes = [int(arg) for arg in sys.argv[2:]] or [1000, 10000, 100000]
+    for size in sizes:
+        run(size, changes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# File size and save/load time of the original JSON layout vs. the current format
+# (JSON, binary, binary + zlib).
+# Usage: python -m benchmarks.save_format_bench [sizes...]
+import io
+import json
+import sys
+import time
+
+from core.game_engine import MonopolyTracker
+from core.player import Player
+from core import save_format
+
+
+def make_tracker(size):
+    tracker = MonopolyTracker()
+    for i in range(6):
+        tracker.add_player(Player(f"Player {i}"))
+    for i, prop in enumerate(tracker.properties):
+        tracker.players[i % 6].add_property(prop)
+    log = tracker.transaction_log
+    start = 1700000000
+    while len(log) < size:
+        i = len(log)
+        log.record(f"Player {i % 6}", -(i % 400), f"Paid rent for {tracker.properties[i % 27].name}", 1500 - i % 900, start + i)
+    return tracker
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def legacy(tracker):
+    # The original layout, timed from an in-memory list of dicts as the engine used to hold it
+    data = {
+        "players": [p.to_dict() for p in tracker.players],
+        "properties": [p.to_dict() for p in tracker.properties],
+        "transactions": tracker.transaction_log.to_list()
+    }
+    raw, save = timed(lambda: json.dumps(data, default=str).encode("utf-8"))
+    _, load = timed(lambda: json.loads(raw))
+    return len(raw), save, load
+
+
+def current(tracker, binary, compress):
+    def save():
+        document = save_format.build_document(tracker.players, tracker.properties)
+        document["transactions"] = tracker.transaction_log.columns()
+        f = io.BytesIO()
+        save_format.write_document(f, document, binary, compress)
+        return f.getvalue()
+
+    def load():
+        if raw[:4] == save_format.MAGIC:
+            document = save_format.decode_binary(raw)
+        else:
+            document = json.loads(raw)
+        return save_format.load_document(document)
+
+    raw, save_time = timed(save)
+    _, load_time = timed(load)
+    return len(raw), save_time, load_time
+
+
+if __name__ == "__main__":
+    sizes = [int(float(s)) for s in sys.argv[1:]] or [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+    print(f"{'entries':>10} {'format':<14} {'size':>10} {'save':>10} {'load':>10}")
+    for size in sizes:
+        tracker = make_tracker(size)
+        rows = [("v1 json", legacy(tracker))]
+        version = f"v{save_format.FORMAT_VERSION}"
+        rows.append((f"{version} json", current(tracker, False, False)))
+        rows.append((f"{version} binary", current(tracker, True, False)))
+        rows.append((f"{version} binary+zlib", current(tracker, True, True)))
+        for name, (length, save, load) in rows:
+            print(f"{size:>10} {name:<14} {length / 2 ** 20:>7.2f} MB {save * 1e3:>7.1f} ms {load * 1e3:>7.1f} ms")
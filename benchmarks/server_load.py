@@ -0,0 +1,127 @@
+# Load test for the multi-game server (core/server.py): starts it in a subprocess,
+# opens many games over a pool of connections, subscribes every game on another
+# connection, then runs one task per game sending transfers and reports action
+# latency percentiles and throughput. Games act back to back (the server saturated),
+# or every `interval` ms, as tables would.
+# Usage: python -m benchmarks.server_load [games] [actions per game] [connections] [interval]
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PORT = 8766
+
+
+class Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.pending = {}  # Request id -> future
+        self.ids = itertools.count()
+        self.events = 0
+        self.task = asyncio.ensure_future(self._read())
+
+    async def _read(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            if "event" in message:
+                self.events += 1
+            else:
+                self.pending.pop(message["id"]).set_result(message)
+
+    async def call(self, op, game, **args):
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        self.writer.write((json.dumps({"id": request_id, "op": op, "game": game, "args": args}) + "\n").encode())
+        response = await future
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+
+async def run(games, actions, connections, interval):
+    pool = []
+    for _ in range(connections):
+        reader, writer = await asyncio.open_connection("127.0.0.1", PORT, limit=1 << 22)
+        pool.append(Connection(reader, writer))
+    ids = [f"table-{i}" for i in range(games)]
+
+    async def setup(i, game):
+        actor, follower = pool[i % connections], pool[(i + 1) % connections]
+        await actor.call("open", game)
+        await actor.call("add_player", game, name="A")
+        await actor.call("add_player", game, name="B")
+        await follower.call("subscribe", game)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(setup(i, game) for i, game in enumerate(ids)))
+    print(f"Opened {games} games in {time.perf_counter() - start:.1f} s")
+
+    latencies = []
+
+    async def play(i, game):
+        actor = pool[i % connections]
+        if interval:
+            await asyncio.sleep(interval * i / games)  # Spread the games over one interval
+        for n in range(actions):
+            payer, recipient = ("A", "B") if n % 2 == 0 else ("B", "A")
+            sent = time.perf_counter()
+            await actor.call("transfer", game, payer=payer, recipient=recipient, amount=10)
+            latencies.append(time.perf_counter() - sent)
+            if interval:
+                await asyncio.sleep(max(0.0, interval - (time.perf_counter() - sent)))
+
+    events_before = sum(connection.events for connection in pool)
+    start = time.perf_counter()
+    await asyncio.gather(*(play(i, game) for i, game in enumerate(ids)))
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.5)  # Let the last diffs arrive
+    diffs = sum(connection.events for connection in pool) - events_before
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(f"{len(latencies)} actions over {games} concurrent games in {elapsed:.1f} s "
+          f"({len(latencies) / elapsed:.0f} actions/s), {diffs} diffs pushed to subscribers")
+    print(f"Latency: p50 {percentile(0.5):.1f} ms, p95 {percentile(0.95):.1f} ms, "
+          f"p99 {percentile(0.99):.1f} ms, max {latencies[-1] * 1000:.1f} ms")
+    for connection in pool:
+        connection.writer.close()
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    actions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    connections = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    interval = float(sys.argv[4]) / 1000 if len(sys.argv) > 4 else 0.0
+    with tempfile.TemporaryDirectory() as root:
+        server = subprocess.Popen([sys.executable, "-m", "core.server", "--port", str(PORT), "--root", root],
+                                  stdout=subprocess.PIPE, text=True)
+        try:
+            server.stdout.readline()  # "Serving games ..." once listening
+            asyncio.run(run(games, actions, connections, interval))
+            with open(f"/proc/{server.pid}/status") as f:
+                rss = next((line.split()[1] for line in f if line.startswith("VmRSS")), None)
+            if rss:
+                print(f"Server memory: {int(rss) // 1024} MB")
+        except FileNotFoundError:
+            pass  # No /proc
+        finally:
+            start = time.perf_counter()
+            server.terminate()  # Saves every changed game before exiting
+            server.wait()
+            saved = sum(os.path.exists(os.path.join(root, game, "latest.json")) for game in os.listdir(root))
+            print(f"Server saved {saved} games on shutdown in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
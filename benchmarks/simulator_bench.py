@@ -0,0 +1,42 @@
+# Simulated turns per second of the Monte Carlo simulator, on one core and on all
+# cores. Usage: python -m benchmarks.simulator_bench [games] [turns]
+import os
+import random
+import sys
+import time
+
+from core.game_engine import MonopolyTracker
+from core.player import Player
+from core.simulator import simulate
+
+
+def make_table(num_players=4):
+    random.seed(1)
+    tracker = MonopolyTracker()
+    for i in range(num_players):
+        tracker.add_player(Player(f"Player {i}"))
+    for prop in tracker.properties:
+        if random.random() < 0.7:
+            random.choice(tracker.players).add_property(prop)
+    return tracker
+
+
+def run(tracker, games, turns, workers):
+    start = time.perf_counter()
+    result = simulate(tracker, games, turns, workers=workers, seed=1)
+    elapsed = time.perf_counter() - start
+    return result, result.turns / elapsed
+
+
+if __name__ == "__main__":
+    games = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 4
+    turns = int(float(sys.argv[2])) if len(sys.argv) > 2 else 500
+    tracker = make_table()
+    result, rate = run(tracker, games, turns, workers=1)
+    print(f"1 worker: {rate:,.0f} turns/s ({result.turns:,} turns)")
+    cores = os.cpu_count() or 1
+    if cores > 1:
+        _, rate = run(tracker, games, turns, workers=cores)
+        print(f"{cores} workers: {rate:,.0f} turns/s ({rate / cores:,.0f} per core)")
+    print("bankruptcy odds:", {name: round(p, 3) for name, p in result.bankruptcy_odds().items()})
+    print("rent per game by group:", {group: round(r, 1) for group, r in result.expected_rent_by_group().items()})
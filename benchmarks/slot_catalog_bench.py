@@ -0,0 +1,49 @@
+# Time to list a folder of save slots (core/slots.py) for the Load picker: from the
+# metadata sidecars (cold, then an incremental refresh after one slot changed)
+# against parsing every save in full.
+# Usage: python -m benchmarks.slot_catalog_bench [slots] [transactions per save]
+import os
+import sys
+import tempfile
+import time
+
+from core import save_format, slots
+from core.game_engine import MonopolyTracker
+from core.player import Player
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    transactions = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    with tempfile.TemporaryDirectory() as folder:
+        tracker = MonopolyTracker()
+        players = [Player(name) for name in ("A", "B", "C", "D")]
+        for player in players:
+            tracker.add_player(player)
+        for i in range(transactions // 2):
+            tracker.transfer(players[i % 4], players[(i + 1) % 4], 1)
+        for i in range(count):
+            tracker.use_save_file(slots.slot_path(f"game {i}", folder))
+            tracker.save_game()
+        size = sum(os.path.getsize(os.path.join(folder, name)) for name in os.listdir(folder))
+        print(f"{count} slots, {size / 2 ** 20:.0f} MB")
+
+        start = time.perf_counter()
+        for name in os.listdir(folder):
+            if not name.endswith(slots.METADATA_SUFFIX):
+                save_format.read_document(os.path.join(folder, name))
+        print(f"Parsing every save: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        catalog = slots.SlotCatalog(folder)
+        start = time.perf_counter()
+        catalog.refresh()
+        print(f"Catalog from sidecars: {(time.perf_counter() - start) * 1000:.1f} ms")
+        tracker.adjust_money(players[0], 1)
+        tracker.save_game()
+        start = time.perf_counter()
+        catalog.refresh()
+        print(f"Refresh after one save: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
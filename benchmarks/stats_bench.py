@@ -0,0 +1,49 @@
+# Cost of keeping GameStats current: time per GameStats.record call (as made by
+# log_transaction) and a full GameStats.from_log rebuild vs. recording every entry.
+# Usage: python -m benchmarks.stats_bench [sizes...]
+import random
+import sys
+import time
+
+from core.catalog import load_catalog
+from core.property import Property
+from core.reasons import KINDS
+from core.stats import GameStats
+from core.transaction_log import TransactionLog
+
+PLAYERS = [f"Player {i}" for i in range(6)]
+
+
+def make_log(size, properties):
+    rng = random.Random(1)
+    log = TransactionLog()
+    start = 1700000000
+    for i in range(size):
+        log.record(PLAYERS[i % 6], rng.randrange(-400, 400), "Rent", 1500, start + i,
+                   kind=KINDS[rng.randrange(len(KINDS))], property_id=rng.randrange(-1, len(properties)))
+    return log
+
+
+def record_all(log, properties):
+    stats = GameStats(properties)
+    names = log.player_names
+    for i in range(len(log)):
+        stats.record(log.kinds[i], names[log.player_ids[i]], log.amounts[i], log.property_ids[i], log.timestamps[i])
+    return stats
+
+
+if __name__ == "__main__":
+    sizes = [int(float(s)) for s in sys.argv[1:]] or [10 ** 4, 10 ** 5, 10 ** 6]
+    properties = [Property(**record) for record in load_catalog()]
+    GameStats.from_log(make_log(10, properties), properties)  # Import NumPy outside the timings
+    print(f"{'entries':>10} {'per record':>12} {'from_log':>10} {'speedup':>8}")
+    for size in sizes:
+        log = make_log(size, properties)
+        start = time.perf_counter()
+        recorded = record_all(log, properties)
+        incremental = time.perf_counter() - start
+        start = time.perf_counter()
+        rebuilt = GameStats.from_log(log, properties)
+        rebuild = time.perf_counter() - start
+        assert rebuilt.players == recorded.players and rebuilt.property_rent == recorded.property_rent
+        print(f"{size:>10} {incremental / size * 1e6:>9.2f} us {rebuild * 1e3:>7.0f} ms {incremental / rebuild:>7.1f}x")
@@ -0,0 +1,55 @@
+# Seek latency of MonopolyTracker.state_at on long games: the one-off cost of building
+# checkpoints, then random seeks (one checkpoint copy plus a bounded replay each).
+# Usage: python -m benchmarks.timeline_bench [sizes...]
+import random
+import statistics
+import sys
+import time
+
+from core.game_engine import MonopolyTracker
+from core.player import Player
+
+SEEKS = 1000
+
+
+def make_tracker(size):
+    # Six players trading the board back and forth, paying rent and building
+    tracker = MonopolyTracker()
+    players = [Player(f"Player {i}") for i in range(6)]
+    for player in players:
+        player.money = 10 ** 8
+        tracker.add_player(player)
+        tracker.log_transaction(player, 0, "Player created")
+    rng = random.Random(1)
+    props = tracker.properties
+    while len(tracker.transaction_log) < size:
+        prop = rng.choice(props)
+        player = rng.choice(players)
+        if prop.owner is None:
+            tracker.purchase_property(player, prop)
+        elif prop.owner is player:
+            tracker.sell_property(player, rng.choice([p for p in players if p is not player]), prop, prop.price)
+        else:
+            tracker.charge_rent(player, prop)
+    return tracker
+
+
+if __name__ == "__main__":
+    sizes = [int(float(s)) for s in sys.argv[1:]] or [10 ** 4, 10 ** 5, 10 ** 6]
+    print(f"{'entries':>10} {'checkpoints':>12} {'median seek':>12} {'p99 seek':>10}")
+    for size in sizes:
+        tracker = make_tracker(size)
+        total = len(tracker.transaction_log)
+        start = time.perf_counter()
+        tracker.state_at(total)
+        build = time.perf_counter() - start
+        rng = random.Random(2)
+        times = []
+        for _ in range(SEEKS):
+            index = rng.randrange(total + 1)
+            start = time.perf_counter()
+            tracker.state_at(index)
+            times.append(time.perf_counter() - start)
+        times.sort()
+        print(f"{total:>10} {build * 1e3:>9.0f} ms {statistics.median(times) * 1e3:>9.3f} ms "
+              f"{times[int(len(times) * 0.99)] * 1e3:>7.3f} ms")
@@ -0,0 +1,43 @@
+# Time of a full pairwise trade search (MonopolyTracker.trade_suggestions) with the
+# catalog dealt out at random between 2-8 players, the first time after an
+# ownership change and again from the cache.
+# Usage: python -m benchmarks.trade_bench [deals]
+import random
+import sys
+import time
+
+from core.game_engine import MonopolyTracker
+from core.player import Player
+
+
+def main():
+    deals = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    random.seed(1)
+    for player_count in (2, 4, 6, 8):
+        cold, warm, found = [], [], 0
+        for _ in range(deals):
+            tracker = MonopolyTracker()
+            players = [Player(f"Player {i}") for i in range(player_count)]
+            for player in players:
+                tracker.add_player(player)
+                player.money = 10 ** 6
+            props = list(tracker.properties)
+            random.shuffle(props)
+            for i, prop in enumerate(props[:random.randint(len(props) // 2, len(props))]):
+                tracker.purchase_property(players[i % player_count], prop)
+            for player in players:
+                player.money = random.randint(0, 3000)
+            start = time.perf_counter()
+            found += len(tracker.trade_suggestions(20))
+            cold.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            tracker.trade_suggestions(20)
+            warm.append(time.perf_counter() - start)
+        cold.sort()
+        print(f"{player_count} players: search median {cold[len(cold) // 2] * 1000:.1f} ms, "
+              f"worst {cold[-1] * 1000:.1f} ms, cached {max(warm) * 1000:.2f} ms, "
+              f"{found / deals:.1f} suggestions per deal")
+
+
+if __name__ == "__main__":
+    main()
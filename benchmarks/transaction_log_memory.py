@@ -0,0 +1,59 @@
+# Compare memory used by the old list-of-dicts log with TransactionLog.
+# Usage: python -m benchmarks.transaction_log_memory [sizes...]
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from core.transaction_log import TransactionLog
+
+PLAYERS = ["John", "Jane", "Alice", "Bob", "Carol", "Dave"]
+PROPERTIES = ["Rue de la Paix", "Avenue des Champs-Élysées", "Boulevard de la Villette", "Avenue de Neuilly"]
+
+
+def fake_transaction(i):
+    player = PLAYERS[i % len(PLAYERS)]
+    prop = PROPERTIES[i % len(PROPERTIES)]
+    return player, -(i % 500), f"Paid rent for {prop}", 1500 - i % 1000
+
+
+def build_dicts(size):
+    log = []
+    now = time.time()
+    for i in range(size):
+        player, amount, reason, balance = fake_transaction(i)
+        log.append({
+            "timestamp": datetime.fromtimestamp(now + i).strftime("%Y-%m-%d %H:%M:%S"),
+            "player": player,
+            "amount": amount,
+            "new_balance": balance,
+            "reason": reason
+        })
+    return log
+
+
+def build_columns(size):
+    log = TransactionLog()
+    now = int(time.time())
+    for i in range(size):
+        player, amount, reason, balance = fake_transaction(i)
+        log.record(player, amount, reason, balance, now + i)
+    return log
+
+
+def measure(builder, size):
+    tracemalloc.start()
+    log = builder(size)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del log
+    return current
+
+
+if __name__ == "__main__":
+    sizes = [int(float(s)) for s in sys.argv[1:]] or [10 ** 4, 10 ** 6, 10 ** 7]
+    print(f"{'entries':>10} {'list of dicts':>15} {'TransactionLog':>15} {'ratio':>7}")
+    for size in sizes:
+        dicts = measure(build_dicts, size)
+        columns = measure(build_columns, size)
+        print(f"{size:>10} {dicts / 2 ** 20:>12.1f} MB {columns / 2 ** 20:>12.1f} MB {dicts / columns:>6.1f}x")
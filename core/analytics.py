@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+
+from core import board
+from core.rent import TIERS, AVERAGE_ROLL
+
+DEFAULT_RULES = {
+    "jail": True,  # Landing on Go To Jail or rolling three doubles sends a player to jail
+    "max_jail_turns": board.MAX_JAIL_TURNS
+}
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "cache")
+RANKINGS_VERSION = 2  # Bump when ranking rows change, so cached files are not reused
+
+_memory = {}  # Cache key -> results, for repeated queries in the same process
+
+# Probability of each (total, is_double) outcome of two dice
+DICE = {}
+for _a in range(1, 7):
+    for _b in range(1, 7):
+        DICE[(_a + _b, _a == _b)] = DICE.get((_a + _b, _a == _b), 0) + 1 / 36
+
+
+def transition_matrix(rules=DEFAULT_RULES):
+    # Squares move like MonopolyGUI.move_player: (position + roll) % 40. With jail rules
+    # a state also remembers the doubles rolled this turn (0-2), and jailed players
+    # have one state per failed escape attempt.
+    import numpy as np
+    size = board.BOARD_SIZE
+    if not rules.get("jail"):
+        matrix = np.zeros((size, size))
+        for square in range(size):
+            for (roll, _), p in DICE.items():
+                matrix[square, (square + roll) % size] += p
+        return matrix, list(range(size))
+
+    jail_turns = rules.get("max_jail_turns", board.MAX_JAIL_TURNS)
+    squares = [square for square in range(size) for _ in range(3)] + [board.JAIL_SQUARE] * jail_turns
+    matrix = np.zeros((len(squares), len(squares)))
+
+    def free(square, doubles):
+        return square * 3 + doubles
+
+    jail = 3 * size
+    for square in range(size):
+        for doubles in range(3):
+            state = free(square, doubles)
+            for (roll, is_double), p in DICE.items():
+                if is_double and doubles == 2:
+                    matrix[state, jail] += p
+                    continue
+                target = (square + roll) % size
+                if target == board.GO_TO_JAIL_SQUARE:
+                    matrix[state, jail] += p
+                else:
+                    matrix[state, free(target, doubles + 1 if is_double else 0)] += p
+    for attempt in range(jail_turns):
+        state = jail + attempt
+        for (roll, is_double), p in DICE.items():
+            if is_double or attempt == jail_turns - 1:
+                # Leaves on doubles, or pays the fine after the last attempt, and moves
+                matrix[state, free((board.JAIL_SQUARE + roll) % size, 0)] += p
+            else:
+                matrix[state, state + 1] += p
+    return matrix, squares
+
+
+def solve(rules=DEFAULT_RULES):
+    # Steady-state probability of a roll ending on each square, and the average
+    # number of rolls in a turn
+    import numpy as np
+    matrix, squares = transition_matrix(rules)
+    n = len(squares)
+    system = matrix.T - np.eye(n)
+    system[-1] = 1  # Replace one equation with "probabilities sum to 1"
+    target = np.zeros(n)
+    target[-1] = 1
+    steady = np.linalg.solve(system, target)
+    landing = np.clip(np.bincount(squares, weights=steady, minlength=board.BOARD_SIZE), 0, None)
+    if rules.get("jail"):
+        # A turn ends unless the roll was a double that kept the player free
+        turn_starts = [i for i in range(n) if i >= 3 * board.BOARD_SIZE or i % 3 == 0]
+        turn_end = steady @ matrix[:, turn_starts].sum(axis=1)
+        rolls_per_turn = 1 / turn_end
+    else:
+        rolls_per_turn = 1.0
+    return landing.tolist(), float(rolls_per_turn)
+
+
+def catalog_hash(properties):
+    records = [[prop.name, prop.price, prop.rent, prop.color_group] for prop in properties]
+    return hashlib.sha256(json.dumps(records, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def property_rankings(properties, rules=DEFAULT_RULES, cache_dir=DEFAULT_CACHE_DIR):
+    # Expected rent per opponent turn and payback period (in opponent turns) for every
+    # property and development level, best first. Stations and utilities only get
+    # level 0: their higher rents come from owning more of the group, not from
+    # building, so they have no cost of their own. Results are memoized in memory and
+    # on disk, keyed by the catalog and the rule set.
+    key = hashlib.sha256((catalog_hash(properties) + json.dumps(rules, sort_keys=True)
+                          + str(RANKINGS_VERSION)).encode("utf-8")).hexdigest()[:16]
+    if key in _memory:
+        return _memory[key]
+    cache_file = os.path.join(cache_dir, f"rankings-{key}.json") if cache_dir else None
+    if cache_file and os.path.exists(cache_file):
+        with open(cache_file, encoding="utf-8") as f:
+            _memory[key] = json.load(f)
+        return _memory[key]
+
+    landing, rolls_per_turn = solve(rules)
+    results = {"landing": landing, "rolls_per_turn": rolls_per_turn, "rankings": []}
+    for prop, square in zip(properties, board.property_squares(properties)):
+        per_turn = landing[square] * rolls_per_turn
+        rents = prop.rent if isinstance(prop.rent, list) else [prop.rent]
+        levels = TIERS if prop.color_group in board.HOUSE_COSTS else 1
+        for level, rent in enumerate(rents[:levels]):
+            if prop.color_group == "Utility":
+                rent = rent * AVERAGE_ROLL
+            cost = prop.price + board.HOUSE_COSTS.get(prop.color_group, 0) * level
+            expected = per_turn * rent
+            results["rankings"].append({
+                "property": prop.name,
+                "color_group": prop.color_group,
+                "square": square,
+                "level": level,
+                "landing_probability": landing[square],
+                "expected_rent": expected,
+                "cost": cost,
+                "payback_turns": cost / expected if expected else None
+            })
+    results["rankings"].sort(key=lambda row: -row["expected_rent"])
+
+    if cache_file:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_file = cache_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(results, f)
+        os.replace(tmp_file, cache_file)
+    _memory[key] = results
+    return results
+
+
+def landing_per_turn(properties, rules=DEFAULT_RULES):
+    # Chance per opponent turn of landing on each catalog property
+    results = property_rankings(properties, rules)
+    landing, rolls_per_turn = results["landing"], results["rolls_per_turn"]
+    return [landing[square] * rolls_per_turn for square in board.property_squares(properties)]
@@ -0,0 +1,257 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from core import events, reasons, save_format
+from core.analytics import catalog_hash
+from core.board import HOUSE_COSTS
+from core.catalog import load_catalog
+from core.importer import read_csv
+from core.property import Property
+from core.slots import METADATA_SUFFIX
+
+# Reports across an archive of finished games: a directory tree of saves (any layout
+# read_document accepts) and exported transaction CSVs. Each file is boiled down to a
+# small JSON summary in a worker process; summaries are cached next to the archive,
+# keyed by the file's mtime and size (and its content hash once those change), so a
+# rerun only parses new or changed files. The report merges the summaries.
+CACHE_FILE = ".archive_cache.json"
+CACHE_VERSION = 1  # Bump when summaries change shape
+SUFFIXES = (".json", ".csv")
+CURVE_POINTS = 20  # Points on the cash-flow curve, evenly spaced through each game
+HASH_CHUNK = 1 << 20
+
+PURCHASE = reasons.KIND_CODES["purchase"]
+BUILD = reasons.KIND_CODES["build"]
+RENT_RECEIVED = reasons.KIND_CODES["rent_received"]
+
+
+def discover(root):
+    # Relative paths of the saves and CSVs under root, skipping hidden files and folders
+    # and save slot sidecars
+    paths = []
+    for folder, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in sorted(files):
+            if name.endswith(SUFFIXES) and not name.startswith(".") and not name.endswith(METADATA_SUFFIX):
+                paths.append(os.path.relpath(os.path.join(folder, name), root))
+    return paths
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def summarize_file(path, known_hash=None):
+    # (content hash, summary), with summary None when the content still hashes to
+    # known_hash. Runs in a worker process. Files that aren't games get {"error": ...}.
+    digest = file_hash(path)
+    if digest == known_hash:
+        return digest, None
+    try:
+        if path.endswith(".csv"):
+            properties = [Property(**p) for p in load_catalog()]
+            log = read_csv(path)
+            events.resolve_properties(log, properties)
+            state = events.replay(events.initial_state(len(properties)), log, len(log))
+            worth = {name: state["money"][name] for name in state["players"]}
+            for prop, owner, houses in zip(properties, state["owners"], state["houses"]):
+                if owner in worth:
+                    worth[owner] += prop.price + houses * HOUSE_COSTS.get(prop.color_group, 0)
+        else:
+            players, properties, log = save_format.load_document(save_format.read_document(path))
+            worth = {player.name: player.money + sum(prop.price + prop.houses * HOUSE_COSTS.get(prop.color_group, 0)
+                                                     for prop in player.properties)
+                     for player in players}
+        return digest, summarize(log, properties, worth)
+    except Exception as e:
+        return digest, {"error": f"{type(e).__name__}: {e}"}
+
+
+def summarize(log, properties, worth):
+    # One game's share of the report. worth is each player's final net worth (cash
+    # plus what their properties and buildings cost); the richest player won.
+    import numpy as np
+    kinds = np.frombuffer(log.kinds, dtype=np.int8)
+    playing = kinds != events.CREATED  # The catalog entries come first
+    start = int(np.argmax(playing)) if playing.any() else len(log)
+    played = len(log) - start
+    summary = {"transactions": played,
+               "winner": max(worth, key=worth.get) if len(worth) > 1 else None,
+               "seconds": log.timestamps[-1] - log.timestamps[start] if played else 0}
+
+    # The first property each player bought from the bank
+    first = {}
+    for i in np.flatnonzero(kinds == PURCHASE):
+        name = log.player_names[log.player_ids[i]]
+        prop = log.property_ids[i]
+        if name not in first and prop >= 0:
+            first[name] = properties[prop].name
+    summary["first_purchase"] = first
+
+    # Money put into each color group (bank purchases and buildings) and rent it earned
+    groups = sorted({prop.color_group for prop in properties})
+    group_of = np.array([groups.index(prop.color_group) for prop in properties] + [-1])
+    props = np.frombuffer(log.property_ids, dtype=np.int16)
+    amounts = np.frombuffer(log.amounts, dtype=np.int32).astype(np.int64)
+    entry_groups = group_of[props]  # NO_PROPERTY (-1) picks the trailing -1
+    invested, rent = {}, {}
+    for code, totals, sign in ((PURCHASE, invested, -1), (BUILD, invested, -1), (RENT_RECEIVED, rent, 1)):
+        mask = (kinds == code) & (entry_groups >= 0)
+        sums = np.bincount(entry_groups[mask], weights=amounts[mask], minlength=len(groups))
+        for group, total in zip(groups, sums):
+            if total:
+                totals[group] = totals.get(group, 0) + sign * int(total)
+    summary["invested"] = invested
+    summary["rent"] = rent
+
+    # Average cash per player at evenly spaced points through the game
+    curve = []
+    if played:
+        state = events.replay(events.initial_state(len(properties)), log, start)
+        for point in range(1, CURVE_POINTS + 1):
+            events.replay(state, log, start + played * point // CURVE_POINTS)
+            money = state["money"]
+            curve.append(sum(money.values()) / len(money) if money else 0)
+    summary["cash_curve"] = curve
+    return summary
+
+
+def analyze(root, cache_file=None, workers=None):
+    # (report, counts): counts has files, parsed (new or changed content), reused (from
+    # the cache) and skipped (not games). cache_file False turns the cache off.
+    if cache_file is None:
+        cache_file = os.path.join(root, CACHE_FILE)
+    catalog = catalog_hash([Property(**p) for p in load_catalog()])  # CSV summaries depend on it
+    cached = _read_cache(cache_file, catalog) if cache_file else {}
+    files, todo = {}, []
+    for rel in discover(root):
+        stat = os.stat(os.path.join(root, rel))
+        entry = cached.get(rel)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            files[rel] = entry
+        else:
+            files[rel] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                          "sha256": entry["sha256"] if entry else None, "summary": entry and entry["summary"]}
+            todo.append(rel)
+
+    paths = [os.path.join(root, rel) for rel in todo]
+    known = [files[rel]["sha256"] for rel in todo]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(todo)))
+    if workers == 1:
+        results = list(map(summarize_file, paths, known))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(summarize_file, paths, known, chunksize=max(1, len(todo) // (workers * 4))))
+    parsed = 0
+    for rel, (digest, summary) in zip(todo, results):
+        files[rel]["sha256"] = digest
+        if summary is not None:
+            files[rel]["summary"] = summary
+            parsed += 1
+    if cache_file and (todo or len(files) != len(cached)):
+        _write_cache(cache_file, catalog, files)
+
+    summaries = [entry["summary"] for entry in files.values()]
+    games = [summary for summary in summaries if "error" not in summary]
+    counts = {"files": len(files), "parsed": parsed, "reused": len(files) - parsed,
+              "skipped": len(summaries) - len(games)}
+    return report(games), counts
+
+
+def report(summaries):
+    # Merges game summaries into win rate by first property bought, rent ROI per
+    # color group, average game length and the average cash-flow curve
+    first = {}
+    invested, rent = {}, {}
+    curve, curves = [0.0] * CURVE_POINTS, 0
+    transactions = seconds = 0
+    for summary in summaries:
+        transactions += summary["transactions"]
+        seconds += summary["seconds"]
+        if summary["winner"] is not None:
+            for name, prop in summary["first_purchase"].items():
+                counts = first.setdefault(prop, [0, 0])
+                counts[0] += 1
+                counts[1] += name == summary["winner"]
+        for group, amount in summary["invested"].items():
+            invested[group] = invested.get(group, 0) + amount
+        for group, amount in summary["rent"].items():
+            rent[group] = rent.get(group, 0) + amount
+        if summary["cash_curve"]:
+            curve = [a + b for a, b in zip(curve, summary["cash_curve"])]
+            curves += 1
+    games = len(summaries)
+    return {
+        "games": games,
+        "average_transactions": transactions / games if games else 0,
+        "average_minutes": seconds / games / 60 if games else 0,
+        "win_rate_by_first_property": sorted(
+            ({"property": prop, "players": players, "wins": wins, "win_rate": wins / players}
+             for prop, (players, wins) in first.items()),
+            key=lambda row: (-row["win_rate"], -row["players"])),
+        "rent_roi_by_group": {group: {"invested": invested.get(group, 0), "rent": rent.get(group, 0),
+                                      "roi": rent.get(group, 0) / invested[group] if invested.get(group) else None}
+                              for group in sorted(set(invested) | set(rent))},
+        "cash_curve": [total / curves for total in curve] if curves else []
+    }
+
+
+def _read_cache(path, catalog):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != CACHE_VERSION or data.get("catalog") != catalog:
+        return {}
+    return data.get("files", {})
+
+
+def _write_cache(path, catalog, files):
+    tmp_file = path + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "catalog": catalog, "files": files}, f, separators=(",", ":"))
+    os.replace(tmp_file, path)
+
+
+def print_report(result, counts):
+    print(f"{counts['files']} files: {counts['parsed']} parsed, {counts['reused']} from cache, "
+          f"{counts['skipped']} not games")
+    print(f"{result['games']} games, {result['average_transactions']:.0f} transactions "
+          f"and {result['average_minutes']:.0f} minutes on average")
+    print("\nWin rate by first property bought:")
+    for row in result["win_rate_by_first_property"]:
+        print(f"  {row['property']:<32} {row['win_rate']:6.1%} of {row['players']}")
+    print("\nRent ROI by color group:")
+    for group, row in result["rent_roi_by_group"].items():
+        roi = f"{row['roi']:.2f}" if row["roi"] is not None else "-"
+        print(f"  {group:<12} ${row['rent']:>10} rent on ${row['invested']:>10} invested, ROI {roi}")
+    if result["cash_curve"]:
+        print("\nAverage cash per player through the game:")
+        print("  " + " ".join(f"{value:.0f}" for value in result["cash_curve"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reports across a directory of saved games and CSV exports")
+    parser.add_argument("root", help="directory searched for saves (.json) and exports (.csv)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--cache", help=f"summary cache file (default: <root>/{CACHE_FILE})")
+    parser.add_argument("--no-cache", action="store_true", help="parse every file and leave the cache alone")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+    result, counts = analyze(args.root, False if args.no_cache else args.cache, args.workers)
+    if args.json:
+        print(json.dumps({"report": result, "files": counts}, indent=2))
+    else:
+        print_report(result, counts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class AutoSaver:
+    # Writes submitted states on a background thread. Submissions arriving while a
+    # write is pending replace it, so a burst of changes costs at most one write per
+    # interval and the newest state always wins.
+    def __init__(self, write, interval=30.0):
+        self.write = write  # Called on the worker thread with each state to save
+        self.interval = interval
+        self.last_error = None
+        self._pending = None
+        self._writing = False
+        self._stopped = False
+        self._last_write = float("-inf")
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def submit(self, state):
+        with self._cond:
+            self._pending = state
+            self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        # Write any pending state now, ignoring the interval, and wait for it
+        with self._cond:
+            self._last_write = float("-inf")
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._pending is None and not self._writing, timeout)
+
+    def stop(self, timeout=None):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopped:
+                    self._cond.wait()
+                if self._pending is None:
+                    return
+                # Wait out the interval; newer submissions replace the pending state
+                while not self._stopped:
+                    delay = self._last_write + self.interval - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                state = self._pending
+                self._pending = None
+                self._writing = True
+            try:
+                self.write(state)
+                self.last_error = None
+            except Exception as e:
+                logger.exception("Autosave failed")
+                self.last_error = e
+            with self._cond:
+                self._writing = False
+                self._last_write = time.monotonic()
+                self._cond.notify_all()
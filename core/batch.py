@@ -0,0 +1,84 @@
+from core.errors import RuleError
+from core.transaction_log import check_int32
+
+
+class Batch:
+    # Money movements collected in `with tracker.batch() as batch:` and applied when
+    # the block ends. Each leg is checked as it is added (amounts) and again, in order,
+    # before anything is applied (funds and ownership), so either every leg happens or
+    # none does. An exception inside the block discards the batch.
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.legs = []  # (player, amount, reason, kind, property, needs funds)
+        self.moves = []  # (property, seller, buyer), in the order they were added
+
+    def transfer(self, payer, recipient, amount):
+        _check_positive(amount, "Amount")
+        self.legs.append((payer, -amount, f"Transferred to {recipient.name}", "transfer_out", None, True))
+        self.legs.append((recipient, amount, f"Received from {payer.name}", "transfer_in", None, False))
+
+    def pay_bank(self, player, amount):
+        _check_positive(amount, "Amount")
+        self.legs.append((player, -amount, "Transferred to Bank", "transfer_out", None, True))
+
+    def from_bank(self, player, amount):
+        _check_positive(amount, "Amount")
+        self.legs.append((player, amount, "Received from Bank", "transfer_in", None, False))
+
+    def sell_property(self, seller, buyer, property, price):
+        _check_positive(price, "Price")
+        self.moves.append((property, seller, buyer))
+        self.legs.append((seller, price, f"Sold {property.name} to {buyer.name}", "sale", property, False))
+        self.legs.append((buyer, -price, f"Bought {property.name} from {seller.name}", "purchase_from_player",
+                          property, True))
+
+    def give_property(self, giver, receiver, property):
+        # A property changing hands as part of a trade; any cash is a separate transfer
+        self.moves.append((property, giver, receiver))
+        self.legs.append((giver, 0, f"Sold {property.name} to {receiver.name}", "sale", property, False))
+        self.legs.append((receiver, 0, f"Bought {property.name} from {giver.name}", "purchase_from_player",
+                          property, False))
+
+    def validate(self):
+        # Raises RuleError for the first leg that can't happen after the ones before it;
+        # otherwise returns the player's balance after each leg
+        balances, after = {}, []
+        for player, amount, _, _, _, needs_funds in self.legs:
+            balance = balances.get(player.name, player.money) + amount
+            if needs_funds and balance < 0:
+                raise RuleError(f"{player.name} does not have enough money!")
+            try:
+                check_int32(balance)
+            except OverflowError:
+                raise RuleError(f"{player.name}'s balance would be out of range") from None
+            balances[player.name] = balance
+            after.append(balance)
+        owners = {}
+        for property, seller, buyer in self.moves:
+            if owners.get(property, property.owner) is not seller:
+                raise RuleError(f"{seller.name} does not own {property.name}")
+            owners[property] = buyer
+        return after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.tracker.apply_batch(self)
+        return False
+
+    def __len__(self):
+        return len(self.legs)
+
+
+def _check_positive(amount, what):
+    # Same rules as MonopolyTracker._check_amount, checked when the leg is added
+    try:
+        amount = check_int32(amount)
+    except TypeError:
+        raise RuleError(f"{what} must be a whole number, not {amount!r}") from None
+    except OverflowError:
+        raise RuleError(f"{what} {amount} is out of range") from None
+    if amount <= 0:
+        raise RuleError(f"{what} must be positive")
@@ -0,0 +1,41 @@
+BOARD_SIZE = 40  # Same wrap-around as MonopolyGUI.move_player
+JAIL_SQUARE = 10
+GO_TO_JAIL_SQUARE = 30
+GO_SALARY = 200
+JAIL_FINE = 50
+MAX_JAIL_TURNS = 3
+TAX_SQUARES = {4: 200, 38: 100}
+HOUSE_COSTS = {
+    "Light Blue": 50,
+    "Pink": 100,
+    "Orange": 100,
+    "Red": 150,
+    "Yellow": 150,
+    "Green": 200,
+    "Dark Blue": 200
+}
+
+STREET_SQUARES = [1, 3, 6, 8, 9, 11, 13, 14, 16, 18, 19, 21, 23, 24, 26, 27, 29, 31, 32, 34, 37, 39]
+RAILROAD_SQUARES = [5, 15, 25, 35]
+UTILITY_SQUARES = [12, 28]
+
+
+def property_squares(properties):
+    # The catalog has no board positions. It lists streets from the most to the least
+    # expensive, so they fill the street squares backwards from Rue de la Paix on 39;
+    # stations and utilities take their squares in catalog order.
+    streets = list(reversed(STREET_SQUARES))
+    railroads = list(RAILROAD_SQUARES)
+    utilities = list(UTILITY_SQUARES)
+    squares = []
+    for prop in properties:
+        if prop.color_group == "Railroad":
+            free = railroads
+        elif prop.color_group == "Utility":
+            free = utilities
+        else:
+            free = streets
+        if not free:
+            raise ValueError(f"No board square left for {prop.name}")
+        squares.append(free.pop(0))
+    return squares
@@ -0,0 +1,15 @@
+import json
+import os
+
+DEFAULT_CATALOG = os.path.join(os.path.dirname(__file__), "..", "data", "france_properties.json")
+
+_catalogs = {}  # Path -> parsed property records, read on first use
+
+
+def load_catalog(path=DEFAULT_CATALOG):
+    records = _catalogs.get(path)
+    if records is None:
+        with open(path, encoding="utf-8") as f:
+            records = tuple(json.load(f))
+        _catalogs[path] = records
+    return records
@@ -0,0 +1,28 @@
+class ChangeSet:
+    # What the engine touched since the GUI last redrew
+    def __init__(self):
+        self.players = set()  # Names of players whose state changed
+        self.properties = set()  # Names of properties whose owner changed
+        self.log_start = None  # Index of the first transaction not yet displayed
+        self.loans = set()  # Names of borrowers whose loans changed
+        self.roster = False  # Players were added, or the whole game was reloaded
+
+    def mark_player(self, name):
+        self.players.add(name)
+
+    def mark_property(self, name):
+        self.properties.add(name)
+
+    def mark_log(self, index):
+        if self.log_start is None or index < self.log_start:
+            self.log_start = index
+
+    def mark_loans(self, borrower_name):
+        self.loans.add(borrower_name)
+
+    def mark_all(self):
+        self.roster = True
+        self.log_start = 0
+
+    def __bool__(self):
+        return bool(self.roster or self.players or self.properties or self.loans or self.log_start is not None)
@@ -0,0 +1,18 @@
+class TrackerError(Exception):
+    pass
+
+
+class SaveError(TrackerError):
+    pass
+
+
+class LoadError(TrackerError):
+    pass
+
+
+class SaveNotFoundError(LoadError):
+    pass
+
+
+class RuleError(TrackerError):
+    pass
@@ -0,0 +1,186 @@
+from array import array
+
+from core import reasons
+from core.board import HOUSE_COSTS
+from core.liquidation import mortgage_value, unmortgage_cost
+from core.transaction_log import NO_BALANCE, NO_PROPERTY
+
+# Every log entry is a typed event (TransactionLog.kinds / property_ids). Replaying
+# them rebuilds the table: balances come from new_balance, ownership, houses and jail
+# from the event kinds. A state is a plain dict:
+#   {"index": entries applied, "players": [names in join order], "money": {name: int},
+#    "in_jail": {name: bool}, "owners": [owner name or None per catalog property],
+#    "houses": [int per catalog property], "mortgaged": [bool per catalog property]}
+CHECKPOINT_INTERVAL = 1000
+STARTING_MONEY = 1500  # Player's opening balance
+BANK = "Bank"
+AMBIGUOUS = -2  # resolve_properties: the name belongs to several catalog properties
+
+CREATED = reasons.KIND_CODES["created"]
+PURCHASE = reasons.KIND_CODES["purchase"]
+PURCHASE_FROM_PLAYER = reasons.KIND_CODES["purchase_from_player"]
+SALE = reasons.KIND_CODES["sale"]
+BUILD = reasons.KIND_CODES["build"]
+BUILDING_SALE = reasons.KIND_CODES["building_sale"]
+JAILED = reasons.KIND_CODES["jailed"]
+RELEASED = reasons.KIND_CODES["released"]
+RENT_PAID = reasons.KIND_CODES["rent_paid"]
+MORTGAGE = reasons.KIND_CODES["mortgage"]
+UNMORTGAGE = reasons.KIND_CODES["unmortgage"]
+FORFEIT = reasons.KIND_CODES["forfeit"]
+PROPERTY_KINDS = {reasons.KIND_CODES[kind] for kind in (
+    "created", "purchase", "purchase_from_player", "sale", "rent_paid", "rent_received", "build", "building_sale",
+    "mortgage", "unmortgage", "forfeit")}
+
+
+def initial_state(property_count):
+    return {"index": 0, "players": [], "money": {}, "in_jail": {},
+            "owners": [None] * property_count, "houses": [0] * property_count,
+            "mortgaged": [False] * property_count}
+
+
+def copy_state(state):
+    return {"index": state["index"], "players": state["players"][:], "money": dict(state["money"]),
+            "in_jail": dict(state["in_jail"]), "owners": state["owners"][:], "houses": state["houses"][:],
+            "mortgaged": state["mortgaged"][:]}
+
+
+def replay(state, log, stop):
+    # Applies log entries state["index"]..stop-1 to the state in place
+    players, money, in_jail = state["players"], state["money"], state["in_jail"]
+    owners, houses, mortgaged = state["owners"], state["houses"], state["mortgaged"]
+    names, texts = log.player_names, log.reasons
+    for i in range(state["index"], stop):
+        name = names[log.player_ids[i]]
+        if name != BANK:
+            if name not in money:
+                players.append(name)
+                money[name] = STARTING_MONEY
+                in_jail[name] = False
+            balance = log.balances[i]
+            if balance != NO_BALANCE:
+                money[name] = balance
+        kind = log.kinds[i]
+        prop = log.property_ids[i]
+        if kind == JAILED or kind == RELEASED:
+            in_jail[name] = kind == JAILED
+        elif prop == NO_PROPERTY:
+            continue
+        elif kind == PURCHASE or kind == PURCHASE_FROM_PLAYER:
+            owners[prop] = name
+        elif kind == SALE:
+            owners[prop] = reasons.classify(texts[log.reason_ids[i]])[2]
+        elif kind == BUILD:
+            houses[prop] += 1
+        elif kind == BUILDING_SALE:
+            houses[prop] -= 1
+        elif kind == MORTGAGE or kind == UNMORTGAGE:
+            mortgaged[prop] = kind == MORTGAGE
+        elif kind == FORFEIT:
+            # A bankrupt player's property goes to the creditor as it is, or back to the bank
+            creditor = reasons.classify(texts[log.reason_ids[i]])[2]
+            owners[prop] = None if creditor == BANK else creditor
+            if owners[prop] is None:
+                mortgaged[prop] = False
+    state["index"] = max(state["index"], stop)
+    return state
+
+
+class Timeline:
+    # The table after any number of log entries. A checkpoint is kept every `interval`
+    # entries, so a seek costs one checkpoint copy plus a replay of fewer than
+    # `interval` entries. Checkpoints are built on first use and extended as the
+    # append-only log grows.
+    def __init__(self, log, property_count, interval=CHECKPOINT_INTERVAL):
+        self.log = log
+        self.interval = interval
+        self.checkpoints = [initial_state(property_count)]  # State after k * interval entries
+
+    def state_at(self, index):
+        if not 0 <= index <= len(self.log):
+            raise IndexError("transaction index out of range")
+        slot = index // self.interval
+        while len(self.checkpoints) <= slot:
+            state = copy_state(self.checkpoints[-1])
+            self.checkpoints.append(replay(state, self.log, state["index"] + self.interval))
+        return replay(copy_state(self.checkpoints[slot]), self.log, index)
+
+
+def resolve_properties(log, properties):
+    # Older saves and CSV exports only name the property in the reason text, and
+    # catalog names are not unique. Ownership is replayed alongside so each entry
+    # gets the property it can have meant (e.g. a purchase the unowned one at that price).
+    # Reasons naming a unique property are resolved for all their entries at once;
+    # only entries naming a duplicated one (or one of those properties) are replayed.
+    by_name = {}
+    for i, prop in enumerate(properties):
+        by_name.setdefault(prop.name, []).append(i)
+    ambiguous = {i for candidates in by_name.values() if len(candidates) > 1 for i in candidates}
+    targets = []  # Per reason: catalog index, NO_PROPERTY, or AMBIGUOUS
+    for text in log.reasons:
+        candidates = by_name.get(reasons.classify(text)[1])
+        targets.append(NO_PROPERTY if not candidates else candidates[0] if len(candidates) == 1 else AMBIGUOUS)
+    if not len(log):
+        return
+    import numpy as np
+    kinds = np.frombuffer(log.kinds, dtype=np.int8)
+    props = np.frombuffer(log.property_ids, dtype=np.int16).copy()
+    typed = np.isin(kinds, list(PROPERTY_KINDS))
+    unresolved = typed & (props == NO_PROPERTY)
+    resolved = np.array(targets, dtype=np.int16)[np.frombuffer(log.reason_ids, dtype=np.int32)]
+    fill = unresolved & (resolved >= 0)
+    props[fill] = resolved[fill]
+    replayed = (unresolved & (resolved == AMBIGUOUS)) | (typed & np.isin(props, list(ambiguous)))
+
+    owners = [None] * len(properties)
+    created = set()
+    names, texts = log.player_names, log.reasons
+    for i in np.flatnonzero(replayed).tolist():
+        kind = log.kinds[i]
+        _, prop_name, counterparty = reasons.classify(texts[log.reason_ids[i]])
+        player = names[log.player_ids[i]]
+        prop = int(props[i])
+        if prop == NO_PROPERTY:
+            candidates = by_name[prop_name]
+            if kind == PURCHASE:
+                preferred = [c for c in candidates if owners[c] is None and properties[c].price == -log.amounts[i]] or \
+                            [c for c in candidates if owners[c] is None]
+            elif kind == PURCHASE_FROM_PLAYER:
+                preferred = [c for c in candidates if owners[c] == counterparty] or \
+                            [c for c in candidates if owners[c] == player]
+            elif kind == SALE or kind == FORFEIT:
+                preferred = [c for c in candidates if owners[c] == player] or \
+                            [c for c in candidates if owners[c] == counterparty]
+            elif kind == CREATED:
+                preferred = [c for c in candidates if c not in created and properties[c].price == log.amounts[i]] or \
+                            [c for c in candidates if c not in created]
+            elif kind == RENT_PAID:
+                preferred = [c for c in candidates if owners[c] not in (None, player)]
+            else:
+                # Mortgages and buildings cost different amounts on different properties
+                owned = [c for c in candidates if owners[c] == player]
+                preferred = [c for c in owned if _expected_amount(kind, properties[c]) == log.amounts[i]] or owned
+            prop = (preferred or candidates)[0]
+            props[i] = prop
+        if kind == PURCHASE or kind == PURCHASE_FROM_PLAYER:
+            owners[prop] = player
+        elif kind == SALE:
+            owners[prop] = counterparty
+        elif kind == FORFEIT:
+            owners[prop] = None if counterparty == BANK else counterparty
+        elif kind == CREATED:
+            created.add(prop)
+    log.property_ids = array("h", props.tobytes())
+
+
+def _expected_amount(kind, prop):
+    # The amount a mortgage or building entry for prop would have, None for other kinds
+    if kind == MORTGAGE:
+        return mortgage_value(prop)
+    if kind == UNMORTGAGE:
+        return -unmortgage_cost(prop)
+    if kind == BUILD:
+        return -HOUSE_COSTS.get(prop.color_group, 0)
+    if kind == BUILDING_SALE:
+        return HOUSE_COSTS.get(prop.color_group, 0) // 2
+    return None
@@ -0,0 +1,237 @@
+import csv
+import gzip
+import io
+import json
+import os
+import struct
+import sys
+import threading
+from array import array
+from datetime import datetime
+
+from core.instrumentation import timed
+from core.reasons import KIND_CODES
+from core.transaction_log import TransactionLog, COLUMNS, NO_BALANCE, TIME_FORMAT
+
+CHUNK_SIZE = 65536  # Log entries scanned per chunk
+FIELDS = ["timestamp", "player", "amount", "new_balance", "reason"]
+FORMATS = ("csv", "columns")
+
+# Columnar export: a header, then one block per chunk holding the matching entries'
+# columns as raw little-endian arrays, then a footer with the player and reason
+# tables the id columns point into. Blocks start with their row count; a zero count
+# starts the footer, so the file reads front to back (also through gzip).
+MAGIC = b"MTRC"
+HEADER = struct.Struct("<4sH")  # Magic, format version
+VERSION = 1
+LENGTH = struct.Struct("<Q")
+SECONDS = ["%02d" % second for second in range(60)]
+
+
+def export_log(log, path, format="csv", compress=False, player=None, reason_type=None,
+               property_ids=None, since=None, until=None, stop=None, progress=None,
+               cancel=None, chunk_size=CHUNK_SIZE):
+    # Writes the log entries matching every given filter (player name, reason kind,
+    # catalog property indexes, epoch seconds since/until inclusive) among the first
+    # `stop` entries, one chunk at a time. progress(scanned, total) is called after each
+    # chunk; once the cancel event is set the partial file is removed and None returned.
+    # The file is written next to `path` and moved into place when complete.
+    if format not in FORMATS:
+        raise ValueError(f"Unknown export format {format!r}")
+    stop = len(log) if stop is None else stop
+    player_id = log.player_names.index(player) if player in log.player_names else None
+    if player is not None and player_id is None:
+        stop = 0  # Nobody by that name, nothing matches
+    kind = KIND_CODES[reason_type] if reason_type is not None else None
+    filters = (player_id, kind, property_ids, since, until)
+
+    temp = path + ".part"
+    try:
+        with open(temp, "wb") as raw:
+            with (gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) if compress else raw) as f:
+                writer = _CSVWriter(f, log) if format == "csv" else _ColumnWriter(f, log)
+                written = 0
+                for start in range(0, stop, chunk_size):
+                    if cancel is not None and cancel.is_set():
+                        written = None
+                        break
+                    written += writer.write(_chunk(log, start, min(start + chunk_size, stop), filters))
+                    if progress:
+                        progress(min(start + chunk_size, stop), stop)
+                else:
+                    writer.close()
+    except BaseException:
+        if os.path.exists(temp):  # Not if opening it failed
+            os.remove(temp)
+        raise
+    if written is None:
+        os.remove(temp)
+    else:
+        os.replace(temp, path)
+    return written
+
+
+def _chunk(log, start, end, filters):
+    # Copies of the chunk's columns, reduced to the matching entries. Slicing copies
+    # under the GIL, so the Tk thread can keep appending to the log meanwhile.
+    columns = {name: getattr(log, name)[start:end] for name in COLUMNS}
+    player_id, kind, property_ids, since, until = filters
+    if player_id is None and kind is None and property_ids is None and since is None and until is None:
+        return columns
+    import numpy as np
+    views = {name: np.frombuffer(values, dtype=values.typecode) for name, values in columns.items()}
+    mask = np.ones(end - start, dtype=bool)
+    if player_id is not None:
+        mask &= views["player_ids"] == player_id
+    if kind is not None:
+        mask &= views["kinds"] == kind
+    if property_ids is not None:
+        mask &= np.isin(views["property_ids"], list(property_ids))
+    if since is not None:
+        mask &= views["timestamps"] >= since
+    if until is not None:
+        mask &= views["timestamps"] <= until
+    return {name: array(values.typecode, views[name][mask].tobytes()) for name, values in columns.items()}
+
+
+class _CSVWriter:
+    # Same output as csv.writer over the log's row dicts, but player names and reasons
+    # are quoted once per table entry and timestamps formatted once per minute, and
+    # each chunk is joined into one string and written in one go
+    def __init__(self, f, log):
+        self.f = f
+        self.log = log
+        self._names = []  # CSV-quoted player_names
+        self._reasons = []  # CSV-quoted reasons
+        self._minutes = {}
+        f.write(_quote_row(FIELDS).encode("utf-8"))
+
+    def write(self, columns):
+        names = _quoted(self.log.player_names, self._names)
+        texts = _quoted(self.log.reasons, self._reasons)
+        minutes = self._minutes
+        lines = []
+        for timestamp, player_id, amount, balance, reason_id in zip(
+                columns["timestamps"], columns["player_ids"], columns["amounts"],
+                columns["balances"], columns["reason_ids"]):
+            minute, second = divmod(timestamp, 60)
+            prefix = minutes.get(minute)
+            if prefix is None:
+                prefix = datetime.fromtimestamp(minute * 60).strftime(TIME_FORMAT)[:-2]
+                minutes[minute] = prefix
+            lines.append(f"{prefix}{SECONDS[second]},{names[player_id]},{amount},"
+                         f"{'' if balance == NO_BALANCE else balance},{texts[reason_id]}\r\n")
+        self.f.write("".join(lines).encode("utf-8"))
+        if len(minutes) > 100000:
+            minutes.clear()
+        return len(lines)
+
+    def close(self):
+        pass
+
+
+def _quote_row(fields):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(fields)
+    return buffer.getvalue()
+
+
+def _quoted(table, quoted):
+    # Extends the quoted copy of an interned table to its current length
+    for value in table[len(quoted):]:
+        quoted.append(_quote_row([value])[:-2])
+    return quoted
+
+
+class _ColumnWriter:
+    def __init__(self, f, log):
+        self.f = f
+        self.log = log
+        f.write(HEADER.pack(MAGIC, VERSION))
+
+    def write(self, columns):
+        count = len(columns["amounts"])
+        if not count:
+            return 0
+        self.f.write(LENGTH.pack(count))
+        for name in COLUMNS:
+            values = columns[name]
+            if sys.byteorder != "little":
+                values.byteswap()
+            self.f.write(values.tobytes())
+        return count
+
+    def close(self):
+        footer = json.dumps({"player_names": self.log.player_names[:], "reasons": self.log.reasons[:]},
+                            separators=(",", ":")).encode("utf-8")
+        self.f.write(LENGTH.pack(0) + LENGTH.pack(len(footer)) + footer)
+
+
+def read_columns(path):
+    # Reads a columnar export (gzip or not) back into a TransactionLog
+    with open(path, "rb") as raw:
+        compressed = raw.read(2) == b"\x1f\x8b"
+    with (gzip.open(path, "rb") if compressed else open(path, "rb")) as f:
+        magic, version = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a columnar transaction export (version {version})")
+        columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        while True:
+            (count,) = LENGTH.unpack(f.read(LENGTH.size))
+            if not count:
+                break
+            for name, values in columns.items():
+                block = array(values.typecode)
+                block.frombytes(f.read(count * block.itemsize))
+                if sys.byteorder != "little":
+                    block.byteswap()
+                values.extend(block)
+        (length,) = LENGTH.unpack(f.read(LENGTH.size))
+        columns.update(json.loads(f.read(length)))
+    return TransactionLog.from_columns(columns)
+
+
+class ExportJob:
+    # Runs export_log on a worker thread. The Tk thread polls progress/done and may
+    # call cancel(); nothing here touches the GUI.
+    def __init__(self, log, path, **options):
+        self.path = path
+        self.total = options.get("stop") or len(log)
+        options["stop"] = self.total  # Entries logged after the export started are left out
+        self.scanned = 0
+        self.written = None  # Rows written, once finished (None if cancelled or failed)
+        self.error = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(log, path, options), name="export", daemon=True)
+        self._thread.start()
+
+    @timed("export_transactions", size=lambda job, result: job.written or 0)
+    def _run(self, log, path, options):
+        try:
+            self.written = export_log(log, path, progress=self._progress, cancel=self._cancel, **options)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._done.set()
+
+    def _progress(self, scanned, total):
+        self.scanned = scanned
+
+    @property
+    def progress(self):
+        return self.scanned / self.total if self.total else 1.0
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
@@ -1,130 +1,768 @@
-import json
+import logging
 import os
-from tkinter import messagebox
-from datetime import datetime
+import threading
 from core.player import Player  # Ensure correct import
 from core.property import Property
+from core import save_format
+from core.catalog import load_catalog
+from core.errors import SaveError, LoadError, SaveNotFoundError, RuleError
+from core.journal import TransactionJournal
+from core.transaction_log import TransactionLog, check_int32
+from core.registry import Registry
+from core.changes import ChangeSet
+from core.rent import RentEngine, HOTEL
+from core.board import HOUSE_COSTS
+from core import reasons
+from core import events
+from core import slots
+from core.instrumentation import timed
+from core.loans import LoanBook
+from core.stats import GameStats
+from core.batch import Batch
+from core.liquidation import liquidation_plan, mortgage_value, unmortgage_cost
+from core.trades import TradeEngine
+
+logger = logging.getLogger(__name__)
 
 class MonopolyTracker:
-    def __init__(self):
+    def __init__(self, journaled=False, save_file=None):
         self.players = []
         self.properties = self.load_france_properties()
-        self.transaction_log = []  # Initialize the log
-        self.save_file = "data/saved_games/latest.json"
+        self.changes = ChangeSet()
+        self.registry = Registry(self.changes)
+        self._index_game()
+        self.transaction_log = TransactionLog()  # Initialize the log
+        self.save_file = save_file or slots.slot_path(slots.DEFAULT_SLOT)  # The journal and ledger are kept next to it
+        # Journaled mode appends every log entry to a line-delimited journal next to
+        # the save file, so saving only has to fsync the new records
+        self.journal = TransactionJournal(os.path.splitext(self.save_file)[0] + ".journal") if journaled else None
+        self.snapshot_interval = 500  # Journal records before a save writes a full snapshot
+        self._journal_ready = False  # Set once the journal continues a snapshot on disk
+        self._snapshot_seq = 0
+        self.loans = LoanBook()
+        self.game_data = None  # Extra GUI state saved in the same file as the game
+        self.binary_saves = False  # Write the packed binary save format instead of JSON
+        self.compress_saves = False  # zlib-compress binary saves
+        self._save_lock = threading.Lock()  # Saves may come from the autosave thread
+        self._state_version = 0  # Incremented by every capture_state
+        self._written_version = 0  # Newest captured state written to disk
+        self.ledger = None  # Optional SQLite copy of the game, see attach_ledger
+        self.replication = None  # Numbers and streams every change to followers, see start_replication
+        self._timeline = None  # Checkpoints for state_at, built on first use
+        self.stats = GameStats(self.properties)  # Running totals, updated by log_transaction
         
         # Log property creation
-        for prop in self.properties:
-            self.transaction_log.append({
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "player": "Bank",
-                "amount": prop.price,
-                "reason": f"Created {prop.name}"
-            })
+        log = self.transaction_log
+        for i, prop in enumerate(self.properties):
+            log.record("Bank", prop.price, f"Created {prop.name}", kind="created", property_id=i)
+            self.stats.record(log.kinds[-1], "Bank", prop.price, i, log.timestamps[-1])
         
     def load_france_properties(self):
-        prop_file = os.path.join(os.path.dirname(__file__), "..", "data", "france_properties.json")
-        with open(prop_file) as f:
-            data = json.load(f)
-        return [Property(**p) for p in data]
+        # The catalog file is parsed once per process and shared by every tracker
+        return [Property(**p) for p in load_catalog()]
         
-    def log_transaction(self, player, amount, reason):
-        entry = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "player": player.name,
-            "amount": amount,
-            "new_balance": player.money,
-            "reason": reason
+    def _index_game(self):
+        # Rebuild the name indexes and the rent engine for the current players and properties
+        self.registry.listeners = []
+        self.registry.reset(self.players, self.properties)
+        self.rent_engine = RentEngine(self.properties)
+        self.registry.listeners.append(self.rent_engine.owner_changed)
+        self.trades = TradeEngine(self.rent_engine, self.properties)
+        self.registry.listeners.append(self.trades.owner_changed)
+
+    def add_player(self, player):
+        self.players.append(player)
+        self.registry.add_player(player)
+        self.changes.roster = True
+        if self._journal_ready or self.replication:
+            self._record({"player": self._player_state(player)})
+
+    def mark_player_changed(self, player):
+        # For changes that don't go through log_transaction (e.g. moving a player)
+        self.changes.mark_player(player.name)
+        if self._journal_ready or self.replication:
+            self._record({"player": self._player_state(player)})
+
+    def _record(self, record):
+        # A change as a journal record: streamed to followers, then journaled
+        if self.replication:
+            self.replication.publish(record)
+        if self._journal_ready:
+            self.journal.append(record)
+
+    def take_changes(self):
+        changes = self.changes
+        self.changes = ChangeSet()
+        self.registry.changes = self.changes
+        return changes
+
+    def has_player(self, name):
+        return self.registry.has_player(name)
+
+    def get_player(self, name):
+        return self.registry.players[name]
+
+    def available_properties(self):
+        return self.registry.available()
+
+    def owned_properties(self, exclude=None):
+        return self.registry.owned_properties(exclude)
+
+    @timed("log_transaction")
+    def log_transaction(self, player, amount, reason, kind=None, property=None):
+        # kind is one of reasons.KINDS (read from the reason text when omitted) and
+        # property the Property involved, so the entry can be replayed
+        property_id = self.registry.index_of(property) if property is not None else -1
+        log = self.transaction_log
+        log.record(player.name, amount, reason, player.money, kind=kind, property_id=property_id)
+        self.stats.record(log.kinds[-1], player.name, amount, property_id, log.timestamps[-1])
+        self.changes.mark_player(player.name)
+        self.changes.mark_log(len(log) - 1)
+        if self.ledger:
+            self.ledger.add(log.timestamps[-1], player.name, amount, player.money, reason)
+        if self._journal_ready or self.replication or logger.isEnabledFor(logging.DEBUG):
+            entry = log[-1]
+            logger.debug("Logged transaction for %s: %+d (%s)", player.name, amount, reason, extra={"transaction": entry})
+            if self._journal_ready or self.replication:
+                entry["kind"] = reasons.KINDS[log.kinds[-1]]
+                entry["property_id"] = property_id
+                self._record({"entry": entry, "player": self._player_state(player)})
+
+    def _check_amount(self, amount, gainers=(), payers=()):
+        # The amount, and the balances of the players receiving and paying it, must fit
+        # the transaction log; checked before any money moves
+        try:
+            check_int32(amount)
+            for player in gainers:
+                check_int32(player.money + amount)
+            for player in payers:
+                check_int32(player.money - amount)
+        except TypeError:
+            raise RuleError(f"Amount must be a whole number, not {amount!r}") from None
+        except OverflowError:
+            raise RuleError(f"Amount {amount} is out of range") from None
+
+    def _player_state(self, player):
+        # Properties are given by catalog index, since catalog names are not unique
+        index_of = self.registry.index_of
+        return {
+            "name": player.name,
+            "money": player.money,
+            "properties": [index_of(prop) for prop in player.properties],
+            "houses": [prop.houses for prop in player.properties],
+            "mortgaged": [index_of(prop) for prop in player.properties if prop.mortgaged],
+            "position": player.position,
+            "in_jail": player.in_jail
         }
-        self.transaction_log.append(entry)
-        print(entry)  # Add this line to print the log entry
+
+    def _state_property(self, ref):
+        # Journals written before catalog indexes name the property instead
+        return self.properties[ref] if isinstance(ref, int) else self.registry.properties[ref]
+
+    def _apply_player_state(self, state):
+        player = self.registry.players.get(state["name"])
+        if player is None:
+            # Not add_player: the state being applied is already a record
+            player = Player(state["name"])
+            self.players.append(player)
+            self.registry.add_player(player)
+            self.changes.roster = True
+        player.money = state["money"]
+        player.position = state["position"]
+        player.in_jail = state["in_jail"]
+        props = [self._state_property(ref) for ref in state["properties"]]
+        owned = set(props)
+        for prop in list(player.properties):
+            if prop not in owned:
+                player.remove_property(prop)
+                prop.mortgaged = False  # Set again if another player's state lists it
+        houses = state.get("houses", {})
+        if isinstance(houses, dict):
+            houses = [houses.get(prop.name, 0) for prop in props]
+        mortgaged = {self._state_property(ref) for ref in state.get("mortgaged", ())}
+        for prop, count in zip(props, houses):
+            prop.houses = count
+            prop.mortgaged = prop in mortgaged
+            if prop.owner is not player:
+                if prop.owner:
+                    prop.owner.remove_property(prop)
+                player.add_property(prop)
         
-    def charge_rent(self, payer, property):
+    @timed("charge_rent")
+    def charge_rent(self, payer, property, dice_roll=None):
+        # Returns the liquidation plan when the payer had to raise money, else None
         if not property.owner or property.owner == payer:
-            return
+            return None
         
-        rent = property.calculate_rent()
-        if payer.money >= rent:
-            payer.money -= rent
-            property.owner.money += rent
-            self.log_transaction(payer, -rent, f"Paid rent for {property.name}")
-            self.log_transaction(property.owner, rent, f"Received rent for {property.name}")
+        rent = self.rent_engine.rent_for(property, dice_roll)
+        if not rent:
+            return None  # Mortgaged
+        plan = None
+        if payer.money < rent:
+            plan = self.handle_bankruptcy(payer, property.owner, rent)
+            if not plan["covered"]:
+                return plan
+        self._check_amount(rent, [property.owner])
+        payer.money -= rent
+        property.owner.money += rent
+        self.log_transaction(payer, -rent, f"Paid rent for {property.name}", "rent_paid", property)
+        self.log_transaction(property.owner, rent, f"Received rent for {property.name}", "rent_received", property)
+        return plan
+
+    def liquidation_plan(self, debtor, amount):
+        # Cheapest house sales and mortgages covering amount, see core.liquidation
+        return liquidation_plan(debtor, amount, self.rent_engine, self.properties)
+
+    def handle_bankruptcy(self, debtor, creditor, amount):
+        # Raises `amount` by following the liquidation plan. If selling and mortgaging
+        # everything isn't enough, the debtor goes bankrupt: buildings are sold, and the
+        # cash and properties go to the creditor (the Bank when None). The caller pays
+        # the debt itself when the plan is covered.
+        plan = self.liquidation_plan(debtor, amount)
+        for prop, count in plan["house_sales"]:
+            for _ in range(count):
+                self.sell_house(debtor, prop)
+        if not plan["covered"]:
+            self.declare_bankruptcy(debtor, creditor)
+            return plan
+        for prop in plan["mortgages"]:
+            self.mortgage(debtor, prop)
+        logger.debug("%s raised %d for a debt of %d (expected rent lost per turn: %.1f)",
+                     debtor.name, plan["cash"], amount, plan["lost_rent"])
+        return plan
+
+    def declare_bankruptcy(self, debtor, creditor=None):
+        # Hands the debtor's cash and properties to the creditor as they are (mortgaged
+        # ones stay mortgaged); properties forfeited to the Bank become unowned
+        creditor_name = creditor.name if creditor else events.BANK
+        for prop in list(debtor.properties):
+            debtor.remove_property(prop)
+            if creditor:
+                creditor.add_property(prop)
+            else:
+                prop.mortgaged = False
+            self.changes.mark_property(prop.name)
+            self.log_transaction(debtor, 0, f"Forfeited {prop.name} to {creditor_name}", "forfeit", prop)
+        cash = debtor.money
+        debtor.money = 0
+        self.log_transaction(debtor, -cash, f"Bankrupt to {creditor_name}", "bankruptcy")
+        if creditor:
+            # Logged even for no cash, so the creditor's new properties reach the journal
+            creditor.money += cash
+            self.log_transaction(creditor, cash, f"Received from {debtor.name}", "transfer_in")
+        logger.info("%s went bankrupt to %s", debtor.name, creditor_name)
+
+    def mortgage(self, player, property):
+        if property.owner is not player:
+            raise RuleError(f"{player.name} does not own {property.name}")
+        if property.mortgaged:
+            raise RuleError(f"{property.name} is already mortgaged")
+        if any(prop.houses for prop in player.properties if prop.color_group == property.color_group):
+            raise RuleError(f"Sell the buildings on the {property.color_group} group first")
+        value = mortgage_value(property)
+        property.mortgaged = True
+        player.money += value
+        self.changes.mark_property(property.name)
+        self.log_transaction(player, value, f"Mortgaged {property.name}", "mortgage", property)
+
+    def unmortgage(self, player, property):
+        if property.owner is not player or not property.mortgaged:
+            raise RuleError(f"{property.name} is not mortgaged by {player.name}")
+        cost = unmortgage_cost(property)
+        if player.money < cost:
+            raise RuleError("Not enough money!")
+        property.mortgaged = False
+        player.money -= cost
+        self.changes.mark_property(property.name)
+        self.log_transaction(player, -cost, f"Unmortgaged {property.name}", "unmortgage", property)
+
+    def build_house(self, player, property):
+        if property.owner is not player:
+            raise RuleError(f"{player.name} does not own {property.name}")
+        if property.color_group not in HOUSE_COSTS:
+            raise RuleError(f"Houses cannot be built on {property.name}")
+        if not self.rent_engine.has_monopoly(property):
+            raise RuleError(f"{player.name} needs the whole {property.color_group} group to build")
+        if any(prop.mortgaged for prop in player.properties if prop.color_group == property.color_group):
+            raise RuleError(f"Lift the mortgages on the {property.color_group} group first")
+        if property.houses >= HOTEL:
+            raise RuleError(f"{property.name} already has a hotel")
+        cost = HOUSE_COSTS[property.color_group]
+        if player.money < cost:
+            raise RuleError("Not enough money!")
+        player.money -= cost
+        property.houses += 1
+        self.changes.mark_property(property.name)
+        building = "hotel" if property.houses == HOTEL else "house"
+        self.log_transaction(player, -cost, f"Built {building} on {property.name}", "build", property)
+
+    def sell_house(self, player, property):
+        if property.owner is not player or property.houses == 0:
+            raise RuleError(f"No buildings to sell on {property.name}")
+        refund = HOUSE_COSTS[property.color_group] // 2
+        building = "hotel" if property.houses == HOTEL else "house"
+        property.houses -= 1
+        player.money += refund
+        self.changes.mark_property(property.name)
+        self.log_transaction(player, refund, f"Sold {building} on {property.name}", "building_sale", property)
+
+    def purchase_property(self, player, property):
+        if property.owner is not None:
+            raise RuleError(f"{property.name} is already owned")
+        if player.money < property.price:
+            raise RuleError("Not enough money!")
+        player.money -= property.price
+        player.add_property(property)
+        self.log_transaction(player, -property.price, f"Purchased {property.name}", "purchase", property)
+
+    def sell_property(self, seller, buyer, property, price):
+        if property.owner is not seller:
+            raise RuleError(f"{seller.name} does not own {property.name}")
+        self._check_amount(price, [seller], [buyer])
+        if price <= 0:
+            raise RuleError("Price must be positive")
+        if buyer.money < price:
+            raise RuleError("Buyer does not have enough money!")
+        seller.money += price
+        buyer.money -= price
+        seller.remove_property(property)
+        buyer.add_property(property)
+        self.log_transaction(seller, price, f"Sold {property.name} to {buyer.name}", "sale", property)
+        self.log_transaction(buyer, -price, f"Bought {property.name} from {seller.name}", "purchase_from_player", property)
+
+    def transfer(self, payer, recipient, amount):
+        self._check_amount(amount, [recipient], [payer])
+        if amount <= 0:
+            raise RuleError("Amount must be positive")
+        if payer.money < amount:
+            raise RuleError("Not enough money!")
+        payer.money -= amount
+        recipient.money += amount
+        self.log_transaction(payer, -amount, f"Transferred to {recipient.name}", "transfer_out")
+        self.log_transaction(recipient, amount, f"Received from {payer.name}", "transfer_in")
+
+    def lend(self, lender, borrower, amount):
+        self._check_amount(amount, [borrower], [lender])
+        if amount <= 0:
+            raise RuleError("Amount must be positive")
+        if lender.money < amount:
+            raise RuleError("Lender does not have enough money!")
+        lender.money -= amount
+        borrower.money += amount
+        self.loans.add(borrower.name, lender.name, amount)
+        self._loans_changed(borrower, {"loan": [borrower.name, lender.name, amount]})
+        self.log_transaction(lender, -amount, f"Loaned to {borrower.name}", "loan_out")
+        self.log_transaction(borrower, amount, f"Loan from {lender.name}", "loan_in")
+
+    def bank_loan(self, borrower, amount):
+        self._check_amount(amount, [borrower])
+        self.loans.add_bank(borrower.name, amount)
+        borrower.money += amount
+        self._loans_changed(borrower, {"loan": [borrower.name, "Bank", amount]})
+        self.log_transaction(borrower, amount, "Loan from Bank", "bank_loan")
+
+    def repay(self, borrower, lender=None):
+        # Repays the borrower's smallest loan from lender (the Bank when None)
+        lender_name = lender.name if lender else "Bank"
+        if lender_name == "Bank":
+            amount = self.loans.bank.get(borrower.name)
         else:
-            self.handle_bankruptcy(payer, property.owner, rent)
+            amount = self.loans.smallest(borrower.name, lender_name)
+        if amount is None:
+            raise RuleError(f"{borrower.name} owes nothing to {lender_name}")
+        if borrower.money < amount:
+            raise RuleError("Not enough money to repay the loan!")
+        if lender is not None:
+            self._check_amount(amount, [lender])
+        self.loans.remove(borrower.name, lender_name)
+        borrower.money -= amount
+        self._loans_changed(borrower, {"repaid": [borrower.name, lender_name]})
+        if lender is None:
+            self.log_transaction(borrower, -amount, "Repayment to Bank", "bank_repayment")
+            return
+        lender.money += amount
+        self.log_transaction(borrower, -amount, f"Repayment to {lender.name}", "repayment_out")
+        self.log_transaction(lender, amount, f"Repayment from {borrower.name}", "repayment_in")
+
+    def batch(self):
+        # Several money movements applied together, see core.batch.Batch
+        return Batch(self)
+
+    def apply_batch(self, batch):
+        # All legs are validated, then appended to the log in one operation; the
+        # ChangeSet gets one update for the whole batch
+        if not batch.legs:
+            return
+        balances = batch.validate()
+        log = self.transaction_log
+        start = len(log)
+        rows = [(player.name, amount, reason, balance, kind,
+                 self.registry.index_of(property) if property is not None else -1)
+                for (player, amount, reason, kind, property, _), balance in zip(batch.legs, balances)]
+        log.record_many(rows)
+        # Nothing has changed up to here
+        players = {player.name: player for player, *_ in batch.legs}
+        for (player, *_), balance in zip(batch.legs, balances):
+            player.money = balance
+        for property, seller, buyer in batch.moves:
+            seller.remove_property(property)
+            buyer.add_property(property)
+        timestamp = log.timestamps[-1]
+        for i, (name, amount, reason, balance, kind, property_id) in enumerate(rows, start):
+            self.stats.record(log.kinds[i], name, amount, property_id, timestamp)
+            if self.ledger:
+                self.ledger.add(timestamp, name, amount, balance, reason)
+        if self._journal_ready or self.replication:
+            # One record for the whole batch, so a crash keeps all of it or none
+            when = log.format_time(timestamp)
+            self._record({
+                "batch": [{"timestamp": when, "player": name, "amount": amount, "new_balance": balance,
+                           "reason": reason, "kind": reasons.KINDS[log.kinds[i]], "property_id": property_id}
+                          for i, (name, amount, reason, balance, kind, property_id) in enumerate(rows, start)],
+                "players": [self._player_state(player) for player in players.values()]
+            })
+        for name in players:
+            self.changes.mark_player(name)
+        self.changes.mark_log(start)
+        logger.debug("Applied a batch of %d transactions", len(rows))
+
+    def trade_suggestions(self, limit=10):
+        # Ranked trades between players, see core.trades.TradeEngine
+        return self.trades.suggestions(self.players, limit)
 
-    def save_game(self):
+    def execute_trade(self, trade):
+        # Applies a trade from trade_suggestions (or one built the same way) as one batch
+        a, b = trade["a"], trade["b"]
+        for prop in trade["give"] + trade["take"]:
+            if prop.houses or prop.mortgaged:
+                raise RuleError(f"{prop.name} has buildings or a mortgage")
+        with self.batch() as batch:
+            for prop in trade["give"]:
+                batch.give_property(a, b, prop)
+            for prop in trade["take"]:
+                batch.give_property(b, a, prop)
+            if trade["cash"] > 0:
+                batch.transfer(a, b, trade["cash"])
+            elif trade["cash"] < 0:
+                batch.transfer(b, a, -trade["cash"])
+
+    def _loans_changed(self, borrower, record):
+        self.changes.mark_loans(borrower.name)
+        if self._journal_ready or self.replication:
+            self._record(record)
+
+    def repayment_suggestions(self, borrower_names=None):
+        # (borrower, lender, amount) for loans that the given borrowers (all when None)
+        # can repay now; only the borrowers whose balance or loans changed need asking
+        if borrower_names is None:
+            borrower_names = self.loans.borrowers()
+        suggestions = []
+        for name in borrower_names:
+            borrower = self.registry.players.get(name)
+            if borrower is not None:
+                suggestions.extend((name, lender, amount) for lender, amount in self.loans.suggestions(name, borrower.money))
+        return suggestions
+
+    def set_jail(self, player, in_jail):
+        player.in_jail = in_jail
+        self.log_transaction(player, 0, "Jailed" if in_jail else "Released", "jailed" if in_jail else "released")
+
+    def adjust_money(self, player, amount):
+        self._check_amount(amount, [player])
+        player.money += amount
+        self.log_transaction(player, amount, "Manual adjustment", "adjustment")
+
+    @timed("save_game", size=lambda tracker, result: tracker.save_size())
+    def save_game(self, game_data=None):
         try:
-            data = {
-                "players": [p.to_dict() for p in self.players],
-                "properties": [p.to_dict() for p in self.properties],
-                "transactions": self.transaction_log
-            }
-            with open(self.save_file, 'w') as f:
-                json.dump(data, f, default=str)  # Ensure all objects are serializable
-            messagebox.showinfo("Success", "Game saved!")
+            if self.ledger:
+                self.ledger.save_state(self.players, self.properties, self.loans)
+            if self._journal_ready and self.journal.seq - self._snapshot_seq < self.snapshot_interval:
+                if game_data is not None:
+                    self.journal.append({"game_data": game_data})
+                self.journal.sync()  # Only the records since the last save hit the disk
+                self._write_metadata([(player.name, player.money) for player in self.players],
+                                     len(self.transaction_log))
+                return
+            self.write_snapshot(game_data)
         except Exception as e:
-            messagebox.showerror("Error", f"Save failed: {str(e)}")
+            raise SaveError(str(e)) from e
+
+    def save_size(self):
+        # Bytes on disk: the save file plus its journal
+        journal = self.journal.path if self.journal else None
+        return sum(os.path.getsize(path) for path in (self.save_file, journal) if path and os.path.exists(path))
+
+    def capture_state(self, game_data=None):
+        # Cheap copy of everything a save needs, safe to hand to another thread. The
+        # log is append-only, so it is captured by reference plus its current length.
+        self._state_version += 1
+        return {
+            "version": self._state_version,
+            "document": save_format.build_document(
+                self.players, self.properties, self.journal.seq if self.journal else 0, game_data,
+                self.loans.to_dict()),
+            "log": self.transaction_log,
+            "log_length": len(self.transaction_log)
+        }
 
+    def write_state(self, state):
+        # Writes a captured state unless a newer one is already on disk. The GUI's loan
+        # data is stored in the same file, so one rename replaces both atomically.
+        with self._save_lock:
+            if state["version"] <= self._written_version:
+                return False
+            document = dict(state["document"])
+            document["transactions"] = state["log"].columns(state["log_length"])
+            # Write to a temp file first so a crash never leaves a half-written save
+            tmp_file = self.save_file + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                save_format.write_document(f, document, self.binary_saves, self.compress_saves)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.save_file)
+            self._written_version = state["version"]
+            self._write_metadata([(player["name"], player["money"]) for player in document["players"]],
+                                 state["log_length"])
+            return True
+
+    def _write_metadata(self, players, transactions):
+        # The sidecar the Load picker reads instead of the save, see core.slots
+        try:
+            slots.write_metadata(self.save_file, slots.build_metadata(players, transactions))
+        except OSError as e:
+            logger.warning("Couldn't write save metadata: %s", e)
+
+    def use_save_file(self, path):
+        # Save to (and load from) another file, e.g. another save slot. The journal and
+        # ledger kept next to the old file are closed; the next save is a full snapshot.
+        if path == self.save_file:
+            return
+        if self.journal:
+            self.journal.close()
+            self.journal = TransactionJournal(os.path.splitext(path)[0] + ".journal")
+        self._journal_ready = False
+        if self.ledger:
+            self.ledger.close()
+            self.ledger = None
+        self.save_file = path
+
+    def write_snapshot(self, game_data=None):
+        state = self.capture_state(game_data)
+        self.write_state(state)
+        seq = state["document"]["journal_seq"]
+        if self.journal:
+            self.journal.reset(seq)
+            self._snapshot_seq = seq
+            self._journal_ready = True
+
+    @timed("load_game", size=lambda tracker, result: len(tracker.transaction_log))
     def load_game(self):
+        if not os.path.exists(self.save_file):
+            raise SaveNotFoundError(f"No save file at {self.save_file}")
         try:
-            if os.path.exists(self.save_file):
-                with open(self.save_file, 'r') as f:
-                    data = json.load(f)
-                print("Loaded data:", data)  # Debug print
-                self.players = [Player.from_dict(p) for p in data["players"]]
-                self.properties = [Property.from_dict(p) for p in data["properties"]]
-                self.transaction_log = data.get("transactions", [])
-                # Ensure properties are correctly assigned to players
-                for player in self.players:
-                    print("Player properties before assignment:", player.properties)  # Debug print
-                    player.properties = [next(prop for prop in self.properties if prop.name == p.name) for p in player.properties]
-                    print("Player properties after assignment:", player.properties)  # Debug print
-                # Ensure owners are correctly assigned to properties
-                for property in self.properties:
-                    if property.owner:
-                        print(f"Assigning owner for property {property.name}: {property.owner}")  # Debug print
-                        property.owner = next(player for player in self.players if player.name == property.owner)
-                        print(f"Owner assigned for property {property.name}: {property.owner.name}")  # Debug print
-                messagebox.showinfo("Success", "Game loaded!")
-                return True
-            messagebox.showwarning("Warning", "No save file found!")
-            return False
+            if self.journal:
+                self.journal.close()
+                self._journal_ready = False
+            # Older JSON saves are migrated to the current layout as they are read
+            document = save_format.read_document(self.save_file)
+            self.load_snapshot(document)
+            logger.debug("Loaded %s: %d players, %d properties, %d transactions", self.save_file,
+                         len(self.players), len(self.properties), len(self.transaction_log))
+            if self.journal:
+                self._replay_journal(document.get("journal_seq", 0))
+            if self.ledger:
+                self.ledger.sync(self.players, self.properties, self.transaction_log, self.loans)
+            if self.replication:
+                self.replication.resync()
+            return True
         except Exception as e:
-            print("Error during load_game:", e)  # Debug print
-            messagebox.showerror("Error", f"Load failed: {str(e)}")
-            return False
-
-class Player:
-    def __init__(self, name):
-        self.name = name
-        self.money = 1500
-        self.properties = []
-        self.position = 0
-        self.in_jail = False
-
-    def add_property(self, property):
-        self.properties.append(property)
-        property.owner = self
-        
-    def remove_property(self, property):
-        self.properties.remove(property)
-        property.owner = None
+            logger.exception("Loading %s failed", self.save_file)
+            raise LoadError(str(e)) from e
 
-    def to_dict(self):
-        return {
-            "name": self.name,
-            "money": self.money,
-            "properties": [property.to_dict() for property in self.properties],  # Convert properties to dictionaries
-            "position": self.position,
-            "in_jail": self.in_jail
-        }
+    def load_snapshot(self, document):
+        # Replace the game with a save document (see core.save_format)
+        self.players, self.properties, self.transaction_log = save_format.load_document(document)
+        self.game_data = document.get("game_data")
+        # Saves from before the loan book kept loans in the GUI's game_data
+        self.loans = LoanBook.from_dict(document.get("loans") or self.game_data)
+        # Resolve owner names and player property lists through the name indexes
+        self._index_game()
+        self.stats = GameStats.from_log(self.transaction_log, self.properties)
+        self.changes.mark_all()
 
-    @classmethod
-    def from_dict(cls, data):
-        print("Player data being loaded:", data)  # Debug print
-        player = cls(data["name"])
-        player.money = data["money"]
-        player.properties = [Property.from_dict(p) if isinstance(p, dict) else p for p in data["properties"]]  # Convert property names to Property objects
-        player.position = data["position"]
-        player.in_jail = data["in_jail"]
-        print("Player created:", player)  # Debug print
-        return player
\ No newline at end of file
+    def apply_record(self, record):
+        # Apply one journal record, from the journal or streamed by a replication leader
+        if "game_data" in record:
+            self.game_data = record["game_data"]
+            if "loan_log" in self.game_data:
+                self.loans = LoanBook.from_dict(self.game_data)
+            return
+        if "loan" in record:
+            borrower, lender, amount = record["loan"]
+            if lender == "Bank":
+                self.loans.bank[borrower] = self.loans.bank.get(borrower, 0) + amount
+            else:
+                self.loans.add(borrower, lender, amount)
+            self.changes.mark_loans(borrower)
+            return
+        if "repaid" in record:
+            self.loans.remove(*record["repaid"])
+            self.changes.mark_loans(record["repaid"][0])
+            return
+        log = self.transaction_log
+        start = len(log)
+        if "batch" in record:
+            log.extend(record["batch"])
+            states = record["players"]
+        else:
+            if "entry" in record:
+                log.append(record["entry"])
+            states = [record["player"]]
+        for i in range(start, len(log)):
+            self.stats.record(log.kinds[i], log.player_names[log.player_ids[i]], log.amounts[i],
+                              log.property_ids[i], log.timestamps[i])
+        if len(log) > start:
+            self.changes.mark_log(start)
+        for state in states:
+            self._apply_player_state(state)
+            self.changes.mark_player(state["name"])
+
+    def _replay_journal(self, snapshot_seq):
+        # Bring the snapshot up to date with the records appended after it
+        records = self.journal.read(after_seq=snapshot_seq)
+        for record in records:
+            self.apply_record(record)
+        self._snapshot_seq = snapshot_seq
+        self.journal.open(seq=records[-1]["seq"] if records else snapshot_seq)
+        self._journal_ready = True
+
+    def attach_ledger(self, path=None):
+        # Mirror the game into an SQLite ledger (next to the save file by default).
+        # Transactions stream into it from log_transaction; the rest is written on save.
+        from core.ledger import SQLiteLedger
+        if self.ledger:
+            self.ledger.close()
+        self.ledger = SQLiteLedger(path or os.path.splitext(self.save_file)[0] + ".db")
+        self.ledger.sync(self.players, self.properties, self.transaction_log, self.loans)
+        return self.ledger
+
+    def start_replication(self, host="127.0.0.1", port=None):
+        # Stream every change to followers over a local socket, see core.replication.
+        # Returns the started ReplicationServer.
+        from core.replication import ReplicationLog, ReplicationServer, DEFAULT_PORT
+        if self.replication is None:
+            self.replication = ReplicationLog(self)
+        server = ReplicationServer(self.replication, host, port or DEFAULT_PORT)
+        server.start()
+        return server
+
+    def follow(self, host="127.0.0.1", port=None):
+        # Keep this game in step with a leader's; returns the started ReplicationFollower,
+        # whose poll() applies what has arrived
+        from core.replication import ReplicationFollower, DEFAULT_PORT
+        follower = ReplicationFollower(self, host, port or DEFAULT_PORT)
+        follower.start()
+        return follower
+
+    def load_ledger(self, path=None):
+        # Resume the game stored in an SQLite ledger instead of the save file
+        try:
+            ledger = self.ledger
+            if ledger is None or (path and path != ledger.path):
+                from core.ledger import SQLiteLedger
+                ledger = SQLiteLedger(path or os.path.splitext(self.save_file)[0] + ".db")
+            self.players, self.properties, self.transaction_log, self.loans = ledger.load_state()
+        except Exception as e:
+            logger.exception("Loading ledger failed")
+            raise LoadError(str(e)) from e
+        if self.ledger is not ledger:
+            if self.ledger:
+                self.ledger.close()
+            self.ledger = ledger
+        self._journal_ready = False  # The next save writes a full snapshot of this game
+        self._index_game()
+        self.stats = GameStats.from_log(self.transaction_log, self.properties)
+        self.changes.mark_all()
+        if self.replication:
+            self.replication.resync()
+        return True
+
+    def query_transactions(self, player=None, reason_type=None, property=None, color_group=None,
+                           since=None, until=None, limit=None):
+        # Transactions matching every given filter, oldest first (see SQLiteLedger.query).
+        # Without a ledger the in-memory log is scanned from the newest entry.
+        if self.ledger:
+            return self.ledger.query(player, reason_type, property, color_group, since, until, limit)
+        log = self.transaction_log
+        group_names = {prop.name for prop in self.properties if prop.color_group == color_group}
+        matches = []
+        for i in range(len(log) - 1, -1, -1):
+            if limit is not None and len(matches) >= limit:
+                break
+            timestamp = log.timestamps[i]
+            if (since is not None and timestamp < since) or (until is not None and timestamp > until):
+                continue
+            if player is not None and log.player_names[log.player_ids[i]] != player:
+                continue
+            entry_type, entry_property, _ = reasons.classify(log.reasons[log.reason_ids[i]])
+            if reason_type is not None and entry_type != reason_type:
+                continue
+            if property is not None and entry_property != property:
+                continue
+            if color_group is not None and entry_property not in group_names:
+                continue
+            matches.append(log.row(i))
+        matches.reverse()
+        return matches
+
+    def state_at(self, index):
+        # The table after the first `index` transactions (see events.Timeline)
+        if self._timeline is None or self._timeline.log is not self.transaction_log:
+            self._timeline = events.Timeline(self.transaction_log, len(self.properties))
+        return self._timeline.state_at(index)
+
+    def rebuild_from_csv(self, paths):
+        # Replace the game with the one replayed from exported transaction CSVs (one
+        # path or several, merged by timestamp). Returns the entries whose new_balance
+        # doesn't follow from the player's previous one, see importer.balance_gaps.
+        from core.importer import import_csv
+        if isinstance(paths, str):
+            paths = [paths]
+        try:
+            properties = self.load_france_properties()
+            log, state, gaps = import_csv(paths, properties)
+        except Exception as e:
+            logger.exception("Rebuilding from %s failed", ", ".join(paths))
+            raise LoadError(str(e)) from e
+        if gaps:
+            logger.warning("%d transactions don't continue the player's balance, first at #%d", len(gaps), gaps[0][0])
+        self.properties = properties
+        self.transaction_log = log
+        self.loans = LoanBook.from_log(log)
+        self._apply_state(state)
+        return gaps
+
+    def _apply_state(self, state):
+        # Make the players and properties match a replayed state
+        self.players = []
+        for name in state["players"]:
+            player = Player(name)
+            player.money = state["money"][name]
+            player.in_jail = state["in_jail"][name]
+            self.players.append(player)
+        by_name = {player.name: player for player in self.players}
+        for prop, owner, houses, mortgaged in zip(self.properties, state["owners"], state["houses"], state["mortgaged"]):
+            prop.owner = by_name.get(owner)
+            prop.houses = houses
+            prop.mortgaged = mortgaged
+            if prop.owner:
+                prop.owner.properties.append(prop)
+        self._journal_ready = False  # The next save writes a full snapshot of this game
+        self._index_game()
+        self.stats = GameStats.from_log(self.transaction_log, self.properties)
+        self.changes.mark_all()
+        if self.ledger:
+            self.ledger.sync(self.players, self.properties, self.transaction_log, self.loans)
+        if self.replication:
+            self.replication.resync()
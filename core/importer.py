@@ -0,0 +1,310 @@
+import csv
+import io
+from array import array
+from collections import Counter
+from datetime import datetime
+
+from core import events, reasons
+from core.transaction_log import TransactionLog, COLUMNS, NO_BALANCE, TIME_FORMAT
+
+CHUNK_BYTES = 1 << 20  # CSV text parsed at a time
+FIELDS = ["timestamp", "player", "amount", "new_balance", "reason"]
+TIME_DIGITS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18]  # Digit positions in TIME_FORMAT text
+
+
+def read_csv(path, chunk_bytes=CHUNK_BYTES):
+    # Reads a file written by Export CSV into a TransactionLog, a batch of lines at a
+    # time, column by column on the raw bytes with NumPy: each distinct player and
+    # reason is decoded and interned once (the reason classified through the compiled
+    # prefix table in core.reasons), and numbers and timestamps are decoded from the
+    # digits. Batches without quote characters (nothing to unescape) are split at the
+    # comma and line break positions; others go through csv.reader. Event properties
+    # are left unresolved.
+    import numpy as np
+    timestamps, player_ids, amounts, balances, reason_ids = (array(COLUMNS[name]) for name in (
+        "timestamps", "player_ids", "amounts", "balances", "reason_ids"))
+    player_index, reason_index, minutes = {}, {}, {}
+    with open(path, "rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8")]), None)
+        if not header:
+            raise ValueError(f"{path} is empty")
+        try:
+            positions = [header.index(field) for field in FIELDS]
+        except ValueError:
+            raise ValueError(f"{path} is not a transaction export (columns: {', '.join(header)})") from None
+        width = len(header)
+        line = 2
+        while True:
+            data = f.read(chunk_bytes)
+            if not data:
+                break
+            data += f.readline()  # Finish the last line
+            while b'"' in data and data.count(b'"') % 2:
+                # A quoted field goes on past the batch (it holds a line break)
+                more = f.readline()
+                if not more:
+                    break
+                data += more
+            columns = None
+            if b'"' not in data:
+                columns = _split_fields(data, width, positions)
+            if columns is not None:
+                count = len(columns[0][1])
+            else:
+                count = data.count(b"\n") + (not data.endswith(b"\n"))
+                text = data.decode("utf-8")
+                rows = list(csv.reader(io.StringIO(text, newline="")))
+                for i, row in enumerate(rows):
+                    if row and len(row) != width:
+                        raise ValueError(f"{path}, line {line + i}: expected {width} fields")
+                columns = list(zip(*(row for row in rows if row))) or [()] * width
+                columns = [_join_fields(columns[i]) for i in positions]
+            stamps, players, amount_texts, balance_texts, reason_texts = columns
+
+            timestamps.frombytes(_parse_times(*stamps, minutes).tobytes())
+            player_ids.frombytes(_intern_fields(*players, player_index).tobytes())
+            reason_ids.frombytes(_intern_fields(*reason_texts, reason_index).tobytes())
+            try:
+                amounts.frombytes(_parse_ints(*amount_texts).tobytes())
+                balances.frombytes(_parse_ints(*balance_texts, NO_BALANCE).tobytes())
+            except ValueError as e:
+                raise ValueError(f"{path}, lines {line}-{line + count - 1}: {e}") from None
+            line += count
+
+    reason_table = list(reason_index)
+    codes = np.array([reasons.kind_code(text) for text in reason_table] or [0], dtype=np.int8)
+    return TransactionLog.from_columns({
+        "timestamps": timestamps, "player_ids": player_ids, "amounts": amounts, "balances": balances,
+        "reason_ids": reason_ids,
+        "kinds": array("b", codes[np.frombuffer(reason_ids, dtype=np.int32)].tobytes()),
+        "player_names": list(player_index), "reasons": reason_table
+    })
+
+
+def _split_fields(data, width, positions):
+    # (chars, starts, ends) of each wanted column of unquoted CSV lines: the uint8 array
+    # of the batch and where each field begins and ends, from where the commas and line
+    # breaks are. None when a line is blank or has the wrong number of fields, for
+    # csv.reader to sort out
+    import numpy as np
+    if not data.endswith(b"\n"):
+        data += b"\n"
+    chars = np.frombuffer(data, dtype=np.uint8)
+    breaks = np.flatnonzero(chars == ord("\n"))
+    commas = np.flatnonzero(chars == ord(","))
+    if len(commas) != (width - 1) * len(breaks):
+        return None
+    edges = np.empty((len(breaks), width + 1), dtype=np.int64)
+    edges[0, 0] = -1
+    edges[1:, 0] = breaks[:-1]
+    edges[:, 1:width] = commas.reshape(len(breaks), width - 1)
+    edges[:, width] = breaks
+    if b"\r" in data:
+        # Lines end in \r\n (csv.writer's default), and there is no other \r
+        if data.count(b"\r") != len(breaks) or (chars[breaks - 1] != ord("\r")).any():
+            return None
+        edges[:, width] -= 1
+    # The positions are sorted, so a line holding another line's commas (or fewer
+    # than its own) ends up with a field ending before it starts
+    if (edges[:, 1:] - edges[:, :-1] < 1).any():
+        return None
+    return [(chars, edges[:, i] + 1, edges[:, i + 1]) for i in positions]
+
+
+def _join_fields(texts):
+    # The (chars, starts, ends) form of a list of field strings
+    import numpy as np
+    encoded = [text.encode("utf-8") for text in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    ends = np.cumsum(lengths)
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), ends - lengths, ends
+
+
+def _field_texts(chars, starts, ends):
+    raw = chars.tobytes()
+    return [raw[start:end].decode("utf-8") for start, end in zip(starts.tolist(), ends.tolist())]
+
+
+def _windows(chars, offsets, width):
+    # (offsets, width) matrix of the bytes from each offset on; bytes up to `width`
+    # before the start or past the end of chars read as zeros
+    import numpy as np
+    padding = np.zeros(width, dtype=np.uint8)
+    padded = np.concatenate([padding, chars, padding])
+    return np.lib.stride_tricks.sliding_window_view(padded, width)[offsets + width]
+
+
+def _intern_fields(chars, starts, ends, index):
+    # int32 ids of the field strings in `index`, adding new ones. Fields are grouped by
+    # a hash of their bytes, checked against the first field of each group, and each
+    # distinct one is decoded once.
+    import numpy as np
+    if not len(starts):
+        return np.zeros(0, dtype=np.int32)
+    lengths = ends - starts
+    width = -(-max(int(lengths.max()), 1) // 8) * 8
+    small = np.min_scalar_type(width)
+    fields = _windows(chars, starts, width) * (np.arange(width, dtype=small) < lengths.astype(small)[:, None])
+    words = fields.view(np.uint64)
+    weights = (np.arange(words.shape[1], dtype=np.uint64) * 2 + 1) * np.uint64(0x9E3779B97F4A7C15)  # Odd, wrapping
+    hashes = words @ weights + lengths.astype(np.uint64)
+    _, first, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+    inverse = inverse.ravel()
+    if (fields != fields[first[inverse]]).any():
+        # Two different fields with one hash: group by the bytes themselves
+        keys = np.ascontiguousarray(fields).view(f"S{width}").ravel()
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+    raw = chars.tobytes()
+    ids = [index.setdefault(raw[start:end].decode("utf-8"), len(index))
+           for start, end in zip(starts[first].tolist(), ends[first].tolist())]
+    return np.array(ids, dtype=np.int32)[inverse]
+
+
+def _parse_times(chars, starts, ends, minutes):
+    # Epoch seconds of TIME_FORMAT fields. The digits are read with NumPy and each
+    # distinct minute is converted once (local time, like datetime.timestamp()).
+    import numpy as np
+    if not len(starts):
+        return np.zeros(0, dtype=np.int64)
+    if ((ends - starts) != 19).any():
+        return np.array([_parse_time(text, minutes) for text in _field_texts(chars, starts, ends)], dtype=np.int64)
+    stamps = _windows(chars, starts, 19)
+    digits = stamps[:, TIME_DIGITS].astype(np.int64) - ord("0")
+    if ((digits < 0) | (digits > 9)).any() or (stamps[:, [4, 7, 10, 13, 16]] != np.frombuffer(b"-- ::", np.uint8)).any():
+        return np.array([_parse_time(text, minutes) for text in _field_texts(chars, starts, ends)], dtype=np.int64)
+    keys = digits[:, :12] @ (10 ** np.arange(11, -1, -1, dtype=np.int64))  # YYYYMMDDHHMM
+    unique, inverse = np.unique(keys, return_inverse=True)
+    bases = []
+    for key in unique.tolist():
+        base = minutes.get(key)
+        if base is None:
+            base = minutes[key] = int(datetime(key // 10 ** 8, key // 10 ** 6 % 100, key // 10 ** 4 % 100,
+                                               key // 100 % 100, key % 100).timestamp())
+        bases.append(base)
+    return np.array(bases, dtype=np.int64)[inverse.ravel()] + digits[:, 12] * 10 + digits[:, 13]
+
+
+def _parse_ints(chars, starts, ends, empty=None):
+    # int32 array of decimal fields, decoded from their digits with NumPy; empty fields
+    # become `empty` when given. Anything other than an optional minus sign and up to
+    # ten digits goes through int(), which raises for text that isn't a number.
+    import numpy as np
+    lengths = ends - starts
+    values = None
+    if not len(lengths):
+        values = np.zeros(0, dtype=np.int64)
+    elif lengths.max() <= 11 and (empty is not None or lengths.min() > 0):
+        width = max(int(lengths.max()), 1)
+        fields = _windows(chars, ends - width, width)  # Right-aligned, ones in the last column
+        first = width - lengths
+        inside = np.arange(width) >= first[:, None]
+        rows = np.flatnonzero((lengths > 0) & (fields[np.arange(len(lengths)), np.minimum(first, width - 1)] == ord("-")))
+        digits = fields.astype(np.int64) - ord("0")
+        digits[rows, first[rows]] = 0  # The minus signs
+        if not ((digits < 0) | (digits > 9))[inside].any() and not (lengths[rows] < 2).any():
+            values = (digits * inside) @ 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+            values[rows] *= -1
+            if empty is not None:
+                values[lengths == 0] = empty
+    if values is None:
+        texts = _field_texts(chars, starts, ends)
+        values = np.array([int(text) if text or empty is None else empty for text in texts], dtype=np.int64)
+    if len(values) and (values.min() < -2 ** 31 or values.max() >= 2 ** 31):
+        raise ValueError("amount out of range")
+    return values.astype(np.int32)
+
+
+def _parse_time(text, minutes):
+    # Single timestamp; TIME_FORMAT text shares the per-minute cache with _parse_times
+    if len(text) == 19:
+        key = int(text[:4] + text[5:7] + text[8:10] + text[11:13] + text[14:16])
+        if key in minutes:
+            return minutes[key] + int(text[17:])
+    return int(datetime.strptime(text, TIME_FORMAT).timestamp())
+
+
+def merge_logs(logs):
+    # One log ordered by timestamp (ties keep file order, then row order). Exports of the
+    # same game overlap, so a row found in several files is kept as often as the file
+    # with the most copies of it has it, not once per file.
+    if len(logs) == 1:
+        return logs[0]
+    import numpy as np
+    player_names, reason_table = [], []
+    player_index, reason_index = {}, {}
+    columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+    logs = [log for log in logs if len(log)]
+    for log in logs:
+        # Map each file's interned tables onto the merged ones
+        player_map = [_intern(name, player_names, player_index) for name in log.player_names]
+        reason_map = [_intern(text, reason_table, reason_index) for text in log.reasons]
+        for name in COLUMNS:
+            columns[name].extend(getattr(log, name))
+        columns["player_ids"][-len(log):] = array("i", map(player_map.__getitem__, log.player_ids))
+        columns["reason_ids"][-len(log):] = array("i", map(reason_map.__getitem__, log.reason_ids))
+
+    order = np.argsort(np.frombuffer(columns["timestamps"], dtype=np.int64), kind="stable")
+    keys = list(zip(columns["timestamps"], columns["player_ids"], columns["amounts"],
+                    columns["balances"], columns["reason_ids"]))
+    wanted = Counter()
+    start = 0
+    for log in logs:
+        for key, count in Counter(keys[start:start + len(log)]).items():
+            if count > wanted[key]:
+                wanted[key] = count
+        start += len(log)
+    kept = []
+    for i in order.tolist():
+        key = keys[i]
+        if wanted[key]:
+            wanted[key] -= 1
+            kept.append(i)
+    kept = np.array(kept, dtype=np.int64)
+    merged = {name: array(values.typecode, np.frombuffer(values, dtype=values.typecode)[kept].tobytes())
+              for name, values in columns.items()}
+    merged["player_names"] = player_names
+    merged["reasons"] = reason_table
+    return TransactionLog.from_columns(merged)
+
+
+def _intern(value, table, index):
+    value_id = index.get(value)
+    if value_id is None:
+        value_id = index[value] = len(table)
+        table.append(value)
+    return value_id
+
+
+def balance_gaps(log):
+    # Entries whose new_balance doesn't follow from the same player's previous balance
+    # plus the amount (a player's first balance follows from STARTING_MONEY), as
+    # (index, player, expected, actual)
+    if not len(log):
+        return []
+    import numpy as np
+    balances = np.frombuffer(log.balances, dtype=np.int32).astype(np.int64)
+    indexes = np.flatnonzero(balances != NO_BALANCE)
+    player_ids = np.frombuffer(log.player_ids, dtype=np.int32)[indexes]
+    indexes = indexes[np.argsort(player_ids, kind="stable")]
+    player_ids = np.frombuffer(log.player_ids, dtype=np.int32)[indexes]
+    balances = balances[indexes]
+    first = np.ones(len(indexes), dtype=bool)
+    first[1:] = player_ids[1:] != player_ids[:-1]
+    previous = np.empty_like(balances)
+    previous[1:] = balances[:-1]
+    previous[first] = events.STARTING_MONEY
+    expected = previous + np.frombuffer(log.amounts, dtype=np.int32)[indexes]
+    bad = np.flatnonzero(balances != expected)
+    gaps = [(int(indexes[i]), log.player_names[player_ids[i]], int(expected[i]), int(balances[i])) for i in bad]
+    gaps.sort()
+    return gaps
+
+
+def import_csv(paths, properties):
+    # Reads and merges exported CSV files and replays them against the catalog
+    # `properties`. Returns (log, final state, balance gaps); see events for the state.
+    log = merge_logs([read_csv(path) for path in paths])
+    events.resolve_properties(log, properties)
+    state = events.replay(events.initial_state(len(properties)), log, len(log))
+    return log, state, balance_gaps(log)
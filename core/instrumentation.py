@@ -0,0 +1,182 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+# Timers, counters and histograms for the engine's hot paths, plus an opt-in
+# cProfile/tracemalloc capture. Methods are marked with @timed; enable() swaps a
+# timing wrapper onto their classes and disable() puts the plain function back, so
+# instrumentation that is off costs nothing on the marked calls. Latencies (in
+# microseconds) and sizes go into power-of-two histograms.
+BUCKETS = 40  # Bucket i holds values in [2 ** (i - 1), 2 ** i); bucket 0 holds 0
+PROFILE_TOP = 25  # Functions and allocation sites kept in a capture's summary
+
+enabled = False
+_probes = []  # (function, metric name, size function)
+_metrics = {}  # Metric name -> Histogram
+_counters = {}
+_lock = threading.Lock()  # Exports run on a worker thread
+_capture = None  # (cProfile.Profile, started at) while capturing
+_last_capture = None  # Summary of the last finished capture
+
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * BUCKETS
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.buckets[min(int(value).bit_length(), BUCKETS - 1)] += 1
+
+    def percentile(self, p):
+        # Upper bound of the bucket holding the p-th value
+        rank = p * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(2 ** i, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {"count": self.count, "total": self.total, "mean": self.total / self.count if self.count else None,
+                "min": self.min, "max": self.max,
+                "p50": self.percentile(0.5), "p95": self.percentile(0.95), "p99": self.percentile(0.99),
+                "buckets": {f"<{2 ** i}": count for i, count in enumerate(self.buckets) if count}}
+
+
+def timed(name, size=None):
+    # Marks a method whose calls are timed under `name` while instrumentation is on.
+    # size(self, result) gives a size recorded under "<name>.size" (bytes, rows...).
+    def mark(func):
+        _probes.append((func, name, size))
+        return func
+    return mark
+
+
+def enable():
+    global enabled
+    if enabled:
+        return
+    for func, name, size in _probes:
+        setattr(_owner(func), func.__name__, _wrap(func, name, size))
+    enabled = True
+
+
+def disable():
+    global enabled
+    for func, _, _ in _probes:
+        setattr(_owner(func), func.__name__, func)
+    enabled = False
+
+
+def _owner(func):
+    # The class the method was defined in (instrumented methods live on top-level classes)
+    return getattr(sys.modules[func.__module__], func.__qualname__.split(".")[0])
+
+
+def _wrap(func, name, size):
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            result = func(self, *args, **kwargs)
+        finally:
+            record(name, (time.perf_counter_ns() - start) // 1000)
+        if size is not None:
+            record(name + ".size", size(self, result))
+        return result
+    return wrapper
+
+
+def record(name, value):
+    with _lock:
+        histogram = _metrics.get(name)
+        if histogram is None:
+            histogram = _metrics[name] = Histogram()
+        histogram.add(value)
+
+
+def count(name, n=1):
+    if enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + n
+
+
+def reset():
+    with _lock:
+        _metrics.clear()
+        _counters.clear()
+
+
+def snapshot():
+    # Everything recorded so far, JSON-ready. Timer values are in microseconds.
+    with _lock:
+        return {"enabled": enabled, "capturing": _capture is not None,
+                "metrics": {name: histogram.to_dict() for name, histogram in sorted(_metrics.items())},
+                "counters": dict(sorted(_counters.items())), "last_capture": _last_capture}
+
+
+def export(path):
+    tmp_file = path + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(snapshot(), f, indent=2)
+    os.replace(tmp_file, path)
+
+
+def capturing():
+    return _capture is not None
+
+
+def start_capture():
+    # Profiles the calling thread (the Tk thread in the GUI) with cProfile and traces
+    # allocations everywhere with tracemalloc, until stop_capture. Timers are enabled too.
+    global _capture
+    import cProfile
+    import tracemalloc
+    if _capture is not None:
+        return
+    enable()
+    tracemalloc.start()
+    profile = cProfile.Profile()
+    _capture = (profile, time.time())
+    profile.enable()
+
+
+def stop_capture(profile_path=None):
+    # Stops the capture and returns its summary (top functions by cumulative time, top
+    # allocation sites). profile_path also gets the raw profile for pstats/snakeviz.
+    global _capture, _last_capture
+    import pstats
+    import tracemalloc
+    if _capture is None:
+        return None
+    profile, started = _capture
+    profile.disable()
+    _capture = None
+    allocations = tracemalloc.take_snapshot().statistics("lineno")
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if profile_path:
+        profile.dump_stats(profile_path)
+    stats = pstats.Stats(profile)
+    functions = sorted(stats.stats.items(), key=lambda item: -item[1][3])[:PROFILE_TOP]
+    _last_capture = {
+        "started": started, "seconds": time.time() - started, "profile": profile_path,
+        "functions": [{"function": f"{file}:{line}({func})", "calls": calls, "own_seconds": own,
+                       "cumulative_seconds": cumulative}
+                      for (file, line, func), (_, calls, own, cumulative, _) in functions],
+        "memory": {"current": current, "peak": peak},
+        "allocations": [{"site": str(stat.traceback[0]), "bytes": stat.size, "blocks": stat.count}
+                        for stat in allocations[:PROFILE_TOP]]
+    }
+    return _last_capture
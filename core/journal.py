@@ -0,0 +1,72 @@
+import json
+import os
+
+
+class TransactionJournal:
+    def __init__(self, path, fsync_every=32):
+        self.path = path
+        self.fsync_every = fsync_every  # Records written between fsyncs
+        self.seq = 0  # Sequence number of the last appended record
+        self._file = None
+        self._unsynced = 0
+
+    def open(self, seq=0):
+        # Continue appending after an existing journal
+        self.close()
+        self.seq = seq
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def reset(self, seq):
+        # Start an empty journal after a snapshot has been written
+        self.close()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._fsync()
+        self.seq = seq
+
+    def append(self, record):
+        self.seq += 1
+        record["seq"] = self.seq
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        if self._file and self._unsynced:
+            self._fsync()
+
+    def close(self):
+        if self._file:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def read(self, after_seq=0):
+        # Return every record newer than after_seq. A torn final record left by
+        # a crash mid-write is cut off so appending can resume cleanly.
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        good_end = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                good_end += len(line)
+                if record.get("seq", 0) > after_seq:
+                    records.append(record)
+        if good_end < os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(good_end)
+        return records
+
+    def _fsync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
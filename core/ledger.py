@@ -0,0 +1,191 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+from core import events, reasons
+from core.loans import LoanBook
+from core.player import Player
+from core.property import Property
+from core.transaction_log import TransactionLog, NO_BALANCE, TIME_FORMAT
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY, money INTEGER, position INTEGER, in_jail INTEGER);
+CREATE TABLE IF NOT EXISTS properties (
+    id INTEGER PRIMARY KEY, name TEXT, price INTEGER, rent TEXT, color_group TEXT,
+    owner TEXT, houses INTEGER, mortgaged INTEGER DEFAULT 0);
+CREATE TABLE IF NOT EXISTS loans (
+    borrower TEXT, lender TEXT, amount INTEGER);
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY, timestamp INTEGER, player TEXT, amount INTEGER,
+    new_balance INTEGER, reason TEXT, reason_type TEXT, property TEXT);
+CREATE INDEX IF NOT EXISTS transactions_player ON transactions (player, timestamp);
+CREATE INDEX IF NOT EXISTS transactions_player_reason ON transactions (player, reason_type, timestamp);
+CREATE INDEX IF NOT EXISTS transactions_property ON transactions (property, timestamp);
+CREATE INDEX IF NOT EXISTS transactions_reason ON transactions (reason_type, timestamp);
+CREATE INDEX IF NOT EXISTS transactions_time ON transactions (timestamp);
+"""
+INSERT = ("INSERT INTO transactions (timestamp, player, amount, new_balance, reason, reason_type, property) "
+          "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+
+class SQLiteLedger:
+    # SQLite copy of a game, queryable by player, property, color group, reason type
+    # and time. Transactions are buffered and inserted in batches; players, properties
+    # and loans are rewritten on each save. The database runs in WAL mode so readers
+    # never block the writer.
+    def __init__(self, path, batch_size=500):
+        self.path = path
+        self.batch_size = batch_size  # Buffered transactions before an insert
+        self._pending = []
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent; fsync happens at checkpoints
+        self.conn.executescript(SCHEMA)
+        if "mortgaged" not in [row[1] for row in self.conn.execute("PRAGMA table_info(properties)")]:
+            # Ledgers written before mortgages existed
+            self.conn.execute("ALTER TABLE properties ADD COLUMN mortgaged INTEGER DEFAULT 0")
+
+    def add(self, timestamp, player_name, amount, new_balance, reason):
+        reason_type, prop, _ = reasons.classify(reason)
+        self._pending.append((timestamp, player_name, amount,
+                              None if new_balance is None or new_balance == NO_BALANCE else new_balance,
+                              reason, reason_type, prop))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            with self.conn:
+                self.conn.executemany(INSERT, self._pending)
+            self._pending = []
+
+    def add_log(self, log, start=0):
+        # Bulk insert of log entries [start:], in one transaction
+        names, texts = log.player_names, log.reasons
+        self.flush()
+        with self.conn:
+            self.conn.executemany(INSERT, (
+                (log.timestamps[i], names[log.player_ids[i]], log.amounts[i],
+                 None if log.balances[i] == NO_BALANCE else log.balances[i],
+                 texts[log.reason_ids[i]]) + reasons.classify(texts[log.reason_ids[i]])[:2]
+                for i in range(start, len(log))
+            ))
+
+    def save_state(self, players, properties, loans=None):
+        self.flush()
+        with self.conn:
+            self.conn.execute("DELETE FROM players")
+            self.conn.executemany("INSERT INTO players VALUES (?, ?, ?, ?)", [
+                (p.name, p.money, p.position, int(p.in_jail)) for p in players
+            ])
+            self.conn.execute("DELETE FROM properties")
+            self.conn.executemany("INSERT INTO properties VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [
+                (i, p.name, p.price, json.dumps(p.rent), p.color_group, p.owner.name if p.owner else None, p.houses,
+                 int(p.mortgaged))
+                for i, p in enumerate(properties)
+            ])
+            self.conn.execute("DELETE FROM loans")
+            if loans:
+                rows = [(borrower, lender, amount) for borrower in loans.by_borrower
+                        for lender, amount in loans.loans_of(borrower)]
+                rows += [(borrower, "Bank", amount) for borrower, amount in loans.bank.items()]
+                self.conn.executemany("INSERT INTO loans VALUES (?, ?, ?)", rows)
+
+    def sync(self, players, properties, log, loans=None):
+        # Make the ledger match a game. When the stored transactions are a prefix of
+        # the log (the ledger was kept by the session that saved it) only the missing
+        # tail is inserted; otherwise the transactions are rewritten.
+        self.flush()
+        count, = self.conn.execute("SELECT COUNT(*) FROM transactions").fetchone()
+        if count and not (count <= len(log) and self._matches(log, 0) and self._matches(log, count - 1)):
+            with self.conn:
+                self.conn.execute("DELETE FROM transactions")
+            count = 0
+        self.add_log(log, count)
+        self.save_state(players, properties, loans)
+
+    def _matches(self, log, index):
+        # Rows are only ever appended or all deleted, so ids run 1..count
+        row = self.conn.execute(
+            "SELECT timestamp, player, amount, reason FROM transactions WHERE id = ?", (index + 1,)
+        ).fetchone()
+        return row == (log.timestamps[index], log.player_names[log.player_ids[index]],
+                       log.amounts[index], log.reasons[log.reason_ids[index]])
+
+    def load_state(self):
+        # Returns (players, properties, transaction log, LoanBook) stored in the ledger
+        self.flush()
+        players = []
+        for name, money, position, in_jail in self.conn.execute(
+                "SELECT name, money, position, in_jail FROM players ORDER BY rowid"):
+            player = Player(name)
+            player.money, player.position, player.in_jail = money, position, bool(in_jail)
+            players.append(player)
+        by_name = {p.name: p for p in players}
+        properties = []
+        for name, price, rent, color_group, owner, houses, mortgaged in self.conn.execute(
+                "SELECT name, price, rent, color_group, owner, houses, mortgaged FROM properties ORDER BY id"):
+            prop = Property(name, price, json.loads(rent), color_group, houses=houses)
+            prop.mortgaged = bool(mortgaged)
+            if owner in by_name:
+                prop.owner = by_name[owner]
+                by_name[owner].properties.append(prop)
+            properties.append(prop)
+        log = TransactionLog()
+        for timestamp, player, amount, balance, reason in self.conn.execute(
+                "SELECT timestamp, player, amount, new_balance, reason FROM transactions ORDER BY id"):
+            log.record(player, amount, reason, balance, timestamp)
+        events.resolve_properties(log, properties)
+        loans = LoanBook()
+        for borrower, lender, amount in self.conn.execute("SELECT borrower, lender, amount FROM loans ORDER BY rowid"):
+            if lender == "Bank":
+                loans.bank[borrower] = amount
+            else:
+                loans.add(borrower, lender, amount)
+        return players, properties, log, loans
+
+    def query(self, player=None, reason_type=None, property=None, color_group=None,
+              since=None, until=None, limit=None):
+        # Matching transactions, oldest first, as log-style row dicts. since/until are
+        # epoch seconds (inclusive); limit keeps only the newest rows.
+        self.flush()
+        clauses, params = [], []
+        for column, value in (("player", player), ("reason_type", reason_type), ("property", property)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if color_group is not None:
+            clauses.append("property IN (SELECT name FROM properties WHERE color_group = ?)")
+            params.append(color_group)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp <= ?")
+            params.append(until)
+        sql = "SELECT timestamp, player, amount, new_balance, reason FROM transactions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        # Every index ends in (timestamp, rowid), so the newest rows come straight off it
+        sql += " ORDER BY timestamp DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = [_row(*values) for values in self.conn.execute(sql, params)]
+        rows.reverse()
+        return rows
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+def _row(timestamp, player, amount, new_balance, reason):
+    entry = {"timestamp": datetime.fromtimestamp(timestamp).strftime(TIME_FORMAT), "player": player, "amount": amount}
+    if new_balance is not None:
+        entry["new_balance"] = new_balance
+    entry["reason"] = reason
+    return entry
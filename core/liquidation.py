@@ -0,0 +1,138 @@
+import functools
+import itertools
+import math
+
+from core import analytics
+from core.board import HOUSE_COSTS
+
+MORTGAGE_INTEREST = 10  # Percent added to the mortgage value to lift a mortgage
+
+
+def mortgage_value(prop):
+    return prop.price // 2
+
+
+def unmortgage_cost(prop):
+    return mortgage_value(prop) * (100 + MORTGAGE_INTEREST) // 100
+
+
+def liquidation_plan(player, debt, rent_engine, properties):
+    # The house sales and mortgages that raise at least `debt - player.money` while
+    # giving up the least expected rent per opponent turn. Each color group's options
+    # (houses sold per property, then which properties to mortgage once the group has
+    # no buildings) are enumerated and pruned to those not beaten on both cash and
+    # rent, memoized on the group's holdings; a knapsack over the groups then picks
+    # one option per group. Returns a dict: covered, cash, lost_rent,
+    # house_sales [(property, count)] and mortgages [property]. When everything
+    # together isn't enough, covered is False and the plan sells every building.
+    need = debt - player.money
+    groups = _holdings(player, rent_engine, properties)
+    plan = {"covered": True, "cash": 0, "lost_rent": 0.0, "house_sales": [], "mortgages": []}
+    if need <= 0:
+        return plan
+    keys = [tuple(item for _, item in props) for props in groups]
+    options = [_group_options(key) for key in keys]
+    if sum(group[-1][0] for group in options) < need:
+        plan["covered"] = False
+        plan["house_sales"] = [(prop, prop.houses) for props in groups for prop, _ in props if prop.houses]
+        plan["cash"] = sum(HOUSE_COSTS[prop.color_group] // 2 * count for prop, count in plan["house_sales"])
+        return plan
+    for props, group, choice in zip(groups, options, _knapsack(options, need)):
+        cash, lost, sold, mortgaged = group[choice]
+        plan["cash"] += cash
+        plan["lost_rent"] += lost
+        plan["house_sales"].extend((prop, count) for (prop, _), count in zip(props, sold) if count)
+        plan["mortgages"].extend(props[i][0] for i in mortgaged)
+    return plan
+
+
+def _holdings(player, rent_engine, properties):
+    # The player's properties per color group as (property, item), item = (houses,
+    # refund per house, mortgage value, expected rent at levels 0..houses); mortgaged
+    # properties have nothing left to give
+    per_turn = analytics.landing_per_turn(properties)
+    groups = {}
+    for prop in player.properties:
+        if prop.mortgaged:
+            item = (0, 0, 0, (0.0,))
+        else:
+            landing = per_turn[rent_engine.index_of(prop)]
+            levels = rent_engine.rent_levels(prop)
+            item = (prop.houses, HOUSE_COSTS.get(prop.color_group, 0) // 2, mortgage_value(prop),
+                    tuple(landing * rent for rent in levels[:prop.houses + 1]))
+        groups.setdefault(prop.color_group, []).append((prop, item))
+    return list(groups.values())
+
+
+@functools.lru_cache(maxsize=4096)
+def _group_options(key):
+    # (cash, lost rent, houses sold per property, indexes mortgaged) for one group,
+    # Pareto-pruned and sorted by cash; the first option is always "do nothing"
+    options = []
+    mortgageable = [i for i, (_, _, value, _) in enumerate(key) if value]
+    for sold in itertools.product(*(range(houses + 1) for houses, _, _, _ in key)):
+        cash = sum(count * refund for count, (_, refund, _, _) in zip(sold, key))
+        lost = sum(rents[houses] - rents[houses - count] for count, (houses, _, _, rents) in zip(sold, key))
+        options.append((cash, lost, sold, ()))
+        if any(houses - count for count, (houses, _, _, _) in zip(sold, key)):
+            continue
+        # No buildings left in the group, so its properties can be mortgaged
+        for size in range(1, len(mortgageable) + 1):
+            for chosen in itertools.combinations(mortgageable, size):
+                options.append((cash + sum(key[i][2] for i in chosen),
+                                lost + sum(key[i][3][0] for i in chosen), sold, chosen))
+    options.sort(key=lambda option: (-option[0], option[1]))
+    front = []
+    for option in options:
+        if not front or option[1] < front[-1][1]:
+            front.append(option)
+    front.reverse()
+    return tuple(front)
+
+
+def _knapsack(options, need):
+    # Index of the option picked in each group, minimizing lost rent subject to the
+    # cash reaching `need`. Cash is counted in units of the options' common divisor
+    # and capped at the target, so the table has at most need / unit + 1 cells.
+    import numpy as np
+    unit = 0
+    for group in options:
+        for cash, *_ in group:
+            unit = math.gcd(unit, cash)
+    target = -(-need // unit)
+    best = np.full(target + 1, np.inf)
+    best[0] = 0.0
+    stages = []
+    for group in options:
+        new = best.copy()
+        choice = np.zeros(target + 1, dtype=np.int32)
+        capped_from = 0
+        for j, (cash, lost, _, _) in enumerate(group):
+            if not j:
+                continue
+            step = cash // unit
+            if step < target:
+                candidate = best[:target - step] + lost
+                better = candidate < new[step:target]
+                new[step:target][better] = candidate[better]
+                choice[step:target][better] = j
+            low = max(0, target - step)
+            k = low + int(np.argmin(best[low:]))
+            if best[k] + lost < new[target]:
+                new[target] = best[k] + lost
+                choice[target] = j
+                capped_from = k
+            if step >= target:
+                break  # Later options only raise more cash and cost more rent
+        stages.append((choice, capped_from))
+        best = new
+
+    picks = []
+    cell = target
+    for group, (choice, capped_from) in zip(reversed(options), reversed(stages)):
+        j = int(choice[cell])
+        picks.append(j)
+        if j:
+            cell = capped_from if cell == target else cell - group[j][0] // unit
+    picks.reverse()
+    return picks
@@ -0,0 +1,132 @@
+import heapq
+import itertools
+
+from core.errors import RuleError
+from core.reasons import KINDS, classify
+
+BANK_LOAN_LIMIT = 360  # Most a player may owe the bank at once
+LOAN_KINDS = {"loan_in", "bank_loan", "repayment_out", "bank_repayment"}
+
+
+class LoanBook:
+    # Outstanding loans. Player loans are kept in a min-heap per borrower and one per
+    # (borrower, lender), sharing the same entries; repaid entries are marked inactive
+    # and dropped when they reach the top of a heap. Adding, repaying and checking
+    # whether a borrower can repay anything are O(log loans).
+    def __init__(self):
+        self.by_borrower = {}  # Borrower name -> heap of [amount, seq, lender, active]
+        self.by_lender = {}  # (borrower, lender) -> heap of the same entries
+        self.bank = {}  # Borrower name -> amount owed to the bank
+        self._seq = itertools.count()  # Ties between equal amounts go to the older loan
+
+    @classmethod
+    def from_dict(cls, data):
+        # Reads to_dict() output, which is also the layout of the GUI's old game_data
+        book = cls()
+        for borrower, loans in (data or {}).get("loan_log", {}).items():
+            for loan in loans:
+                book.add(borrower, loan["lender"], loan["amount"])
+        for borrower, amount in (data or {}).get("bank_loans", {}).items():
+            book.bank[borrower] = amount
+        return book
+
+    @classmethod
+    def from_log(cls, log):
+        # Replays the loan and repayment events of a transaction log
+        book = cls()
+        for i in range(len(log)):
+            kind = KINDS[log.kinds[i]]
+            if kind not in LOAN_KINDS:
+                continue
+            borrower = log.player_names[log.player_ids[i]]
+            lender = classify(log.reasons[log.reason_ids[i]])[2]
+            if kind == "loan_in":
+                book.add(borrower, lender, log.amounts[i])
+            elif kind == "bank_loan":
+                book.bank[borrower] = book.bank.get(borrower, 0) + log.amounts[i]
+            elif kind == "bank_repayment":
+                book.bank.pop(borrower, None)
+            elif book.smallest(borrower, lender) is not None:
+                book.remove(borrower, lender)
+        return book
+
+    def to_dict(self):
+        return {
+            "loan_log": {borrower: [{"lender": lender, "amount": amount} for lender, amount in self.loans_of(borrower)]
+                         for borrower in self.by_borrower},
+            "bank_loans": dict(self.bank)
+        }
+
+    def add(self, borrower, lender, amount):
+        entry = [amount, next(self._seq), lender, True]
+        heapq.heappush(self.by_borrower.setdefault(borrower, []), entry)
+        heapq.heappush(self.by_lender.setdefault((borrower, lender), []), entry)
+
+    def add_bank(self, borrower, amount):
+        if amount <= 0:
+            raise RuleError("Amount must be positive")
+        if self.bank.get(borrower, 0) + amount > BANK_LOAN_LIMIT:
+            raise RuleError(f"Total loan amount exceeds {BANK_LOAN_LIMIT}")
+        self.bank[borrower] = self.bank.get(borrower, 0) + amount
+
+    def smallest(self, borrower, lender=None):
+        # Amount of the borrower's smallest loan (from one lender, if given), or None
+        key = borrower if lender is None else (borrower, lender)
+        top = self._top(self.by_borrower if lender is None else self.by_lender, key)
+        return top[0] if top else None
+
+    def remove(self, borrower, lender):
+        # Removes the smallest loan from lender ("Bank" for the bank debt) and returns its amount
+        if lender == "Bank":
+            if borrower not in self.bank:
+                raise RuleError(f"{borrower} owes nothing to the Bank")
+            return self.bank.pop(borrower)
+        top = self._top(self.by_lender, (borrower, lender))
+        if top is None:
+            raise RuleError(f"{borrower} owes nothing to {lender}")
+        heapq.heappop(self.by_lender[(borrower, lender)])
+        top[3] = False
+        self._top(self.by_lender, (borrower, lender))
+        self._top(self.by_borrower, borrower)
+        return top[0]
+
+    def suggestions(self, borrower, money):
+        # (lender, amount) of the loans the borrower can repay now, smallest first,
+        # for as long as the money lasts. Usually the smallest loan is already out of
+        # reach, which only costs a look at the top of the heap.
+        top = self._top(self.by_borrower, borrower)
+        if top is None or top[0] > money:
+            return []
+        result = []
+        for amount, _, lender, active in sorted(self.by_borrower[borrower]):
+            if not active:
+                continue
+            if amount > money:
+                break
+            result.append((lender, amount))
+            money -= amount
+        return result
+
+    def loans_of(self, borrower):
+        return [(lender, amount) for amount, _, lender, active in sorted(self.by_borrower.get(borrower, [])) if active]
+
+    def lenders_of(self, borrower):
+        lenders = list(dict.fromkeys(lender for lender, _ in self.loans_of(borrower)))
+        if borrower in self.bank:
+            lenders.append("Bank")
+        return lenders
+
+    def borrowers(self):
+        return list(dict.fromkeys(itertools.chain(self.by_borrower, self.bank)))
+
+    def _top(self, heaps, key):
+        heap = heaps.get(key)
+        while heap and not heap[0][3]:
+            heapq.heappop(heap)
+        if heap is not None and not heap:
+            del heaps[key]
+            return None
+        return heap[0] if heap else None
+
+    def __bool__(self):
+        return bool(self.by_borrower or self.bank)
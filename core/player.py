@@ -1,3 +1,8 @@
+import logging
+from core.property import Property
+
+logger = logging.getLogger(__name__)
+
 class Player:
     def __init__(self, name):
         self.name = name
@@ -5,14 +10,19 @@ class Player:
         self.properties = []
         self.position = 0
         self.in_jail = False
+        self.registry = None  # Set when the player joins a tracker
 
     def add_property(self, property):
         self.properties.append(property)
         property.owner = self
+        if self.registry:
+            self.registry.owner_changed(property)
         
     def remove_property(self, property):
         self.properties.remove(property)
         property.owner = None
+        if self.registry:
+            self.registry.owner_changed(property)
 
     def to_dict(self):
         return {
@@ -25,11 +35,10 @@ class Player:
 
     @classmethod
     def from_dict(cls, data):
-        print("Player data being loaded:", data)  # Debug print
         player = cls(data["name"])
         player.money = data["money"]
         player.properties = [Property.from_dict(p) if isinstance(p, dict) else p for p in data["properties"]]  # Convert property names to Property objects
         player.position = data["position"]
         player.in_jail = data["in_jail"]
-        print("Player created:", player)  # Debug print
+        logger.debug("Loaded player %s with %d properties", player.name, len(player.properties))
         return player
\ No newline at end of file
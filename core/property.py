@@ -1,10 +1,16 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
 class Property:
-    def __init__(self, name, price, rent, color_group, owner=None):
+    def __init__(self, name, price, rent, color_group, owner=None, houses=0):
         self.name = name
         self.price = price
         self.rent = rent
         self.color_group = color_group
         self.owner = owner
+        self.houses = houses  # 1-4 houses, 5 for a hotel
+        self.mortgaged = False  # Mortgaged properties collect no rent
 
     def calculate_rent(self):
         # Assuming rent is a list and we want to return the first element
@@ -16,15 +22,18 @@ class Property:
             "price": self.price,
             "rent": self.rent,
             "color_group": self.color_group,
-            "owner": self.owner.name if self.owner else None
+            "owner": self.owner.name if self.owner else None,
+            "houses": self.houses,
+            "mortgaged": self.mortgaged
         }
 
     @classmethod
     def from_dict(cls, data):
-        print("Property data being loaded:", data)  # Debug print
         property = cls(data["name"], data["price"], data["rent"], data["color_group"])
         property.owner = data["owner"]  # Store owner as a string initially
-        print("Property created:", property)  # Debug print
+        property.houses = data.get("houses", 0)
+        property.mortgaged = data.get("mortgaged", False)
+        logger.debug("Loaded property %s (owner: %s)", property.name, property.owner)
         return property
 
     def __str__(self):
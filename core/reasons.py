@@ -0,0 +1,82 @@
+# Transaction reasons are free text written by the engine and GUI. This table turns
+# them back into a reason type plus the property and/or player they mention. Patterns
+# are grouped by first word, so classifying a reason is one dict lookup and a few
+# prefix checks, and results are cached because logs repeat the same reasons.
+
+# (prefix, reason type, what follows the prefix). Within a first word, longer
+# prefixes must come first.
+PATTERNS = [
+    ("Created ", "created", "property"),
+    ("Player created", "player_created", None),
+    ("Purchased ", "purchase", "property"),
+    ("Paid rent for ", "rent_paid", "property"),
+    ("Received rent for ", "rent_received", "property"),
+    ("Received from ", "transfer_in", "player"),
+    ("Transferred to ", "transfer_out", "player"),
+    ("Loaned to ", "loan_out", "player"),
+    ("Loan from Bank", "bank_loan", None),
+    ("Loan from ", "loan_in", "player"),
+    ("Repayment to Bank", "bank_repayment", None),
+    ("Repayment to ", "repayment_out", "player"),
+    ("Repayment from ", "repayment_in", "player"),
+    ("Sold house on ", "building_sale", "property"),
+    ("Sold hotel on ", "building_sale", "property"),
+    ("Sold ", "sale", "property to player"),
+    ("Bought ", "purchase_from_player", "property from player"),
+    ("Built house on ", "build", "property"),
+    ("Built hotel on ", "build", "property"),
+    ("Manual adjustment", "adjustment", None),
+    ("Jailed", "jailed", None),
+    ("Released", "released", None),
+    ("Mortgaged ", "mortgage", "property"),
+    ("Unmortgaged ", "unmortgage", "property"),
+    ("Forfeited ", "forfeit", "property to player"),
+    ("Bankrupt to ", "bankruptcy", "player"),
+]
+# Event kinds in the order their codes are stored in saves; only ever append
+KINDS = (
+    "other", "created", "player_created", "purchase", "rent_paid", "rent_received",
+    "transfer_out", "transfer_in", "loan_out", "loan_in", "bank_loan", "repayment_out",
+    "repayment_in", "bank_repayment", "sale", "purchase_from_player", "build",
+    "building_sale", "adjustment", "jailed", "released", "mortgage", "unmortgage", "forfeit",
+    "bankruptcy",
+)
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+REASON_TYPES = sorted(KINDS)
+
+_by_first_word = {}
+for _pattern in PATTERNS:
+    _by_first_word.setdefault(_pattern[0].split(" ", 1)[0], []).append(_pattern)
+
+_cache = {}
+
+
+def classify(reason):
+    # Returns (reason type, property name or None, other player name or None)
+    result = _cache.get(reason)
+    if result is None:
+        result = _classify(reason)
+        _cache[reason] = result
+    return result
+
+
+def kind_code(reason):
+    return KIND_CODES[classify(reason)[0]]
+
+
+def _classify(reason):
+    for prefix, reason_type, rest in _by_first_word.get(reason.split(" ", 1)[0], ()):
+        if not reason.startswith(prefix):
+            continue
+        tail = reason[len(prefix):]
+        if rest is None:
+            return reason_type, None, None
+        if rest == "property":
+            return reason_type, tail, None
+        if rest == "player":
+            return reason_type, None, tail
+        # "<property> to <player>" / "<property> from <player>"
+        separator = " to " if rest == "property to player" else " from "
+        prop, _, player = tail.rpartition(separator)
+        return reason_type, prop or tail, player or None
+    return "other", None, None
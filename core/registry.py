@@ -0,0 +1,79 @@
+class Registry:
+    # Name indexes over the tracker's players and properties. Ownership indexes are
+    # kept up to date by Player.add_property/remove_property, so lookups never scan.
+    def __init__(self, changes=None):
+        self.changes = changes  # ChangeSet that records ownership changes, if any
+        self.listeners = []  # Called with (property, old owner name, new owner name)
+        self.clear()
+
+    def clear(self):
+        self.players = {}  # Player name -> Player
+        self.properties = {}  # Property name -> Property
+        # Ownership is keyed by the Property itself, since catalog names are not unique
+        self.owned = {}  # Owner name -> {Property: Property}, in insertion order
+        self.unowned = set()  # Properties without an owner
+        self._owner_of = {}  # Property -> owner name, to undo the previous owner
+        self._order = {}  # Property -> catalog position
+        self._lower_names = set()
+
+    def reset(self, players, properties):
+        # Rebuild every index in one pass. Owners stored as names (as loaded from a
+        # save file) are resolved to the matching Player objects.
+        self.clear()
+        for player in players:
+            self.add_player(player)
+        for prop in properties:
+            if isinstance(prop.owner, str):
+                prop.owner = self.players[prop.owner]
+            self.add_property(prop)
+        for player in players:
+            # Properties loaded alongside the player are swapped for the board's own objects
+            player.properties = [prop if prop in self._order else self.properties[prop.name] for prop in player.properties]
+
+    def add_player(self, player):
+        self.players[player.name] = player
+        self._lower_names.add(player.name.lower())
+        self.owned.setdefault(player.name, {})
+        player.registry = self
+
+    def has_player(self, name):
+        return name.lower() in self._lower_names
+
+    def add_property(self, prop):
+        self.properties[prop.name] = prop
+        self._order.setdefault(prop, len(self._order))
+        self._owner_of[prop] = None
+        self.unowned.add(prop)
+        self.owner_changed(prop)
+
+    def owner_changed(self, prop):
+        old_owner = self._owner_of.get(prop)
+        new_owner = prop.owner.name if prop.owner else None
+        if old_owner == new_owner:
+            return
+        if old_owner is None:
+            self.unowned.discard(prop)
+        else:
+            self.owned[old_owner].pop(prop, None)
+        if new_owner is None:
+            self.unowned.add(prop)
+        else:
+            self.owned.setdefault(new_owner, {})[prop] = prop
+        self._owner_of[prop] = new_owner
+        for listener in self.listeners:
+            listener(prop, old_owner, new_owner)
+        if self.changes is not None:
+            self.changes.mark_property(prop.name)
+
+    def index_of(self, prop):
+        return self._order[prop]
+
+    def available(self):
+        return sorted(self.unowned, key=self._order.get)
+
+    def owned_properties(self, exclude=None):
+        props = []
+        for owner_name, owned in self.owned.items():
+            if exclude is None or owner_name != exclude.name:
+                props.extend(owned)
+        return sorted(props, key=self._order.get)
@@ -0,0 +1,119 @@
+TIERS = 6  # Base rent, 1-4 houses, hotel
+HOTEL = 5
+AVERAGE_ROLL = 7  # Utility rent is a multiple of the dice roll; used when no roll is given
+
+
+class RentEngine:
+    # The catalog's rent tables are compiled once into a dense property x level table.
+    # Streets index it by development level; stations and utilities by how many of
+    # their group the owner holds. Per-owner, per-group counters make the monopoly
+    # check a dict lookup.
+    def __init__(self, properties):
+        self.properties = list(properties)
+        self._index = {prop: i for i, prop in enumerate(self.properties)}
+        groups = list(dict.fromkeys(prop.color_group for prop in self.properties))
+        self._group_of = [groups.index(prop.color_group) for prop in self.properties]
+        self.groups = groups
+        self.group_sizes = [self._group_of.count(i) for i in range(len(groups))]
+        self.rows = [self._compile(prop) for prop in self.properties]
+        self._kind = [self._kind_of(prop) for prop in self.properties]
+        self._counts = {}  # (owner name, group index) -> properties owned in the group
+        self._table = None
+        for prop in self.properties:
+            if prop.owner:
+                self.owner_changed(prop, None, prop.owner.name)
+
+    @property
+    def table(self):
+        # Dense NumPy copy of the rent rows, built the first time batched queries need it
+        if self._table is None:
+            import numpy as np
+            self._table = np.array(self.rows, dtype=np.int64)
+        return self._table
+
+    def owner_changed(self, prop, old_owner, new_owner):
+        group = self._group_of[self._index[prop]]
+        if old_owner is not None:
+            self._counts[(old_owner, group)] -= 1
+        if new_owner is not None:
+            key = (new_owner, group)
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def index_of(self, prop):
+        return self._index[prop]
+
+    def kind(self, prop):
+        # "street", "railroad" or "utility"
+        return self._kind[self._index[prop]]
+
+    def owned_in_group(self, owner_name, color_group):
+        return self._counts.get((owner_name, self.groups.index(color_group)), 0)
+
+    def has_monopoly(self, prop):
+        if not prop.owner:
+            return False
+        group = self._group_of[self._index[prop]]
+        return self._counts.get((prop.owner.name, group), 0) == self.group_sizes[group]
+
+    def rent_for(self, prop, dice_roll=None):
+        i = self._index[prop]
+        if not prop.owner or prop.mortgaged:
+            return 0
+        kind = self._kind[i]
+        if kind == "street":
+            rent = self.rows[i][prop.houses]
+            if prop.houses == 0 and self.has_monopoly(prop):
+                rent *= 2
+            return rent
+        count = self._counts[(prop.owner.name, self._group_of[i])]
+        rent = self.rows[i][count - 1]
+        if kind == "utility":
+            rent *= AVERAGE_ROLL if dice_roll is None else dice_roll
+        return rent
+
+    def rent_levels(self, prop):
+        # Rent at each development level, base to hotel, with the owner's current
+        # holdings; stations and utilities charge the same at every level
+        i = self._index[prop]
+        if self._kind[i] != "street":
+            return [self.rent_for(prop)] * TIERS
+        levels = list(self.rows[i])
+        if self.has_monopoly(prop):
+            levels[0] *= 2
+        return levels
+
+    def rents_for(self, properties, levels, dice_rolls=None):
+        # Batched rent for many (property, level) pairs. Levels are ignored for
+        # stations and utilities, whose tier follows the owner's holdings.
+        import numpy as np
+        indices = np.array([self._index[prop] for prop in properties], dtype=np.int64)
+        levels = np.array(levels, dtype=np.int64)
+        owned = np.array([prop.owner is not None and not prop.mortgaged for prop in properties])
+        monopoly = np.array([self.has_monopoly(prop) for prop in properties])
+        kinds = [self._kind[i] for i in indices]
+        streets = np.array([kind == "street" for kind in kinds])
+        counts = np.array([
+            self._counts.get((prop.owner.name, self._group_of[i]), 1) if prop.owner else 1
+            for prop, i in zip(properties, indices)
+        ], dtype=np.int64)
+        tiers = np.where(streets, levels, counts - 1)
+        rents = self.table[indices, tiers]
+        rents = np.where(streets & monopoly & (levels == 0), rents * 2, rents)
+        utilities = np.array([kind == "utility" for kind in kinds])
+        if utilities.any():
+            rolls = np.full(len(properties), AVERAGE_ROLL) if dice_rolls is None else np.array(dice_rolls)
+            rents = np.where(utilities, rents * rolls, rents)
+        return np.where(owned, rents, 0)
+
+    def _compile(self, prop):
+        # Pad shorter tables (stations, utilities) by repeating their top tier
+        rent = prop.rent if isinstance(prop.rent, list) else [prop.rent]
+        rent = [int(r) for r in rent[:TIERS]]
+        return rent + [rent[-1]] * (TIERS - len(rent))
+
+    def _kind_of(self, prop):
+        if prop.color_group == "Railroad":
+            return "railroad"
+        if prop.color_group == "Utility":
+            return "utility"
+        return "street"
@@ -0,0 +1,256 @@
+import argparse
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+import uuid
+
+from core import save_format
+
+logger = logging.getLogger(__name__)
+
+# Mirrors a game to followers (a display screen, a backup laptop) over a local TCP
+# connection speaking JSON lines. The leader numbers every change record of its
+# tracker (the same records the journal holds: a log entry plus the player's state,
+# a batch, a loan) and streams them as {"seq": n, "record": {...}}. A follower
+# connects with {"from": last seq applied, "epoch": leader epoch}; the leader answers
+# {"epoch": ..., "seq": ...} and resumes after that seq, or sends
+# {"seq": n, "snapshot": save document} first when the follower is further behind
+# than the records kept, or was following another leader.
+DEFAULT_PORT = 8770
+SNAPSHOT_INTERVAL = 1000  # Records between the leader's snapshots
+
+
+def _line(message):
+    return (json.dumps(message, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+
+class ReplicationLog:
+    # Leader side. Records are numbered and encoded once as they are published, on
+    # the tracker's thread. Every snapshot_interval records the leader captures a
+    # snapshot (see MonopolyTracker.capture_state) and drops the records from before
+    # the previous one, so between one and two intervals of records are kept.
+    def __init__(self, tracker, snapshot_interval=SNAPSHOT_INTERVAL):
+        self.tracker = tracker
+        self.snapshot_interval = snapshot_interval
+        self.epoch = uuid.uuid4().hex  # Sequence numbers only mean something within one epoch
+        self.seq = 0  # Last record published
+        self.first = 1  # Sequence number of lines[0]
+        self.lines = []  # Encoded records first..seq
+        self.condition = threading.Condition()
+        self.closed = False
+        self._snapshot = (0, tracker.capture_state(tracker.game_data))
+        self._previous_snapshot_seq = 0
+        self._encoded = (None, None)  # (seq, line) of the last snapshot sent
+
+    def publish(self, record):
+        with self.condition:
+            self.seq += 1
+            self.lines.append(_line({"seq": self.seq, "record": record}))
+            self.condition.notify_all()
+        if self.seq - self._snapshot[0] >= self.snapshot_interval:
+            state = self.tracker.capture_state(self.tracker.game_data)
+            with self.condition:
+                self._previous_snapshot_seq, self._snapshot = self._snapshot[0], (self.seq, state)
+                drop = self._previous_snapshot_seq - self.first + 1
+                if drop > 0:
+                    del self.lines[:drop]
+                    self.first += drop
+
+    def resync(self):
+        # The tracker's game was replaced (a load): followers start over from a snapshot
+        state = self.tracker.capture_state(self.tracker.game_data)
+        with self.condition:
+            self.seq += 1
+            self._snapshot = (self.seq, state)
+            self._previous_snapshot_seq = self.seq
+            self.lines = []
+            self.first = self.seq + 1
+            self.condition.notify_all()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def stream(self, write, after_seq):
+        # Write everything after after_seq (-1: the follower has nothing usable), then
+        # each new record as it is published, until the log is closed. Runs on a
+        # follower's connection thread.
+        cursor = after_seq
+        while True:
+            with self.condition:
+                while cursor == self.seq and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                if cursor < self.first - 1 or cursor > self.seq:
+                    snapshot, lines = self._snapshot, None
+                else:
+                    lines = self.lines[cursor - self.first + 1:]
+                    cursor = self.seq
+            if lines is None:
+                cursor = snapshot[0]
+                write(self._snapshot_line(snapshot))
+            else:
+                write(b"".join(lines))
+
+    def _snapshot_line(self, snapshot):
+        seq, state = snapshot
+        encoded_seq, line = self._encoded
+        if encoded_seq != seq:
+            document = dict(state["document"])
+            document["transactions"] = state["log"].columns(state["log_length"])
+            line = b'{"seq":%d,"snapshot":%s}\n' % (seq, save_format.encode_json(document))
+            self._encoded = (seq, line)
+        return line
+
+
+class _FollowerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        log = self.server.log
+        try:
+            hello = json.loads(self.rfile.readline() or b"{}")
+            after_seq = hello.get("from", 0) if hello.get("epoch") == log.epoch else -1
+            self.wfile.write(_line({"epoch": log.epoch, "seq": log.seq}))
+            log.stream(self.wfile.write, after_seq)
+        except (ConnectionError, ValueError, AttributeError):
+            pass  # The follower went away or sent garbage
+
+
+class ReplicationServer(socketserver.ThreadingTCPServer):
+    # Serves a ReplicationLog, one thread per follower. A follower that reads slowly
+    # only holds up its own thread, and falls back to a snapshot once it is behind
+    # the records kept.
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, log, host="127.0.0.1", port=DEFAULT_PORT):
+        super().__init__((host, port), _FollowerHandler)
+        self.log = log
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="replication", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.log.close()
+        self.shutdown()
+        self.server_close()
+
+
+class ReplicationFollower:
+    # Keeps a tracker in step with a leader. A thread reads the stream into a queue and
+    # reconnects after the last seq received when the link drops; poll() applies what
+    # has arrived on the caller's thread (the Tk thread in the GUI).
+    def __init__(self, tracker, host="127.0.0.1", port=DEFAULT_PORT, retry=1.0):
+        self.tracker = tracker
+        self.address = (host, port)
+        self.retry = retry  # Seconds between connection attempts
+        self.seq = 0  # Last sequence number applied
+        self.connected = False
+        self._epoch = None
+        self._received = 0  # Last sequence number queued
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._socket = None
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="follower", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._socket:
+            try:
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread:
+            self._thread.join()
+
+    def poll(self):
+        # Apply every message received so far; returns how many changed the game
+        applied = 0
+        while True:
+            try:
+                message = self._queue.get_nowait()
+            except queue.Empty:
+                return applied
+            if "snapshot" in message:
+                self.tracker.load_snapshot(message["snapshot"])
+            elif message["seq"] <= self.seq:
+                continue  # Resent after a reconnect
+            else:
+                self.tracker.apply_record(message["record"])
+            self.seq = message["seq"]
+            applied += 1
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                with socket.create_connection(self.address) as sock:
+                    self._socket = sock
+                    sock.sendall(_line({"from": self._received, "epoch": self._epoch}))
+                    self._read(sock.makefile("rb"))
+            except OSError:
+                pass
+            self._socket = None
+            if self.connected and not self._stop.is_set():
+                logger.warning("Lost the replication leader at %s:%d", *self.address)
+                self.connected = False
+            self._stop.wait(self.retry)
+
+    def _read(self, stream):
+        hello = json.loads(stream.readline() or b"{}")
+        if "epoch" not in hello:
+            return
+        self._epoch = hello["epoch"]
+        self.connected = True
+        for line in stream:
+            message = json.loads(line)
+            self._received = message["seq"]
+            self._queue.put(message)
+
+
+def main():
+    # A follower without a GUI: prints each change and keeps a backup save up to date
+    parser = argparse.ArgumentParser(description="Follow a Monopoly tracker's game over local TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--save", help="save file kept up to date with the leader's game")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between backup saves")
+    args = parser.parse_args()
+    logging.basicConfig(level=os.environ.get("MONOPOLY_LOG_LEVEL", "WARNING").upper())
+    from core.game_engine import MonopolyTracker
+    tracker = MonopolyTracker(save_file=args.save)
+    follower = tracker.follow(args.host, args.port)
+    last_save = time.monotonic()
+    dirty = False
+    try:
+        while True:
+            time.sleep(0.1)
+            if follower.poll():
+                dirty = True
+                money = ", ".join(f"{player.name} ${player.money}" for player in tracker.players)
+                print(f"#{follower.seq}: {money}", flush=True)
+            if args.save and dirty and time.monotonic() - last_save >= args.interval:
+                os.makedirs(os.path.dirname(tracker.save_file) or ".", exist_ok=True)
+                tracker.write_state(tracker.capture_state(tracker.game_data))
+                last_save, dirty = time.monotonic(), False
+    except KeyboardInterrupt:
+        pass
+    finally:
+        follower.stop()
+        if args.save and dirty:
+            tracker.write_state(tracker.capture_state(tracker.game_data))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import json
+import struct
+import sys
+import zlib
+from array import array
+
+from core.player import Player
+from core.property import Property
+from core import events
+from core.transaction_log import TransactionLog, COLUMNS
+
+# Version 1 is the original layout: every player embeds full copies of the properties
+# they own, properties are repeated under "properties" and transactions are a list of
+# dicts. Version 2 stores the catalog once, ownership and development as integer
+# arrays indexed like the catalog, and the transaction log column-wise. Version 3
+# adds the typed event columns (kinds, property_ids) to the log.
+FORMAT_VERSION = 3
+READABLE_VERSIONS = (2, 3)
+V2_COLUMNS = ("timestamps", "player_ids", "amounts", "balances", "reason_ids")
+MAGIC = b"MTRK"
+HEADER = struct.Struct("<4sHH")  # Magic, format version, flags
+FLAG_ZLIB = 1
+LENGTH = struct.Struct("<Q")
+
+
+def build_document(players, properties, journal_seq=0, game_data=None, loans=None):
+    # Everything except the transaction log, which callers add from log.columns()
+    player_index = {player.name: i for i, player in enumerate(players)}
+    return {
+        "format": FORMAT_VERSION,
+        "catalog": [[prop.name, prop.price, prop.rent, prop.color_group] for prop in properties],
+        "players": [
+            {"name": p.name, "money": p.money, "position": p.position, "in_jail": p.in_jail}
+            for p in players
+        ],
+        "owners": [player_index[prop.owner.name] if prop.owner else -1 for prop in properties],
+        "houses": [prop.houses for prop in properties],
+        "mortgaged": [int(prop.mortgaged) for prop in properties],
+        "journal_seq": journal_seq,
+        "loans": loans,  # LoanBook.to_dict()
+        "game_data": game_data
+    }
+
+
+def load_document(document):
+    # Returns (players, properties, transaction log) built from a version 2 or 3 document
+    properties = [
+        Property(name, price, rent, color_group, houses=houses)
+        for (name, price, rent, color_group), houses in zip(document["catalog"], document["houses"])
+    ]
+    players = []
+    for data in document["players"]:
+        player = Player(data["name"])
+        player.money = data["money"]
+        player.position = data["position"]
+        player.in_jail = data["in_jail"]
+        players.append(player)
+    for prop, mortgaged in zip(properties, document.get("mortgaged", ())):  # Absent before mortgages
+        prop.mortgaged = bool(mortgaged)
+    for prop, owner in zip(properties, document["owners"]):
+        if owner >= 0:
+            prop.owner = players[owner]
+            players[owner].properties.append(prop)
+    log = TransactionLog.from_columns(document["transactions"])
+    if "property_ids" not in document["transactions"]:
+        events.resolve_properties(log, properties)
+    return players, properties, log
+
+
+def upgrade_document(document):
+    # Fills in the typed event columns of a document read from an older save
+    if "property_ids" in document["transactions"]:
+        return document
+    _, _, log = load_document(document)
+    document = dict(document, format=FORMAT_VERSION)
+    document["transactions"] = log.columns()
+    return document
+
+
+def migrate_v1(data):
+    # Converts the original save layout (see create_save_file.py) to a current document
+    player_index = {p["name"]: i for i, p in enumerate(data["players"])}
+    owners = [player_index.get(prop.get("owner"), -1) for prop in data["properties"]]
+    # Older saves may only record ownership in the players' embedded property lists
+    # Matched by name and price, since catalog names repeat (the two Rue de Vaugirard)
+    catalog_keys = [(prop["name"], prop["price"]) for prop in data["properties"]]
+    for i, player in enumerate(data["players"]):
+        for prop in player.get("properties", []):
+            name, price = (prop["name"], prop.get("price")) if isinstance(prop, dict) else (prop, None)
+            for index, (catalog_name, catalog_price) in enumerate(catalog_keys):
+                if catalog_name == name and price in (None, catalog_price) and owners[index] == -1:
+                    owners[index] = i
+                    break
+    return {
+        "format": FORMAT_VERSION,
+        "catalog": [[p["name"], p["price"], p["rent"], p["color_group"]] for p in data["properties"]],
+        "players": [
+            {"name": p["name"], "money": p["money"], "position": p.get("position", 0), "in_jail": p.get("in_jail", False)}
+            for p in data["players"]
+        ],
+        "owners": owners,
+        "houses": [p.get("houses", 0) for p in data["properties"]],
+        # Without property_ids, so load_document resolves them against the catalog
+        "transactions": {name: values for name, values in TransactionLog(data.get("transactions", [])).columns().items()
+                         if name != "property_ids"},
+        "journal_seq": data.get("journal_seq", 0),
+        "game_data": data.get("game_data")
+    }
+
+
+def write_document(f, document, binary=False, compress=False):
+    # f is a file opened in binary mode
+    f.write(encode_binary(document, compress) if binary else encode_json(document))
+
+
+def encode_json(document):
+    data = dict(document)
+    data["transactions"] = {
+        name: values.tolist() if isinstance(values, array) else values
+        for name, values in document["transactions"].items()
+    }
+    return json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def encode_binary(document, compress=False):
+    # Header, then a length-prefixed JSON block with everything but the log columns,
+    # then each log column as raw little-endian array bytes
+    columns = document["transactions"]
+    meta = dict(document)
+    meta["transactions"] = {"player_names": columns["player_names"], "reasons": columns["reasons"]}
+    meta_bytes = json.dumps(meta, separators=(",", ":"), default=str).encode("utf-8")
+    parts = [LENGTH.pack(len(meta_bytes)), meta_bytes]
+    for name, typecode in COLUMNS.items():
+        values = columns[name]
+        if not isinstance(values, array):
+            values = array(typecode, values)
+        if sys.byteorder != "little":
+            values = array(typecode, values)
+            values.byteswap()
+        raw = values.tobytes()
+        parts.append(LENGTH.pack(len(raw)))
+        parts.append(raw)
+    payload = b"".join(parts)
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload, 6)
+        flags |= FLAG_ZLIB
+    return HEADER.pack(MAGIC, FORMAT_VERSION, flags) + payload
+
+
+def decode_binary(raw):
+    magic, version, flags = HEADER.unpack_from(raw)
+    if magic != MAGIC or version not in READABLE_VERSIONS:
+        raise ValueError(f"Unsupported save format (version {version})")
+    payload = memoryview(raw)[HEADER.size:]
+    if flags & FLAG_ZLIB:
+        payload = memoryview(zlib.decompress(payload))
+    offset = LENGTH.size
+    (meta_length,) = LENGTH.unpack_from(payload)
+    document = json.loads(bytes(payload[offset:offset + meta_length]))
+    offset += meta_length
+    columns = document["transactions"]
+    for name in (COLUMNS if version == FORMAT_VERSION else V2_COLUMNS):
+        typecode = COLUMNS[name]
+        (length,) = LENGTH.unpack_from(payload, offset)
+        offset += LENGTH.size
+        values = array(typecode)
+        values.frombytes(payload[offset:offset + length])
+        if sys.byteorder != "little":
+            values.byteswap()
+        columns[name] = values
+        offset += length
+    return document
+
+
+def read_document(path):
+    # Reads any save layout and returns a current document (older ones lack event columns)
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw[:len(MAGIC)] == MAGIC:
+        return decode_binary(raw)
+    data = json.loads(raw)
+    if "format" not in data:
+        return migrate_v1(data)
+    if data["format"] not in READABLE_VERSIONS:
+        raise ValueError(f"Unsupported save format (version {data['format']})")
+    return data
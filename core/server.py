@@ -0,0 +1,322 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import signal
+
+from core.errors import TrackerError, RuleError, SaveNotFoundError
+from core.game_engine import MonopolyTracker
+from core.transaction_log import INT32_MAX, INT32_MIN
+from core.player import Player
+
+logger = logging.getLogger(__name__)
+
+# Hosts many games in one process over a local TCP connection speaking JSON lines.
+# A request is {"id": any, "op": str, "game": game id, "args": {...}}; its response
+# is {"id": ..., "ok": true, "result": ...} or {"id": ..., "ok": false, "error": str}.
+# After every action the game's ChangeSet is turned into a diff and pushed to the
+# game's subscribers as {"event": "diff", "game": ..., "seq": n, "diff": {...}}.
+# Each game is saved under <root>/<game id>/.
+DEFAULT_ROOT = os.path.join("data", "games")
+DEFAULT_PORT = 8765
+GAME_ID = re.compile(r"[A-Za-z0-9_-]{1,64}")  # Game ids are directory names
+LINE_LIMIT = 1 << 20  # Longest request line
+MAX_BACKLOG = 4 << 20  # Bytes queued for a subscriber that isn't reading before it is dropped
+
+
+def _player(tracker, name):
+    player = tracker.registry.players.get(name)
+    if player is None:
+        raise RuleError(f"No player named {name}")
+    return player
+
+
+def _int(value, name, low=1, high=INT32_MAX):
+    # JSON numbers arrive as int, float or bool; only ints in [low, high] are accepted
+    if type(value) is not int:
+        raise RuleError(f"{name} must be a whole number")
+    if not low <= value <= high:
+        raise RuleError(f"{name} must be between {low} and {high}")
+    return value
+
+
+def _property(tracker, ref):
+    # Catalog index, or a name that only one property has (catalog names are not unique)
+    if type(ref) is int:
+        return tracker.properties[_int(ref, "Property", 0, len(tracker.properties) - 1)]
+    matches = [prop for prop in tracker.properties if prop.name == ref]
+    if not matches:
+        raise RuleError(f"No property named {ref}")
+    if len(matches) > 1:
+        raise RuleError(f"{len(matches)} properties are named {ref}; use the catalog index")
+    return matches[0]
+
+
+def _add_player(tracker, name):
+    if not isinstance(name, str) or not name:
+        raise RuleError("Player name must be a non-empty string")
+    if tracker.has_player(name):
+        raise RuleError(f"Player {name!r} already exists")
+    player = Player(name)
+    tracker.add_player(player)
+    tracker.log_transaction(player, 0, "Player created")
+
+
+def _move(tracker, player, position):
+    player = _player(tracker, player)
+    player.position = _int(position, "Position", 0, 39)
+    tracker.mark_player_changed(player)
+
+
+def _rent(tracker, payer, property, dice_roll=None):
+    if dice_roll is not None:
+        dice_roll = _int(dice_roll, "Dice roll", 2, 12)
+    plan = tracker.charge_rent(_player(tracker, payer), _property(tracker, property), dice_roll)
+    return None if plan is None else {"covered": plan["covered"], "cash": plan["cash"]}
+
+
+def _repay(tracker, borrower, lender=None):
+    tracker.repay(_player(tracker, borrower), _player(tracker, lender) if lender else None)
+
+
+ACTIONS = {
+    "add_player": _add_player,
+    "move": _move,
+    "purchase": lambda t, player, property: t.purchase_property(_player(t, player), _property(t, property)),
+    "rent": _rent,
+    "transfer": lambda t, payer, recipient, amount: t.transfer(
+        _player(t, payer), _player(t, recipient), _int(amount, "Amount")),
+    "build": lambda t, player, property: t.build_house(_player(t, player), _property(t, property)),
+    "sell_house": lambda t, player, property: t.sell_house(_player(t, player), _property(t, property)),
+    "mortgage": lambda t, player, property: t.mortgage(_player(t, player), _property(t, property)),
+    "unmortgage": lambda t, player, property: t.unmortgage(_player(t, player), _property(t, property)),
+    "sell_property": lambda t, seller, buyer, property, price: t.sell_property(
+        _player(t, seller), _player(t, buyer), _property(t, property), _int(price, "Price")),
+    "adjust": lambda t, player, amount: t.adjust_money(_player(t, player), _int(amount, "Amount", INT32_MIN)),
+    "jail": lambda t, player, in_jail: t.set_jail(_player(t, player), bool(in_jail)),
+    "lend": lambda t, lender, borrower, amount: t.lend(_player(t, lender), _player(t, borrower), _int(amount, "Amount")),
+    "bank_loan": lambda t, borrower, amount: t.bank_loan(_player(t, borrower), _int(amount, "Amount")),
+    "repay": _repay,
+}
+
+
+def player_state(player):
+    return {"money": player.money, "position": player.position, "in_jail": player.in_jail,
+            "properties": [prop.name for prop in player.properties]}
+
+
+def property_state(prop):
+    return {"owner": prop.owner.name if prop.owner else None, "houses": prop.houses, "mortgaged": prop.mortgaged}
+
+
+def snapshot(tracker):
+    return {
+        "players": {player.name: player_state(player) for player in tracker.players},
+        "properties": [dict(property_state(prop), name=prop.name) for prop in tracker.properties],
+        "loans": tracker.loans.to_dict(),
+        "transactions": len(tracker.transaction_log)
+    }
+
+
+def state_diff(tracker, changes):
+    # Only what the ChangeSet names: changed players, properties by catalog index, the
+    # transactions logged since the last diff and changed borrowers' loans
+    if changes.roster:
+        return {"snapshot": snapshot(tracker)}
+    diff = {}
+    if changes.players:
+        diff["players"] = {name: player_state(tracker.registry.players[name])
+                           for name in changes.players if name in tracker.registry.players}
+    if changes.properties:
+        diff["properties"] = {i: property_state(prop) for i, prop in enumerate(tracker.properties)
+                              if prop.name in changes.properties}
+    if changes.log_start is not None:
+        log = tracker.transaction_log
+        diff["transactions"] = {"start": changes.log_start,
+                                "rows": [log.row(i) for i in range(changes.log_start, len(log))]}
+    if changes.loans:
+        diff["loans"] = {name: {"players": tracker.loans.loans_of(name), "bank": tracker.loans.bank.get(name, 0)}
+                         for name in changes.loans}
+    return diff
+
+
+class Game:
+    def __init__(self, game_id, root):
+        self.id = game_id
+        self.tracker = MonopolyTracker(save_file=os.path.join(root, game_id, "latest.json"))
+        self.subscribers = set()  # StreamWriters of the connections following this game
+        self.seq = 0  # Diffs published so far
+        self.dirty = False  # Changed since the last save
+
+
+class GameServer:
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self.games = {}  # Game id -> Game
+        self.connections = 0
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        return await asyncio.start_server(self._serve, host, port, limit=LINE_LIMIT)
+
+    async def _serve(self, reader, writer):
+        self.connections += 1
+        subscribed = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break  # Line over LINE_LIMIT, or the client went away
+                if not line:
+                    break
+                response = await self.handle(line, writer, subscribed)
+                writer.write(response)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass  # Cancelled when the server shuts down
+        finally:
+            self.connections -= 1
+            for game_id in subscribed:
+                game = self.games.get(game_id)
+                if game:
+                    game.subscribers.discard(writer)
+            writer.close()
+
+    async def handle(self, line, writer=None, subscribed=None):
+        # One request line in, one response line out
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            result = await self._run(request, writer, subscribed if subscribed is not None else set())
+            response = {"id": request_id, "ok": True, "result": result}
+        except (TrackerError, OSError) as e:
+            response = {"id": request_id, "ok": False, "error": str(e)}
+        except (ValueError, KeyError, TypeError, AttributeError, OverflowError) as e:
+            response = {"id": request_id, "ok": False, "error": f"Bad request: {e}"}
+        return (json.dumps(response, separators=(",", ":")) + "\n").encode("utf-8")
+
+    async def _run(self, request, writer, subscribed):
+        op = request["op"]
+        args = request.get("args") or {}
+        if op == "games":
+            return sorted(self.games)
+        game_id = request["game"]
+        if op == "open":
+            return self.open(game_id)
+        game = self.games.get(game_id)
+        if game is None:
+            raise RuleError(f"Game {game_id} is not open")
+        if op in ACTIONS:
+            result = ACTIONS[op](game.tracker, **args)
+            game.dirty = True
+            self.publish(game)
+            return result
+        if op == "state":
+            return snapshot(game.tracker)
+        if op == "transactions":
+            log = game.tracker.transaction_log
+            start = args.get("start", 0)
+            return [log.row(i) for i in range(start, min(len(log), start + args.get("limit", 1000)))]
+        if op == "subscribe":
+            game.subscribers.add(writer)
+            subscribed.add(game_id)
+            return {"seq": game.seq, "snapshot": snapshot(game.tracker)}
+        if op == "unsubscribe":
+            game.subscribers.discard(writer)
+            subscribed.discard(game_id)
+            return None
+        if op == "save":
+            await self.save(game)
+            return None
+        if op == "close":
+            await self.save(game)
+            for subscriber in game.subscribers:
+                self._send(subscriber, {"event": "closed", "game": game_id})
+            del self.games[game_id]
+            return None
+        raise RuleError(f"Unknown operation {op}")
+
+    def open(self, game_id):
+        # Returns the game's snapshot, loading its save the first time it is opened
+        if not GAME_ID.fullmatch(game_id or ""):
+            raise RuleError(f"Invalid game id {game_id!r}")
+        game = self.games.get(game_id)
+        if game is None:
+            game = Game(game_id, self.root)
+            try:
+                game.tracker.load_game()
+            except SaveNotFoundError:
+                pass
+            game.tracker.take_changes()
+            self.games[game_id] = game
+        return snapshot(game.tracker)
+
+    def publish(self, game):
+        changes = game.tracker.take_changes()
+        if not changes or not game.subscribers:
+            return
+        game.seq += 1
+        message = {"event": "diff", "game": game.id, "seq": game.seq, "diff": state_diff(game.tracker, changes)}
+        data = (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+        for subscriber in list(game.subscribers):
+            self._send(subscriber, data)
+            if subscriber.transport.get_write_buffer_size() > MAX_BACKLOG:
+                # The subscriber stopped reading; it can subscribe again for a snapshot
+                logger.warning("Dropping a subscriber of %s that fell behind", game.id)
+                game.subscribers.discard(subscriber)
+                subscriber.close()
+
+    def _send(self, writer, message):
+        if isinstance(message, dict):
+            message = (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+        if not writer.is_closing():
+            writer.write(message)
+
+    async def save(self, game):
+        # The state is captured on the event loop and written by a worker thread
+        state = game.tracker.capture_state()
+        game.dirty = False
+        os.makedirs(os.path.dirname(game.tracker.save_file), exist_ok=True)
+        await asyncio.get_running_loop().run_in_executor(None, game.tracker.write_state, state)
+
+    def save_all(self):
+        for game in self.games.values():
+            if game.dirty:
+                os.makedirs(os.path.dirname(game.tracker.save_file), exist_ok=True)
+                game.tracker.write_state(game.tracker.capture_state())
+                game.dirty = False
+
+
+async def serve(server, host, port):
+    listener = await server.start(host, port)
+    try:
+        # SIGTERM stops the server like Ctrl+C, so changed games still get saved
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:
+        pass  # Windows
+    print(f"Serving games from {server.root} on {host}:{port}", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host Monopoly games over local TCP (JSON lines)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="directory holding one folder per game")
+    args = parser.parse_args()
+    logging.basicConfig(level=os.environ.get("MONOPOLY_LOG_LEVEL", "WARNING").upper())
+    server = GameServer(args.root)
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        server.save_all()  # Games changed since their last save
+
+
+if __name__ == "__main__":
+    main()
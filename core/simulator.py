@@ -0,0 +1,184 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from core import board
+
+
+class TableState:
+    # Picklable snapshot of a tracker, so simulation shards can run in worker processes
+    def __init__(self, names, balances, positions, jailed, square_owner, square_rent, square_group, groups):
+        self.names = names
+        self.balances = balances
+        self.positions = positions
+        self.jailed = jailed
+        self.square_owner = square_owner  # Player index owning each square, -1 if none
+        self.square_rent = square_rent
+        self.square_group = square_group  # Index into groups, -1 for non-property squares
+        self.groups = groups
+
+    @classmethod
+    def from_tracker(cls, tracker):
+        names = [p.name for p in tracker.players]
+        player_index = {name: i for i, name in enumerate(names)}
+        groups = list(dict.fromkeys(prop.color_group for prop in tracker.properties))
+        square_owner = [-1] * board.BOARD_SIZE
+        square_rent = [0] * board.BOARD_SIZE
+        square_group = [-1] * board.BOARD_SIZE
+        for prop, square in zip(tracker.properties, board.property_squares(tracker.properties)):
+            # Owned squares charge what the engine would charge right now (monopolies,
+            # houses, station counts); utilities assume an average roll
+            square_rent[square] = tracker.rent_engine.rent_for(prop) if prop.owner else prop.calculate_rent()
+            square_group[square] = groups.index(prop.color_group)
+            if prop.owner:
+                square_owner[square] = player_index[prop.owner.name]
+        return cls(
+            names,
+            [p.money for p in tracker.players],
+            [p.position for p in tracker.players],
+            [p.in_jail for p in tracker.players],
+            square_owner,
+            square_rent,
+            square_group,
+            groups
+        )
+
+
+class SimulationResult:
+    def __init__(self, names, groups, games, turns, bankruptcies, balance_totals, group_rent):
+        self.names = names
+        self.groups = groups
+        self.games = games
+        self.turns = turns  # Player turns actually simulated, summed over all games
+        self.bankruptcies = bankruptcies  # Per player, number of games they went bankrupt in
+        self.balance_totals = balance_totals  # Per player, final balances summed over games
+        self.group_rent = group_rent  # Per color group, rent collected summed over games
+
+    def bankruptcy_odds(self):
+        return {name: self.bankruptcies[i] / self.games for i, name in enumerate(self.names)}
+
+    def expected_balances(self):
+        return {name: self.balance_totals[i] / self.games for i, name in enumerate(self.names)}
+
+    def expected_rent_by_group(self):
+        # Rent collected per game on each color group
+        return {group: self.group_rent[i] / self.games for i, group in enumerate(self.groups)}
+
+    def merge(self, other):
+        return SimulationResult(
+            self.names,
+            self.groups,
+            self.games + other.games,
+            self.turns + other.turns,
+            [a + b for a, b in zip(self.bankruptcies, other.bankruptcies)],
+            [a + b for a, b in zip(self.balance_totals, other.balance_totals)],
+            [a + b for a, b in zip(self.group_rent, other.group_rent)]
+        )
+
+
+def simulate(tracker, games=10000, turns=200, workers=None, seed=None):
+    # Play `games` independent continuations of the tracker's current table for up to
+    # `turns` player turns each. Games are split into one shard per worker process.
+    state = TableState.from_tracker(tracker)
+    workers = max(1, min(workers or os.cpu_count() or 1, games))
+    shard_sizes = [games // workers + (1 if i < games % workers else 0) for i in range(workers)]
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    if workers == 1:
+        results = [simulate_shard(state, games, turns, seeds[0])]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(simulate_shard, [state] * workers, shard_sizes, [turns] * workers, seeds))
+    combined = results[0]
+    for result in results[1:]:
+        combined = combined.merge(result)
+    return combined
+
+
+def simulate_shard(state, games, turns, seed=None):
+    # Every array has one row per game; each step plays one turn in all games at once
+    rng = np.random.default_rng(seed)
+    num_players = len(state.names)
+    g = np.arange(games)
+    balance = np.tile(np.array(state.balances, dtype=np.int64), (games, 1))
+    position = np.tile(np.array(state.positions, dtype=np.int64), (games, 1))
+    jail_turns = np.tile(np.array(state.jailed, dtype=np.int64), (games, 1))  # > 0 while in jail
+    alive = np.ones((games, num_players), dtype=bool)
+    owner = np.tile(np.array(state.square_owner, dtype=np.int64), (games, 1))
+    rent = np.array(state.square_rent, dtype=np.int64)
+    group = np.array(state.square_group, dtype=np.int64)
+    tax = np.zeros(board.BOARD_SIZE, dtype=np.int64)
+    for square, amount in board.TAX_SQUARES.items():
+        tax[square] = amount
+    current = np.zeros(games, dtype=np.int64)
+    doubles_run = np.zeros(games, dtype=np.int64)
+    group_rent = np.zeros(len(state.groups), dtype=np.int64)
+    played = 0
+
+    for _ in range(turns):
+        active = alive.sum(axis=1) > 1
+        if not active.any():
+            break
+        played += int(active.sum())
+        dice = rng.integers(1, 7, size=(2, games))
+        roll = dice[0] + dice[1]
+        doubles = dice[0] == dice[1]
+
+        # A jailed player leaves on doubles, or pays the fine after the last attempt
+        jail = jail_turns[g, current]
+        jailed = active & (jail > 0)
+        fined = jailed & ~doubles & (jail >= board.MAX_JAIL_TURNS)
+        leaves = jailed & (doubles | fined)
+        stays = jailed & ~leaves
+        speeding = active & ~jailed & doubles & (doubles_run == 2)
+        moves = active & (~jailed | leaves) & ~speeding
+        balance[g[fined], current[fined]] -= board.JAIL_FINE
+        jail_turns[g[stays], current[stays]] += 1
+        jail_turns[g[leaves], current[leaves]] = 0
+
+        old = position[g, current]
+        new = np.where(moves, (old + roll) % board.BOARD_SIZE, old)
+        passed_go = moves & (new < old)
+        balance[g[passed_go], current[passed_go]] += board.GO_SALARY
+        to_jail = speeding | (moves & (new == board.GO_TO_JAIL_SQUARE))
+        new = np.where(to_jail, board.JAIL_SQUARE, new)
+        jail_turns[g[to_jail], current[to_jail]] = 1
+        position[g, current] = new
+        landed = moves & ~to_jail
+
+        # Rent goes to the owner, capped at what the payer has left; taxes go to the bank
+        square_owner = owner[g, new]
+        pays = landed & (square_owner >= 0) & (square_owner != current)
+        due = np.where(pays, rent[new], 0)
+        funds = np.maximum(balance[g, current], 0)
+        paid = np.minimum(due, funds)
+        balance[g, current] -= due + np.where(landed, tax[new], 0)
+        balance[g[pays], square_owner[pays]] += paid[pays]
+        group_rent += np.bincount(group[new[pays]], weights=paid[pays], minlength=len(state.groups)).astype(np.int64)
+
+        # Bankrupt players drop out and their properties return to the bank
+        bankrupt = active & (balance[g, current] < 0)
+        alive[g[bankrupt], current[bankrupt]] = False
+        balance[g[bankrupt], current[bankrupt]] = 0
+        owner[(owner == current[:, None]) & bankrupt[:, None]] = -1
+
+        # Doubles earn another roll; otherwise play passes to the next player still in
+        again = landed & doubles & ~jailed & ~bankrupt
+        doubles_run = np.where(again, doubles_run + 1, 0)
+        advance = active & ~again
+        current = np.where(advance, (current + 1) % num_players, current)
+        for _ in range(num_players):
+            skip = advance & ~alive[g, current]
+            if not skip.any():
+                break
+            current = np.where(skip, (current + 1) % num_players, current)
+
+    return SimulationResult(
+        state.names,
+        state.groups,
+        games,
+        played,
+        (~alive).sum(axis=0).tolist(),
+        balance.sum(axis=0).tolist(),
+        group_rent.tolist()
+    )
@@ -0,0 +1,123 @@
+import json
+import logging
+import os
+import re
+import time
+
+from core import save_format
+
+logger = logging.getLogger(__name__)
+
+# Named save slots: <folder>/<slot>.json, each with a small <slot>.meta.json sidecar
+# holding what the Load picker shows (players and balances, transaction count, when
+# it was saved, size on disk) plus the save file's mtime and size when it was
+# written, so a sidecar left behind by an older save is recognised as stale.
+SAVE_DIR = os.path.join("data", "saved_games")
+DEFAULT_SLOT = "latest"
+METADATA_SUFFIX = ".meta.json"
+SLOT_NAME = re.compile(r"[A-Za-z0-9 _-]{1,64}")  # Slot names are file names
+
+
+def slot_path(name, folder=SAVE_DIR):
+    if not SLOT_NAME.fullmatch(name or "") or name.strip() != name:
+        raise ValueError(f"Invalid save slot name {name!r}")
+    return os.path.join(folder, name + ".json")
+
+
+def slot_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def metadata_path(save_file):
+    return os.path.splitext(save_file)[0] + METADATA_SUFFIX
+
+
+def build_metadata(players, transactions, saved_at=None):
+    # players: (name, money) pairs
+    return {"players": [[name, money] for name, money in players], "transactions": transactions,
+            "saved_at": saved_at or time.time()}
+
+
+def write_metadata(save_file, metadata):
+    # Stamps the metadata with the save file as it is now and writes the sidecar
+    stat = os.stat(save_file)
+    journal = os.path.splitext(save_file)[0] + ".journal"
+    metadata = dict(metadata, save_mtime_ns=stat.st_mtime_ns, save_size=stat.st_size,
+                    size=stat.st_size + (os.path.getsize(journal) if os.path.exists(journal) else 0))
+    path = metadata_path(save_file)
+    tmp_file = path + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, separators=(",", ":"))
+    os.replace(tmp_file, path)
+
+
+def read_metadata(save_file, stat=None):
+    # The sidecar's metadata, or None when it is missing or older than the save
+    stat = stat or os.stat(save_file)
+    try:
+        with open(metadata_path(save_file), encoding="utf-8") as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if metadata.get("save_mtime_ns") != stat.st_mtime_ns or metadata.get("save_size") != stat.st_size:
+        return None
+    return metadata
+
+
+def rebuild_metadata(save_file):
+    # Reads the whole save (a save from before sidecars, or one written elsewhere)
+    # and writes its sidecar
+    document = save_format.read_document(save_file)
+    metadata = build_metadata([(player["name"], player["money"]) for player in document["players"]],
+                              len(document["transactions"]["timestamps"]), os.path.getmtime(save_file))
+    try:
+        write_metadata(save_file, metadata)
+    except OSError as e:
+        logger.warning("Couldn't write metadata for %s: %s", save_file, e)
+    return read_metadata(save_file) or metadata
+
+
+class SlotCatalog:
+    # The save slots in a folder, for the Load picker. refresh() stats each save and
+    # sidecar; metadata is only read again for slots that are new or changed since the
+    # last refresh, from the sidecar, or from the save itself when that is stale.
+    def __init__(self, folder=SAVE_DIR):
+        self.folder = folder
+        self.entries = {}  # Slot name -> ((save mtime, save size, sidecar mtime), slot dict)
+
+    def refresh(self):
+        # The slots, most recently saved first, as dicts: name, path, players
+        # [(name, money)], transactions, saved_at (epoch seconds) and size (bytes)
+        try:
+            files = list(os.scandir(self.folder))
+        except FileNotFoundError:
+            files = []
+        entries = {}
+        for file in files:
+            name, ext = os.path.splitext(file.name)
+            if ext != ".json" or file.name.endswith(METADATA_SUFFIX) or not SLOT_NAME.fullmatch(name):
+                continue
+            try:
+                stat = file.stat()
+                sidecar = metadata_path(file.path)
+                key = (stat.st_mtime_ns, stat.st_size, os.path.getmtime(sidecar) if os.path.exists(sidecar) else None)
+                cached = self.entries.get(name)
+                if cached and cached[0] == key:
+                    entries[name] = cached
+                    continue
+                metadata = read_metadata(file.path, stat)
+                if metadata is None:
+                    metadata = rebuild_metadata(file.path)
+                    key = key[:2] + (os.path.getmtime(sidecar) if os.path.exists(sidecar) else None,)
+            except Exception as e:
+                logger.warning("Skipping unreadable save %s: %s", file.path, e)
+                continue
+            entries[name] = (key, {"name": name, "path": file.path,
+                                   "players": [tuple(player) for player in metadata["players"]],
+                                   "transactions": metadata["transactions"], "saved_at": metadata["saved_at"],
+                                   "size": metadata.get("size", stat.st_size)})
+        self.entries = entries
+        return self.slots()
+
+    def slots(self):
+        return sorted((slot for _, slot in self.entries.values()), key=lambda slot: -slot["saved_at"])
@@ -0,0 +1,132 @@
+from core.board import HOUSE_COSTS
+from core.reasons import KINDS, KIND_CODES
+from core.transaction_log import NO_PROPERTY
+
+BUCKET_SECONDS = 300  # Width of a histogram bucket
+RENT_PAID = KIND_CODES["rent_paid"]
+RENT_RECEIVED = KIND_CODES["rent_received"]
+
+
+class GameStats:
+    # Running totals over the transaction log, updated in O(1) per entry by
+    # MonopolyTracker.log_transaction: per player (count and sum per event kind, money
+    # in and out, net flow per time bucket), per property and per color group (rent
+    # collected and landings), and the number of transactions per time bucket.
+    def __init__(self, properties, bucket_seconds=BUCKET_SECONDS):
+        self.bucket_seconds = bucket_seconds
+        self.group_of = [prop.color_group for prop in properties]
+        self.players = {}  # Player name -> totals, see _add_player
+        self.property_rent = [0] * len(properties)  # Rent collected per catalog property
+        self.property_landings = [0] * len(properties)  # Rent payments per catalog property
+        self.group_rent = {}  # Color group -> rent collected
+        self.histogram = {}  # Time bucket -> number of transactions
+
+    @classmethod
+    def from_log(cls, log, properties, bucket_seconds=BUCKET_SECONDS):
+        # Build the totals for an existing log in one vectorized pass over its columns
+        stats = cls(properties, bucket_seconds)
+        if not len(log):
+            return stats
+        import numpy as np
+        kinds = np.frombuffer(log.kinds, dtype=np.int8).astype(np.int64)
+        player_ids = np.frombuffer(log.player_ids, dtype=np.int32).astype(np.int64)
+        amounts = np.frombuffer(log.amounts, dtype=np.int32).astype(np.int64)
+        property_ids = np.frombuffer(log.property_ids, dtype=np.int16).astype(np.int64)
+        buckets = np.frombuffer(log.timestamps, dtype=np.int64) // bucket_seconds
+
+        player_count, kind_count = len(log.player_names), len(KINDS)
+        keys = player_ids * kind_count + kinds
+        size = player_count * kind_count
+        counts = np.bincount(keys, minlength=size).reshape(player_count, kind_count)
+        totals = _int_bincount(np, keys, amounts, size).reshape(player_count, kind_count)
+        money_in = _int_bincount(np, player_ids, np.maximum(amounts, 0), player_count)
+        money_out = _int_bincount(np, player_ids, np.maximum(-amounts, 0), player_count)
+        for i, name in enumerate(log.player_names):
+            player = stats._add_player(name)
+            player["counts"] = counts[i].tolist()
+            player["totals"] = totals[i].tolist()
+            player["money_in"] = int(money_in[i])
+            player["money_out"] = int(money_out[i])
+
+        # Net flow per (player, bucket), grouped on a combined key. Games are dense in
+        # time, so a bincount over every bucket usually fits; sparse logs are sorted instead.
+        first = int(buckets.min())
+        span = int(buckets.max()) - first + 1
+        keys = player_ids * span + (buckets - first)
+        if player_count * span <= 4 * len(log) + 1024:
+            hits = np.bincount(keys, minlength=player_count * span)
+            flow_keys = np.flatnonzero(hits)
+            flows = _int_bincount(np, keys, amounts, player_count * span)[flow_keys]
+            bucket_hits = hits.reshape(player_count, span).sum(axis=0)
+            bucket_keys = np.flatnonzero(bucket_hits)
+            bucket_counts = bucket_hits[bucket_keys]
+            bucket_keys = bucket_keys + first
+        else:
+            flow_keys, inverse = np.unique(keys, return_inverse=True)
+            flows = _int_bincount(np, inverse, amounts, len(flow_keys))
+            bucket_keys, bucket_counts = np.unique(buckets, return_counts=True)
+        for key, flow in zip(flow_keys.tolist(), flows.tolist()):
+            stats.players[log.player_names[key // span]]["histogram"][first + key % span] = flow
+        stats.histogram = dict(zip(bucket_keys.tolist(), bucket_counts.tolist()))
+
+        rent = (kinds == RENT_RECEIVED) & (property_ids != NO_PROPERTY)
+        stats.property_rent = _int_bincount(np, property_ids[rent], amounts[rent], len(properties)).tolist()
+        stats.property_landings = np.bincount(property_ids[rent], minlength=len(properties)).tolist()
+        for group, collected in zip(stats.group_of, stats.property_rent):
+            if collected:
+                stats.group_rent[group] = stats.group_rent.get(group, 0) + collected
+        return stats
+
+    def record(self, kind, player_name, amount, property_id, timestamp):
+        player = self.players.get(player_name) or self._add_player(player_name)
+        player["counts"][kind] += 1
+        player["totals"][kind] += amount
+        if amount > 0:
+            player["money_in"] += amount
+        else:
+            player["money_out"] -= amount
+        bucket = timestamp // self.bucket_seconds
+        player["histogram"][bucket] = player["histogram"].get(bucket, 0) + amount
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+        if kind == RENT_RECEIVED and property_id != NO_PROPERTY:
+            self.property_rent[property_id] += amount
+            self.property_landings[property_id] += 1
+            group = self.group_of[property_id]
+            self.group_rent[group] = self.group_rent.get(group, 0) + amount
+
+    def player_summary(self, name):
+        player = self.players.get(name) or self._empty_player()
+        return {
+            "transactions": sum(player["counts"]),
+            "rent_paid": -player["totals"][RENT_PAID],
+            "rent_paid_count": player["counts"][RENT_PAID],
+            "rent_received": player["totals"][RENT_RECEIVED],
+            "rent_received_count": player["counts"][RENT_RECEIVED],
+            "money_in": player["money_in"],
+            "money_out": player["money_out"]
+        }
+
+    def recent_flow(self, name, buckets=6, now=None):
+        # Net money flow of the player in the last `buckets` buckets, oldest first
+        histogram = self.players[name]["histogram"] if name in self.players else {}
+        last = (now if now is not None else max(self.histogram, default=0) * self.bucket_seconds) // self.bucket_seconds
+        return [histogram.get(bucket, 0) for bucket in range(last - buckets + 1, last + 1)]
+
+    def _add_player(self, name):
+        player = self._empty_player()
+        self.players[name] = player
+        return player
+
+    def _empty_player(self):
+        return {"counts": [0] * len(KINDS), "totals": [0] * len(KINDS), "money_in": 0, "money_out": 0, "histogram": {}}
+
+
+def net_worth(player):
+    # Cash plus what the player paid for their properties and buildings
+    return player.money + sum(prop.price + prop.houses * HOUSE_COSTS.get(prop.color_group, 0)
+                              for prop in player.properties)
+
+
+def _int_bincount(np, keys, weights, size):
+    # bincount sums weights as float64; amounts are integers, so round back
+    return np.rint(np.bincount(keys, weights=weights, minlength=size)).astype(np.int64)
@@ -0,0 +1,200 @@
+import itertools
+
+from core import analytics
+from core.board import HOUSE_COSTS
+from core.rent import AVERAGE_ROLL
+
+HORIZON_TURNS = 30  # Opponent turns over which a holding's expected rent is counted
+DEVELOP_LEVEL = 3  # Houses a completed street group is assumed to be built up to
+MAX_GIVE = 3  # Most properties one side gives in a suggested trade
+CASH_STEP = 10  # Cash in suggestions is rounded to this
+PER_PAIR = 3  # Suggestions kept per pair of players
+
+
+class TradeEngine:
+    # Scores and searches trades of properties plus cash between two players. A
+    # player's position is the expected rent their holdings collect from every
+    # opponent over HORIZON_TURNS (a completed street group counted as built up to
+    # DEVELOP_LEVEL houses), minus the rent they expect to pay everyone else. Between
+    # two players this is zero-sum, so trades only help both in larger games. Building
+    # costs are left out: they would make giving up a monopoly look like a saving
+    # shared by both sides. A trade's surplus is what both players gain together; the cash
+    # leg splits it evenly. Values are memoized per (group, holding) and search
+    # results are kept until ownership, buildings or mortgages change.
+    def __init__(self, rent_engine, properties):
+        self.rent_engine = rent_engine
+        self.properties = list(properties)
+        self.groups = {}  # Color group -> catalog indexes
+        for i, prop in enumerate(self.properties):
+            self.groups.setdefault(prop.color_group, []).append(i)
+        self._per_turn = None
+        self._values = {}  # (color group, levels) -> rent value
+        self._suggestions = {}  # (players, table) -> ranked trades
+
+    def owner_changed(self, prop, old_owner, new_owner):
+        self._suggestions.clear()
+
+    def evaluate(self, a, b, give, take, cash, player_count):
+        # Gains of a and b if a gives `give` and `cash` (negative: receives it) to b
+        # and takes `take` from b, as (gain of a, gain of b)
+        owners = self._owners()
+        after = dict(owners)
+        for prop in give:
+            after[self.rent_engine.index_of(prop)] = b.name
+        for prop in take:
+            after[self.rent_engine.index_of(prop)] = a.name
+        groups = {prop.color_group for prop in itertools.chain(give, take)}
+        gain_a, gain_b = self._gains(a.name, b.name, groups, owners, after, player_count)
+        return gain_a - cash, gain_b + cash
+
+    def suggestions(self, players, limit=10):
+        # Best trades between any two players, most surplus first, as dicts: a and b
+        # (Players), give (a's properties), take (b's), cash (paid by a to b, negative
+        # for b to a), gains (a's, b's) and surplus. Trades the payer can't afford now
+        # are left out.
+        key = (tuple(player.name for player in players),
+               tuple((prop.houses, prop.mortgaged) for prop in self.properties))
+        trades = self._suggestions.get(key)
+        if trades is None:
+            trades = []
+            for a, b in itertools.combinations(players, 2):
+                trades.extend(self._search(a, b, len(players)))
+            trades.sort(key=lambda trade: -trade["surplus"])
+            self._suggestions[key] = trades
+        result, per_pair = [], {}
+        for trade in trades:
+            payer = trade["a"] if trade["cash"] > 0 else trade["b"]
+            pair = (trade["a"].name, trade["b"].name)
+            if payer.money < abs(trade["cash"]) or per_pair.get(pair, 0) >= PER_PAIR:
+                continue
+            per_pair[pair] = per_pair.get(pair, 0) + 1
+            result.append(trade)
+            if len(result) >= limit:
+                break
+        return result
+
+    def _search(self, a, b, player_count):
+        # Candidate moves are "chunks": one tradable property, or everything the giver
+        # holds in a group. Chunks in different groups don't interact, so each is scored
+        # once and a trade's gains are the sums over its chunks. Only chunks with a
+        # positive surplus can be the point of a trade; up to two of them per side are
+        # combined, and the paying side may add one more chunk (a sweetener) in place
+        # of part of the cash.
+        owners = self._owners()
+        chunks = []
+        for giver, receiver in ((a, b), (b, a)):
+            for group, props in self._tradable(giver).items():
+                candidates = {(prop,) for prop in props}
+                if 1 < len(props) <= MAX_GIVE:
+                    candidates.add(tuple(props))
+                for chunk in candidates:
+                    after = dict(owners)
+                    for prop in chunk:
+                        after[self.rent_engine.index_of(prop)] = receiver.name
+                    gain_a, gain_b = self._gains(a.name, b.name, (group,), owners, after, player_count)
+                    chunks.append((giver is a, group, chunk, gain_a, gain_b))
+        useful = [chunk for chunk in chunks if chunk[3] + chunk[4] > 0]
+        trades = []
+        for size in (1, 2, 3, 4):
+            for combo in itertools.combinations(useful, size):
+                if not self._combinable(combo):
+                    continue
+                trade = self._trade(a, b, combo)
+                if trade is None:
+                    continue
+                trades.append(trade)
+                # The side paying cash may rather give a property
+                payer_is_a = trade["cash"] > 0
+                best = None
+                for chunk in chunks:
+                    if chunk[0] != payer_is_a or chunk in combo or not self._combinable(combo + (chunk,)):
+                        continue
+                    sweetened = self._trade(a, b, combo + (chunk,))
+                    if sweetened is not None and abs(sweetened["cash"]) < abs(trade["cash"]) and \
+                            (best is None or sweetened["surplus"] > best["surplus"]):
+                        best = sweetened
+                if best is not None:
+                    trades.append(best)
+        return trades
+
+    def _combinable(self, combo):
+        # Chunks from different groups, at most two and MAX_GIVE properties per side
+        if len({group for _, group, _, _, _ in combo}) < len(combo):
+            return False
+        for side in (True, False):
+            moved = [chunk for from_a, _, chunk, _, _ in combo if from_a == side]
+            if len(moved) > 2 or sum(map(len, moved)) > MAX_GIVE:
+                return False
+        return True
+
+    def _trade(self, a, b, combo):
+        gain_a = sum(chunk[3] for chunk in combo)
+        gain_b = sum(chunk[4] for chunk in combo)
+        cash = round((gain_a - gain_b) / 2 / CASH_STEP) * CASH_STEP
+        if gain_a - cash <= 0 or gain_b + cash <= 0:
+            return None
+        return {"a": a, "b": b, "cash": cash, "gains": (gain_a - cash, gain_b + cash), "surplus": gain_a + gain_b,
+                "give": [prop for from_a, _, chunk, _, _ in combo if from_a for prop in chunk],
+                "take": [prop for from_a, _, chunk, _, _ in combo if not from_a for prop in chunk]}
+
+    def _tradable(self, player):
+        # The player's properties by group, leaving out mortgaged ones and groups with
+        # buildings (those have to be lifted or sold before a trade)
+        groups = {}
+        for prop in player.properties:
+            groups.setdefault(prop.color_group, []).append(prop)
+        return {group: props for group, props in groups.items()
+                if not any(prop.houses or prop.mortgaged for prop in props)}
+
+    def _owners(self):
+        return {i: prop.owner.name if prop.owner else None for i, prop in enumerate(self.properties)}
+
+    def _gains(self, a_name, b_name, groups, before, after, player_count):
+        # (gain of a, gain of b) from the ownership change before -> after within groups
+        opponents = player_count - 1
+        rent_a = sum(self._value(group, a_name, after) - self._value(group, a_name, before) for group in groups)
+        rent_b = sum(self._value(group, b_name, after) - self._value(group, b_name, before) for group in groups)
+        return opponents * rent_a - rent_b, opponents * rent_b - rent_a
+
+    def _value(self, group, name, owners):
+        members = self.groups[group]
+        levels = tuple(None if owners[i] != name else -1 if self.properties[i].mortgaged else self.properties[i].houses
+                       for i in members)
+        key = (group, levels)
+        value = self._values.get(key)
+        if value is None:
+            value = self._values[key] = self._group_value(group, members, levels)
+        return value
+
+    def _group_value(self, group, members, levels):
+        # Expected rent over the horizon per opponent of holding the members with the
+        # given levels (None: not held, -1: mortgaged)
+        if self._per_turn is None:
+            self._per_turn = analytics.landing_per_turn(self.properties)
+        held = [level for level in levels if level is not None]
+        if not held:
+            return 0.0
+        kind = self.rent_engine.kind(self.properties[members[0]])
+        rows = self.rent_engine.rows
+        rent = 0.0
+        complete = len(held) == len(members)
+        for i, level in zip(members, levels):
+            if level is None or level < 0:
+                continue
+            if kind != "street":
+                charged = rows[i][len(held) - 1] * (AVERAGE_ROLL if kind == "utility" else 1)
+            else:
+                if complete and level < DEVELOP_LEVEL and group in HOUSE_COSTS and -1 not in held:
+                    level = DEVELOP_LEVEL
+                charged = rows[i][level] * (2 if complete and level == 0 else 1)
+            rent += self._per_turn[i] * charged
+        return rent * HORIZON_TURNS
+
+
+def describe(trade):
+    a, b, cash = trade["a"], trade["b"], trade["cash"]
+    sides = []
+    for player, props, paid in ((a, trade["give"], max(cash, 0)), (b, trade["take"], max(-cash, 0))):
+        parts = [prop.name for prop in props] + ([f"${paid}"] if paid else [])
+        sides.append(f"{player.name} gives {', '.join(parts) or 'nothing'}")
+    return f"{sides[0]}; {sides[1]} (gains {trade['gains'][0]:+.0f} / {trade['gains'][1]:+.0f})"
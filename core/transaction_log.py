@@ -0,0 +1,192 @@
+import operator
+import time
+from array import array
+from datetime import datetime
+
+from core import reasons
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+NO_BALANCE = -2 ** 31  # Stored for entries without a balance (e.g. Bank entries)
+COLUMNS = {"timestamps": "q", "player_ids": "i", "amounts": "i", "balances": "i", "reason_ids": "i",
+           "kinds": "b", "property_ids": "h"}
+NO_PROPERTY = -1
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+def check_int32(value):
+    # The value as an int that fits the int32 columns; raises TypeError (e.g. for a
+    # float) or OverflowError as array.append would, but before anything is appended
+    value = operator.index(value)
+    if not INT32_MIN <= value <= INT32_MAX:
+        raise OverflowError(f"{value} does not fit in a transaction log column")
+    return value
+
+
+class TransactionLog:
+    # Entries are stored column-wise: epoch seconds, int32 amounts and balances,
+    # ids into interned player name and reason tables, and the typed event: a kind
+    # code (reasons.KINDS) and the catalog index of the property involved. Indexing
+    # returns a plain dict row so existing code can keep treating the log as a list
+    # of dicts; event() returns the typed view.
+    def __init__(self, entries=None):
+        self.timestamps = array("q")
+        self.player_ids = array("i")
+        self.amounts = array("i")
+        self.balances = array("i")
+        self.reason_ids = array("i")
+        self.kinds = array("b")
+        self.property_ids = array("h")
+        self.player_names = []
+        self.reasons = []
+        self._player_index = {}
+        self._reason_index = {}
+        self._parsed_times = {}  # Saved logs repeat the same timestamp strings a lot
+        if entries:
+            self.extend(entries)
+
+    @classmethod
+    def from_columns(cls, columns):
+        # Inverse of columns(); array values may be arrays, lists or raw bytes
+        log = cls()
+        for name in COLUMNS:
+            values = columns.get(name)
+            if values is None:
+                continue  # Typed event columns are missing from older saves, see below
+            column = getattr(log, name)
+            if isinstance(values, (bytes, bytearray, memoryview)):
+                column.frombytes(values)
+            elif isinstance(values, array):
+                column.extend(values)
+            else:
+                column.fromlist(values)
+        log.player_names = list(columns["player_names"])
+        log.reasons = list(columns["reasons"])
+        log._player_index = {name: i for i, name in enumerate(log.player_names)}
+        log._reason_index = {reason: i for i, reason in enumerate(log.reasons)}
+        if "kinds" not in columns:
+            codes = [reasons.kind_code(reason) for reason in log.reasons]
+            log.kinds = array("b", (codes[i] for i in log.reason_ids))
+        if "property_ids" not in columns:
+            # Left for events.resolve_properties, which needs the property catalog
+            log.property_ids = array("h", [NO_PROPERTY]) * len(log)
+        return log
+
+    def columns(self, length=None):
+        # Copies of the first `length` entries' columns plus the lookup tables
+        length = len(self) if length is None else length
+        columns = {name: getattr(self, name)[:length] for name in COLUMNS}
+        columns["player_names"] = self.player_names[:]
+        columns["reasons"] = self.reasons[:]
+        return columns
+
+    def record(self, player_name, amount, reason, new_balance=None, timestamp=None,
+               kind=None, property_id=NO_PROPERTY):
+        # Without a kind, it is read from the reason text. Every value is converted and
+        # checked before the first append, so a bad one leaves all columns as they were.
+        timestamp = int(time.time()) if timestamp is None else operator.index(timestamp)
+        amount = check_int32(amount)
+        balance = NO_BALANCE if new_balance is None else check_int32(new_balance)
+        kind_code = reasons.kind_code(reason) if kind is None else reasons.KIND_CODES[kind]
+        property_id = operator.index(property_id)
+        if not -2 ** 15 <= property_id < 2 ** 15:
+            raise OverflowError(f"Property id {property_id} is out of range")
+        self.timestamps.append(timestamp)
+        self.player_ids.append(self._intern(player_name, self.player_names, self._player_index))
+        self.amounts.append(amount)
+        self.balances.append(balance)
+        self.reason_ids.append(self._intern(reason, self.reasons, self._reason_index))
+        self.kinds.append(kind_code)
+        self.property_ids.append(property_id)
+
+    def record_many(self, rows, timestamp=None):
+        # Appends (player_name, amount, reason, new_balance, kind, property_id) rows with
+        # one timestamp. The new column values are built first and appended array by
+        # array, so a bad value leaves the log as it was.
+        timestamp = int(time.time()) if timestamp is None else timestamp
+        codes = reasons.KIND_CODES
+        columns = (
+            array("q", [timestamp]) * len(rows),
+            array("i", [self._intern(row[0], self.player_names, self._player_index) for row in rows]),
+            array("i", [row[1] for row in rows]),
+            array("i", [NO_BALANCE if row[3] is None else row[3] for row in rows]),
+            array("i", [self._intern(row[2], self.reasons, self._reason_index) for row in rows]),
+            array("b", [reasons.kind_code(row[2]) if row[4] is None else codes[row[4]] for row in rows]),
+            array("h", [row[5] for row in rows])
+        )
+        for name, values in zip(COLUMNS, columns):
+            getattr(self, name).extend(values)
+
+    def append(self, entry):
+        self.record(entry["player"], entry["amount"], entry["reason"],
+                    entry.get("new_balance"), self._parse_time(entry["timestamp"]),
+                    entry.get("kind"), entry.get("property_id", NO_PROPERTY))
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def row(self, index):
+        entry = {
+            "timestamp": self.format_time(self.timestamps[index]),
+            "player": self.player_names[self.player_ids[index]],
+            "amount": self.amounts[index]
+        }
+        balance = self.balances[index]
+        if balance != NO_BALANCE:
+            entry["new_balance"] = balance
+        entry["reason"] = self.reasons[self.reason_ids[index]]
+        return entry
+
+    def event(self, index):
+        reason = self.reasons[self.reason_ids[index]]
+        balance = self.balances[index]
+        return {
+            "index": index,
+            "timestamp": self.timestamps[index],
+            "kind": reasons.KINDS[self.kinds[index]],
+            "player": self.player_names[self.player_ids[index]],
+            "amount": self.amounts[index],
+            "balance": None if balance == NO_BALANCE else balance,
+            "property_id": self.property_ids[index],
+            "counterparty": reasons.classify(reason)[2],
+            "reason": reason
+        }
+
+    def to_list(self):
+        return list(self)
+
+    def format_time(self, timestamp):
+        return datetime.fromtimestamp(timestamp).strftime(TIME_FORMAT)
+
+    def _parse_time(self, text):
+        if isinstance(text, int):
+            return text
+        timestamp = self._parsed_times.get(text)
+        if timestamp is None:
+            timestamp = int(datetime.strptime(text, TIME_FORMAT).timestamp())
+            self._parsed_times[text] = timestamp
+        return timestamp
+
+    def _intern(self, value, table, index):
+        value_id = index.get(value)
+        if value_id is None:
+            value_id = len(table)
+            table.append(value)
+            index[value] = value_id
+        return value_id
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("transaction index out of range")
+        return self.row(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.row(i)
@@ -0,0 +1,100 @@
+import tkinter as tk
+from collections import deque
+from tkinter import ttk
+
+COLUMNS = ("Time", "Player", "Amount", "Reason")
+
+
+class TransactionHistoryView:
+    # Shows the transaction log newest-first through a fixed pool of Treeview rows.
+    # Scrolling re-fills the pool from the log instead of inserting rows, so the
+    # cost of a redraw depends on the pool size, not on the length of the log.
+    def __init__(self, parent, get_log, pool_size=10):
+        self.get_log = get_log  # The tracker replaces its log on load, so always ask for it
+        self.pool_size = pool_size
+        self.offset = 0  # Number of newest entries scrolled past
+        self._log = None
+        self._rendered_len = 0
+
+        self.tree = ttk.Treeview(parent, columns=COLUMNS, show="headings", height=pool_size)
+        for col in COLUMNS:
+            self.tree.heading(col, text=col)
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.on_scroll)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.pool = deque(self.tree.insert("", "end", values=("",) * len(COLUMNS)) for _ in range(pool_size))
+
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll_by(-1 if e.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-1))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(1))
+
+    def refresh(self):
+        log = self.get_log()
+        if log is not self._log:
+            self._log = log
+            self._rendered_len = 0
+            self.offset = 0
+            self._render()
+            return
+        added = len(log) - self._rendered_len
+        if added <= 0:
+            return
+        if self.offset:
+            # Keep the rows the user scrolled to in place
+            self.offset += added
+            self._rendered_len = len(log)
+            self._update_scrollbar()
+        elif added < self.pool_size:
+            # Only the new rows are written: recycle the oldest pooled rows at the top
+            for index in range(self._rendered_len, len(log)):
+                iid = self.pool.pop()
+                self.tree.move(iid, "", 0)
+                self.tree.item(iid, values=self._values(log[index]))
+                self.pool.appendleft(iid)
+            self._rendered_len = len(log)
+            self._update_scrollbar()
+        else:
+            self._render()
+
+    def on_scroll(self, action, amount, unit=None):
+        total = len(self.get_log())
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * total))
+        elif unit == "pages":
+            self.scroll_by(int(amount) * self.pool_size)
+        else:
+            self.scroll_by(int(amount))
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+
+    def scroll_to(self, offset):
+        offset = max(0, min(offset, len(self.get_log()) - self.pool_size))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _render(self):
+        log = self.get_log()
+        newest = len(log) - 1 - self.offset
+        for row, iid in enumerate(self.pool):
+            index = newest - row
+            self.tree.item(iid, values=self._values(log[index]) if index >= 0 else ("",) * len(COLUMNS))
+        self._rendered_len = len(log)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        total = len(self.get_log())
+        if total <= self.pool_size:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + self.pool_size) / total)
+
+    def _values(self, entry):
+        return (
+            entry["timestamp"],
+            entry["player"],
+            f"${entry['amount']:+}",
+            entry["reason"]
+        )
@@ -2,21 +2,53 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
 from core.player import Player  # Ensure correct import
 from core.game_engine import MonopolyTracker
-import csv
+from core.autosave import AutoSaver
+from core.loans import LoanBook, BANK_LOAN_LIMIT
+from core.analytics import property_rankings
+from core.errors import SaveError, LoadError, SaveNotFoundError, RuleError
+from core.board import HOUSE_COSTS
+from core.reasons import REASON_TYPES
+from core.stats import net_worth
+from core.export import ExportJob
+from core.trades import describe
+from core.slots import SlotCatalog, slot_path, slot_name
+from core import instrumentation
+from core.instrumentation import timed
+from gui.history_view import TransactionHistoryView
+from datetime import datetime
+import logging
+import os
+import sqlite3
 from tkinter.ttk import Combobox
 import json
 
+logger = logging.getLogger(__name__)
+
 class MonopolyGUI:
-    def __init__(self, root):
+    FILTER_LIMIT = 10000  # Newest matching transactions shown by the history filter
+
+    def __init__(self, root, autosave_interval=30.0, save_file=None, follow=None):
         self.root = root
         self.root.title("Monopoly Tracker")
-        self.tracker = MonopolyTracker()
+        self.tracker = MonopolyTracker(journaled=True, save_file=save_file)
+        self._refresh_pending = False
+        # Autosave only starts once this session has saved or loaded, so a fresh game
+        # never overwrites an existing save behind the user's back
+        self.autosaver = AutoSaver(self.tracker.write_state, interval=autosave_interval)
+        self._autosave_enabled = False
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.create_widgets()
         self.update_player_list()
         self._bind_shortcuts()
-        self.loan_log = {}  # Initialize loan log
-        self.bank_loans = {}  # Initialize bank loans
-        self.load_game_data()  # Load game data including loans
+        self._repay_prompt = None  # Open batched repayment prompt, if any
+        self.slot_catalog = SlotCatalog(os.path.dirname(self.tracker.save_file))
+        self._show_slot()
+        self.replication_server = None  # Set by Share Game
+        self.follower = None
+        if follow:
+            # A mirror of another table's tracker, given as (host, port)
+            self.follower = self.tracker.follow(*follow)
+            self._poll_follower()
 
     def _bind_shortcuts(self):
         self.root.bind("<Control-n>", self._debug_shortcut(self.add_player, "Ctrl+N"))
@@ -28,7 +60,8 @@ class MonopolyGUI:
 
     def _debug_shortcut(self, func, name):
         def wrapper(event):
-            print(f"Shortcut {name} triggered")
+            logger.debug("Shortcut %s triggered", name)
+            instrumentation.count(f"shortcut {name}")
             func(event)
         return wrapper
 
@@ -60,6 +93,21 @@ class MonopolyGUI:
         menubar.add_cascade(label="Advanced", menu=advanced_menu)
         advanced_menu.add_command(label="Update Money", command=self.update_money)
         advanced_menu.add_command(label="Player to Player Transaction", command=self.player_to_player_transaction)
+        advanced_menu.add_command(label="Group Payment", command=self.group_payment)
+        advanced_menu.add_command(label="Houses and Hotels", command=self.manage_houses)
+        advanced_menu.add_command(label="Trade Suggestions", command=self.trade_suggestions)
+        advanced_menu.add_command(label="Property Rankings", command=self.view_property_rankings)
+        advanced_menu.add_command(label="Timeline", command=self.view_timeline)
+        advanced_menu.add_command(label="Rebuild from CSV", command=self.rebuild_from_csv)
+        advanced_menu.add_command(label="Share Game", command=self.share_game)
+        advanced_menu.add_separator()
+        self._timers_var = tk.BooleanVar(value=instrumentation.enabled)
+        advanced_menu.add_checkbutton(label="Performance Timers", variable=self._timers_var,
+                                      command=self.toggle_timers)
+        self._profiling_var = tk.BooleanVar(value=False)
+        advanced_menu.add_checkbutton(label="Profile (cProfile + tracemalloc)", variable=self._profiling_var,
+                                      command=self.toggle_profiling)
+        advanced_menu.add_command(label="Export Performance Stats", command=self.export_performance_stats)
 
         # Details Panel
         self.details_frame = ttk.LabelFrame(self.root, text="Player Details")
@@ -70,30 +118,84 @@ class MonopolyGUI:
 
         # Save/Load Buttons
         ttk.Button(self.root, text="Save Game", command=self.save_game).pack(side=tk.LEFT, padx=10)
+        ttk.Button(self.root, text="Save As...", command=self.save_game_as).pack(side=tk.LEFT, padx=10)
         ttk.Button(self.root, text="Load Game", command=self.load_game).pack(side=tk.RIGHT, padx=10)
 
         # Transaction History
         self.transaction_frame = ttk.LabelFrame(self.root, text="Transaction History")
         self.transaction_frame.pack(pady=10, padx=10, fill=tk.BOTH, expand=True)
 
-        self.transaction_tree = ttk.Treeview(self.transaction_frame, 
-            columns=("Time", "Player", "Amount", "Reason"), show="headings")
+        self._create_filter_bar()
+        self._filters = None
+        self._filtered = None  # Query results shown instead of the full log while a filter is set
+        self.history_view = TransactionHistoryView(
+            self.transaction_frame,
+            lambda: self.tracker.transaction_log if self._filtered is None else self._filtered)
 
-        for col in ("Time", "Player", "Amount", "Reason"):
-            self.transaction_tree.heading(col, text=col)
+        ttk.Button(self.transaction_frame, text="Export CSV", command=self.export_transactions).pack(pady=5)
 
-        vsb = ttk.Scrollbar(self.transaction_frame, orient="vertical", command=self.transaction_tree.yview)
-        self.transaction_tree.configure(yscrollcommand=vsb.set)
+    def _create_filter_bar(self):
+        filter_frame = ttk.Frame(self.transaction_frame)
+        filter_frame.pack(side=tk.TOP, fill=tk.X, pady=2)
+        self.filter_vars = {}
+        fields = [
+            ("Player", "player", lambda: [""] + [p.name for p in self.tracker.players]),
+            ("Type", "reason_type", lambda: [""] + REASON_TYPES),
+            ("Group", "color_group", lambda: [""] + list(HOUSE_COSTS) + ["Railroad", "Utility"]),
+        ]
+        for column, (label, key, values) in enumerate(fields):
+            ttk.Label(filter_frame, text=label).grid(row=0, column=column * 2, padx=2)
+            var = tk.StringVar()
+            combo = Combobox(filter_frame, textvariable=var, width=12, values=values())
+            combo.configure(postcommand=lambda combo=combo, values=values: combo.configure(values=values()))
+            combo.grid(row=0, column=column * 2 + 1)
+            self.filter_vars[key] = var
+        ttk.Label(filter_frame, text="After").grid(row=0, column=6, padx=2)
+        self.filter_since = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=self.filter_since, width=16).grid(row=0, column=7)
+        ttk.Button(filter_frame, text="Filter", command=self.apply_history_filter).grid(row=0, column=8, padx=2)
+        ttk.Button(filter_frame, text="Clear", command=self.clear_history_filter).grid(row=0, column=9, padx=2)
+
+    def _filter_values(self):
+        filters = {key: var.get() or None for key, var in self.filter_vars.items()}
+        since = self.filter_since.get().strip()
+        if since:
+            # "HH:MM" means today; otherwise a full "YYYY-MM-DD HH:MM"
+            if len(since) <= 5:
+                clock = datetime.strptime(since, "%H:%M")
+                when = datetime.now().replace(hour=clock.hour, minute=clock.minute, second=0, microsecond=0)
+            else:
+                when = datetime.strptime(since, "%Y-%m-%d %H:%M")
+            filters["since"] = int(when.timestamp())
+        return filters
 
-        self.transaction_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        vsb.pack(side=tk.RIGHT, fill=tk.Y)
+    def apply_history_filter(self):
+        try:
+            filters = self._filter_values()
+        except ValueError:
+            messagebox.showerror("Error", "Enter the time as HH:MM or YYYY-MM-DD HH:MM")
+            return
+        if not any(value is not None for value in filters.values()):
+            self.clear_history_filter()
+            return
+        self._filters = filters
+        self.update_transaction_display()
 
-        ttk.Button(self.transaction_frame, text="Export CSV", command=self.export_transactions).pack(pady=5)
+    def clear_history_filter(self):
+        for var in self.filter_vars.values():
+            var.set("")
+        self.filter_since.set("")
+        self._filters = None
+        self._filtered = None
+        self.update_transaction_display()
 
     def update_player_list(self):
+        selection = self.player_list.curselection()
         self.player_list.delete(0, tk.END)
         for player in self.tracker.players:
             self.player_list.insert(tk.END, player.name)
+        if selection and selection[0] < len(self.tracker.players):
+            self.player_list.selection_set(selection[0])
 
     def show_player_details(self, event=None):
         selection = self.player_list.curselection()
@@ -101,14 +203,23 @@ class MonopolyGUI:
             return
 
         player = self.tracker.players[selection[0]]
-        print("Selected player:", player)  # Debug print
-        properties = "\n".join(f"• {prop.name}" for prop in player.properties) if player.properties else "None"
-        print("Player properties:", properties)  # Debug print
+        stats = self.tracker.stats
+        properties = "\n".join(
+            f"• {prop.name}{self._buildings_label(prop)} - ${stats.property_rent[self.tracker.registry.index_of(prop)]} rent collected"
+            for prop in player.properties
+        ) if player.properties else "None"
+        summary = stats.player_summary(player.name)
+        flow = " ".join(f"{amount:+d}" for amount in stats.recent_flow(player.name))
 
         details = (
             f"Name: {player.name}\n"
             f"Money: ${player.money}\n"
+            f"Net worth: ${net_worth(player)}\n"
             f"Properties:\n{properties}\n"
+            f"Rent paid: ${summary['rent_paid']} ({summary['rent_paid_count']}x)\n"
+            f"Rent received: ${summary['rent_received']} ({summary['rent_received_count']}x)\n"
+            f"Money in/out: ${summary['money_in']} / ${summary['money_out']} over {summary['transactions']} transactions\n"
+            f"Recent cash flow (5 min buckets): {flow}\n"
             f"Position: {player.position}\n"
             f"Jail Status: {'In Jail' if player.in_jail else 'Free'}"
         )
@@ -116,6 +227,15 @@ class MonopolyGUI:
         self.details_text.delete(1.0, tk.END)
         self.details_text.insert(tk.END, details)
 
+    def _buildings_label(self, prop):
+        if prop.mortgaged:
+            return " (mortgaged)"
+        if prop.houses == 5:
+            return " (hotel)"
+        if prop.houses:
+            return f" ({prop.houses} house{'s' if prop.houses > 1 else ''})"
+        return ""
+
     def get_selected_player(self):
         selection = self.player_list.curselection()
         if not selection:
@@ -132,7 +252,7 @@ class MonopolyGUI:
         assign_dialog.title("Assign Property")
         assign_dialog.geometry("300x150")
 
-        available = [p for p in self.tracker.properties if not p.owner]
+        available = self.tracker.available_properties()
         if not available:
             messagebox.showinfo("Info", "No available properties")
             return
@@ -144,18 +264,17 @@ class MonopolyGUI:
         combo.current(0)
 
         def on_assign():
-            selected = combo.get()
-            if selected:
-                prop = next(p for p in available if str(p) == selected)
-                if player.money >= prop.price:
-                    player.money -= prop.price  # Subtract property price from player's money
-                    player.add_property(prop)
-                    self.tracker.log_transaction(player, -prop.price, f"Purchased {prop.name}")
-                    self.update_display()
-                    self.show_player_details()  # Ensure player details are updated
-                    assign_dialog.destroy()
-                else:
-                    messagebox.showerror("Error", "Not enough money!")
+            selected = combo.current()
+            if selected >= 0:
+                prop = available[selected]  # By position, since catalog names repeat
+                try:
+                    self.tracker.purchase_property(player, prop)
+                except RuleError as e:
+                    messagebox.showerror("Error", str(e))
+                    return
+                self.update_display()
+                self.show_player_details()  # Ensure player details are updated
+                assign_dialog.destroy()
 
         ttk.Button(assign_dialog, text="Assign", command=on_assign).pack(pady=10)
 
@@ -168,7 +287,7 @@ class MonopolyGUI:
         rent_dialog.title("Pay Rent")
         rent_dialog.geometry("300x150")
 
-        owned_props = [p for p in self.tracker.properties if p.owner and p.owner != payer]
+        owned_props = self.tracker.owned_properties(exclude=payer)
         if not owned_props:
             messagebox.showinfo("Info", "No owned properties to pay rent on")
             return
@@ -180,56 +299,150 @@ class MonopolyGUI:
         combo.current(0)
 
         def on_pay():
-            selected = combo.get()
-            if selected:
-                prop = next(p for p in owned_props if str(p) == selected)
-                self.tracker.charge_rent(payer, prop)
+            selected = combo.current()
+            if selected >= 0:
+                prop = owned_props[selected]
+                owner = prop.owner
+                try:
+                    plan = self.tracker.charge_rent(payer, prop)
+                except RuleError as e:
+                    messagebox.showerror("Error", str(e))
+                    return
                 self.update_display()
                 rent_dialog.destroy()
+                if plan:
+                    self._show_liquidation(payer, owner, plan)
 
         ttk.Button(rent_dialog, text="Pay Rent", command=on_pay).pack(pady=10)
 
+    def _show_liquidation(self, debtor, creditor, plan):
+        if not plan["covered"]:
+            messagebox.showwarning("Bankrupt", f"{debtor.name} could not pay and went bankrupt. "
+                                               f"Their cash and properties went to {creditor.name}.")
+            return
+        lines = [f"Sold {count} building{'s' if count > 1 else ''} on {prop.name}" for prop, count in plan["house_sales"]]
+        lines += [f"Mortgaged {prop.name}" for prop in plan["mortgages"]]
+        messagebox.showinfo("Raised Money", f"{debtor.name} raised ${plan['cash']} to pay:\n" + "\n".join(lines))
+
+    def manage_houses(self):
+        player = self.get_selected_player()
+        if not player:
+            return
+
+        if not player.properties:
+            messagebox.showinfo("Info", "No properties to build on")
+            return
+
+        houses_dialog = tk.Toplevel(self.root)
+        houses_dialog.title("Houses and Hotels")
+        houses_dialog.geometry("400x150")
+
+        ttk.Label(houses_dialog, text="Select Property:").pack(pady=10)
+        props = list(player.properties)
+        prop_names = [str(p) for p in props]
+        combo = Combobox(houses_dialog, values=prop_names, state="readonly")
+        combo.pack(pady=5)
+        combo.current(0)
+
+        def on_change(action):
+            selected = combo.current()
+            if selected >= 0:
+                try:
+                    action(player, props[selected])
+                    self.update_display()
+                except RuleError as e:
+                    messagebox.showerror("Error", str(e))
+
+        btn_frame = ttk.Frame(houses_dialog)
+        btn_frame.pack(pady=10)
+        ttk.Button(btn_frame, text="Build", command=lambda: on_change(self.tracker.build_house)).grid(row=0, column=0, padx=5)
+        ttk.Button(btn_frame, text="Sell", command=lambda: on_change(self.tracker.sell_house)).grid(row=0, column=1, padx=5)
+        ttk.Button(btn_frame, text="Mortgage", command=lambda: on_change(self.tracker.mortgage)).grid(row=0, column=2, padx=5)
+        ttk.Button(btn_frame, text="Unmortgage", command=lambda: on_change(self.tracker.unmortgage)).grid(row=0, column=3, padx=5)
+
     def update_display(self):
-        self.update_player_list()
-        self.show_player_details()
-        self.update_transaction_display()
-        self.check_loans()
+        # Redraws are coalesced into one idle pass, however many actions request one
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.root.after_idle(self._refresh)
+
+    @timed("update_display")
+    def _refresh(self):
+        self._refresh_pending = False
+        changes = self.tracker.take_changes()
+        if not changes:
+            return
+        if changes.roster:
+            self.update_player_list()
+        selection = self.player_list.curselection()
+        if selection:
+            selected = self.tracker.players[selection[0]]
+            if changes.roster or selected.name in changes.players:
+                self.show_player_details()
+        if changes.log_start is not None:
+            self.update_transaction_display()
+        if changes.roster:
+            self.check_loans()
+        else:
+            self.check_loans(changes.players | changes.loans)
+        if self._autosave_enabled:
+            self.autosaver.submit(self.tracker.capture_state())
 
     def update_transaction_display(self):
-        self.transaction_tree.delete(*self.transaction_tree.get_children())
-        for entry in reversed(self.tracker.transaction_log[-50:]):
-            self.transaction_tree.insert("", "end", values=(
-                entry["timestamp"],
-                entry["player"],
-                f"${entry['amount']:+}",
-                entry["reason"]
-            ))
-        self.transaction_tree.yview_moveto(0)  # Scroll to the top
+        if self._filters is not None:
+            # The ledger's indexes make re-running the filter cheap
+            self._filtered = self.tracker.query_transactions(limit=self.FILTER_LIMIT, **self._filters)
+        self.history_view.refresh()
 
     def export_transactions(self):
+        # Exports the rows matching the history filter (all rows without one) on a
+        # worker thread; the dialog polls its progress and can cancel it
         filename = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV Files", "*.csv")]
+            filetypes=[("CSV Files", "*.csv"), ("Gzipped CSV", "*.csv.gz"),
+                       ("Columnar export", "*.cols"), ("Gzipped columnar export", "*.cols.gz")]
         )
-        if filename:
-            try:
-                with open(filename, 'w', newline='') as f:
-                    fieldnames = ["timestamp", "player", "amount", "new_balance", "reason"]
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(self.tracker.transaction_log)
-                messagebox.showinfo("Success", "Transactions exported!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Export failed: {str(e)}")
+        if not filename:
+            return
+        compress = filename.endswith(".gz")
+        stem = filename[:-3] if compress else filename
+        options = dict(self._filters or {})
+        group = options.pop("color_group", None)
+        if group is not None:
+            options["property_ids"] = {i for i, prop in enumerate(self.tracker.properties) if prop.color_group == group}
+        job = ExportJob(self.tracker.transaction_log, filename, format="columns" if stem.endswith(".cols") else "csv",
+                        compress=compress, **options)
+
+        export_dialog = tk.Toplevel(self.root)
+        export_dialog.title("Exporting")
+        status = ttk.Label(export_dialog, text=f"Exporting {job.total} transactions...")
+        status.pack(padx=10, pady=5)
+        progress = ttk.Progressbar(export_dialog, length=300, maximum=1.0)
+        progress.pack(padx=10, pady=5)
+        ttk.Button(export_dialog, text="Cancel", command=job.cancel).pack(pady=5)
+        export_dialog.protocol("WM_DELETE_WINDOW", job.cancel)
+
+        def poll():
+            progress["value"] = job.progress
+            if not job.done:
+                export_dialog.after(100, poll)
+                return
+            export_dialog.destroy()
+            if job.error is not None:
+                messagebox.showerror("Error", f"Export failed: {job.error}")
+            elif job.written is not None:
+                messagebox.showinfo("Success", f"Exported {job.written} transactions!")
+
+        poll()
 
     def add_player(self, event=None):
         name = simpledialog.askstring("Add Player", "Enter player name:")
         if name:
-            if any(p.name.lower() == name.lower() for p in self.tracker.players):
+            if self.tracker.has_player(name):
                 messagebox.showerror("Error", "Player already exists!")
             else:
                 new_player = Player(name)
-                self.tracker.players.append(new_player)
+                self.tracker.add_player(new_player)
                 self.tracker.log_transaction(new_player, 0, "Player created")
                 self.update_display()
 
@@ -240,22 +453,63 @@ class MonopolyGUI:
 
         amount = simpledialog.askinteger("Update Money", "Amount (+/-):")
         if amount:
-            player.money += amount
-            self.tracker.log_transaction(player, amount, "Manual adjustment")
-            self.update_display()
+            try:
+                self.tracker.adjust_money(player, amount)
+                self.update_display()
+            except RuleError as e:
+                messagebox.showerror("Error", str(e))
 
     def toggle_jail(self):
         player = self.get_selected_player()
         if player:
-            player.in_jail = not player.in_jail
-            status = "Jailed" if player.in_jail else "Released"
-            self.tracker.log_transaction(player, 0, status)
+            self.tracker.set_jail(player, not player.in_jail)
             self.update_display()
 
     def load_game(self, event=None):
-        if self.tracker.load_game():
-            self.load_game_data()
-            self.update_display()
+        # Pick a save slot; the list comes from the slots' metadata sidecars
+        slots = self.slot_catalog.refresh()
+        if not slots:
+            messagebox.showwarning("Warning", "No save file found!")
+            return
+
+        picker = tk.Toplevel(self.root)
+        picker.title("Load Game")
+        picker.geometry("600x300")
+        listbox = tk.Listbox(picker, height=12)
+        listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        for slot in slots:
+            players = ", ".join(f"{name} ${money}" for name, money in slot["players"]) or "no players"
+            saved = datetime.fromtimestamp(slot["saved_at"]).strftime("%Y-%m-%d %H:%M")
+            listbox.insert(tk.END, f"{slot['name']} - {saved} - {players} - "
+                                   f"{slot['transactions']} transactions, {slot['size'] // 1024} KB")
+            if slot["path"] == self.tracker.save_file:
+                listbox.selection_set(tk.END)
+
+        def on_load(event=None):
+            selection = listbox.curselection()
+            if not selection:
+                return
+            picker.destroy()
+            self._switch_slot(slots[selection[0]]["path"])
+            self._load_slot()
+
+        listbox.bind("<Double-Button-1>", on_load)
+        ttk.Button(picker, text="Load", command=on_load).pack(pady=5)
+
+    def _load_slot(self):
+        try:
+            self.tracker.load_game()
+        except SaveNotFoundError:
+            messagebox.showwarning("Warning", "No save file found!")
+            return
+        except LoadError as e:
+            messagebox.showerror("Error", f"Load failed: {str(e)}")
+            return
+        messagebox.showinfo("Success", "Game loaded!")
+        self.load_game_data()
+        self._autosave_enabled = True
+        self._attach_ledger()
+        self.update_display()
 
     def move_player(self):
         player = self.get_selected_player()
@@ -265,6 +519,7 @@ class MonopolyGUI:
         spaces = simpledialog.askinteger("Move Player", "Enter spaces to move:")
         if spaces:
             player.position = (player.position + spaces) % 40
+            self.tracker.mark_player_changed(player)
             self.update_display()
 
     def update_property_list(self):
@@ -302,23 +557,93 @@ class MonopolyGUI:
             if recipient_name and amount:
                 try:
                     amount = int(amount)
-                    if amount <= 0:
-                        raise ValueError("Amount must be positive")
-                    recipient = next(p for p in self.tracker.players if p.name == recipient_name)
-                    if payer.money >= amount:
-                        payer.money -= amount
-                        recipient.money += amount
-                        self.tracker.log_transaction(payer, -amount, f"Transferred to {recipient.name}")
-                        self.tracker.log_transaction(recipient, amount, f"Received from {payer.name}")
-                        self.update_display()
-                        transaction_dialog.destroy()
-                    else:
-                        messagebox.showerror("Error", "Not enough money!")
-                except ValueError as e:
+                    recipient = self.tracker.get_player(recipient_name)
+                    self.tracker.transfer(payer, recipient, amount)
+                    self.update_display()
+                    transaction_dialog.destroy()
+                except (ValueError, RuleError) as e:
                     messagebox.showerror("Error", str(e))
 
         ttk.Button(transaction_dialog, text="Transfer", command=on_transfer).pack(pady=10)
 
+    def group_payment(self):
+        # One action moving money between the selected player (or the Bank) and everyone
+        # else, applied as a single batch
+        player = self.get_selected_player()
+        if not player:
+            return
+        others = [p for p in self.tracker.players if p is not player]
+
+        payment_dialog = tk.Toplevel(self.root)
+        payment_dialog.title("Group Payment")
+        payment_dialog.geometry("300x200")
+
+        modes = [f"Everyone pays {player.name}", f"{player.name} pays everyone", "Bank pays everyone"]
+        ttk.Label(payment_dialog, text="Payment:").pack(pady=10)
+        mode_combo = Combobox(payment_dialog, values=modes, state="readonly")
+        mode_combo.pack(pady=5)
+        mode_combo.current(0)
+
+        ttk.Label(payment_dialog, text="Amount per player:").pack(pady=10)
+        amount_entry = ttk.Entry(payment_dialog)
+        amount_entry.pack(pady=5)
+
+        def on_pay():
+            try:
+                amount = int(amount_entry.get())
+                mode = modes.index(mode_combo.get())
+                with self.tracker.batch() as batch:
+                    for other in others:
+                        if mode == 0:
+                            batch.transfer(other, player, amount)
+                        elif mode == 1:
+                            batch.transfer(player, other, amount)
+                        else:
+                            batch.from_bank(other, amount)
+                self.update_display()
+                payment_dialog.destroy()
+            except (ValueError, RuleError) as e:
+                messagebox.showerror("Error", str(e))
+
+        ttk.Button(payment_dialog, text="Pay", command=on_pay).pack(pady=10)
+
+    def trade_suggestions(self):
+        # Ranked trades between any two players; the chosen one is applied as one batch
+        if len(self.tracker.players) < 2:
+            messagebox.showinfo("Info", "Trades need at least two players")
+            return
+
+        trade_dialog = tk.Toplevel(self.root)
+        trade_dialog.title("Trade Suggestions")
+        trade_dialog.geometry("700x300")
+
+        listbox = tk.Listbox(trade_dialog, height=10)
+        listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        suggestions = []
+
+        def refresh():
+            suggestions[:] = self.tracker.trade_suggestions()
+            listbox.delete(0, tk.END)
+            for trade in suggestions:
+                listbox.insert(tk.END, describe(trade))
+            if not suggestions:
+                listbox.insert(tk.END, "No trade would leave both players better off")
+
+        def on_trade():
+            selection = listbox.curselection()
+            if not selection or not suggestions:
+                return
+            try:
+                self.tracker.execute_trade(suggestions[selection[0]])
+            except RuleError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            self.update_display()
+            refresh()
+
+        ttk.Button(trade_dialog, text="Make Trade", command=on_trade).pack(pady=5)
+        refresh()
+
     def loan(self):
         loan_dialog = tk.Toplevel(self.root)
         loan_dialog.title("Loan")
@@ -346,7 +671,7 @@ class MonopolyGUI:
         if not borrower:
             return
 
-        if self.bank_loans.get(borrower.name, 0) >= 360:
+        if self.tracker.loans.bank.get(borrower.name, 0) >= BANK_LOAN_LIMIT:
             messagebox.showerror("Error", "You have reached the maximum loan limit from the bank!")
             return
 
@@ -354,7 +679,7 @@ class MonopolyGUI:
         loan_dialog.title("Loan from Bank")
         loan_dialog.geometry("300x150")
 
-        ttk.Label(loan_dialog, text="Enter Loan Amount (max 360):").pack(pady=10)
+        ttk.Label(loan_dialog, text=f"Enter Loan Amount (max {BANK_LOAN_LIMIT}):").pack(pady=10)
         amount_entry = ttk.Entry(loan_dialog)
         amount_entry.pack(pady=5)
 
@@ -362,17 +687,10 @@ class MonopolyGUI:
             amount = amount_entry.get()
             if amount:
                 try:
-                    amount = int(amount)
-                    if amount <= 0 or amount > 360:
-                        raise ValueError("Amount must be between 1 and 360")
-                    if self.bank_loans.get(borrower.name, 0) + amount > 360:
-                        raise ValueError("Total loan amount exceeds 360")
-                    borrower.money += amount
-                    self.bank_loans[borrower.name] = self.bank_loans.get(borrower.name, 0) + amount
-                    self.tracker.log_transaction(borrower, amount, "Loan from Bank")
+                    self.tracker.bank_loan(borrower, int(amount))
                     self.update_display()
                     loan_dialog.destroy()
-                except ValueError as e:
+                except (ValueError, RuleError) as e:
                     messagebox.showerror("Error", str(e))
 
         ttk.Button(loan_dialog, text="Loan", command=on_loan).pack(pady=10)
@@ -406,20 +724,11 @@ class MonopolyGUI:
             if lender_name and amount:
                 try:
                     amount = int(amount)
-                    if amount <= 0:
-                        raise ValueError("Amount must be positive")
-                    lender = next(p for p in self.tracker.players if p.name == lender_name)
-                    if lender.money >= amount:
-                        lender.money -= amount
-                        borrower.money += amount
-                        self.tracker.log_transaction(lender, -amount, f"Loaned to {borrower.name}")
-                        self.tracker.log_transaction(borrower, amount, f"Loan from {lender.name}")
-                        self.loan_log.setdefault(borrower.name, []).append({"lender": lender.name, "amount": amount})
-                        self.update_display()
-                        loan_dialog.destroy()
-                    else:
-                        messagebox.showerror("Error", "Lender does not have enough money!")
-                except ValueError as e:
+                    lender = self.tracker.get_player(lender_name)
+                    self.tracker.lend(lender, borrower, amount)
+                    self.update_display()
+                    loan_dialog.destroy()
+                except (ValueError, RuleError) as e:
                     messagebox.showerror("Error", str(e))
 
         ttk.Button(loan_dialog, text="Loan", command=on_loan).pack(pady=10)
@@ -434,9 +743,7 @@ class MonopolyGUI:
         repay_dialog.geometry("300x200")
 
         ttk.Label(repay_dialog, text="Select Lender:").pack(pady=10)
-        lender_names = [loan["lender"] for loan in self.loan_log.get(borrower.name, [])]
-        if borrower.name in self.bank_loans:
-            lender_names.append("Bank")
+        lender_names = self.tracker.loans.lenders_of(borrower.name)
         if not lender_names:
             messagebox.showinfo("Info", "No loans to repay")
             return
@@ -447,45 +754,188 @@ class MonopolyGUI:
 
         def on_repay():
             lender_name = lender_combo.get()
-            if lender_name == "Bank":
-                amount = self.bank_loans.get(borrower.name, 0)
-                if amount and borrower.money >= amount:
-                    borrower.money -= amount
-                    del self.bank_loans[borrower.name]
-                    self.tracker.log_transaction(borrower, -amount, "Repayment to Bank")
-                    self.update_display()
-                    repay_dialog.destroy()
-                else:
-                    messagebox.showerror("Error", "Not enough money to repay the bank!")
-            else:
-                loan = next((loan for loan in self.loan_log[borrower.name] if loan["lender"] == lender_name), None)
-                if loan and borrower.money >= loan["amount"]:
-                    lender = next(p for p in self.tracker.players if p.name == lender_name)
-                    borrower.money -= loan["amount"]
-                    lender.money += loan["amount"]
-                    self.tracker.log_transaction(borrower, -loan["amount"], f"Repayment to {lender.name}")
-                    self.tracker.log_transaction(lender, loan["amount"], f"Repayment from {borrower.name}")
-                    self.loan_log[borrower.name].remove(loan)
-                    self.update_display()
-                    repay_dialog.destroy()
-                else:
-                    messagebox.showerror("Error", "Not enough money to repay the loan!")
+            lender = None if lender_name == "Bank" else self.tracker.get_player(lender_name)
+            try:
+                self.tracker.repay(borrower, lender)
+            except RuleError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            self.update_display()
+            repay_dialog.destroy()
 
         ttk.Button(repay_dialog, text="Repay", command=on_repay).pack(pady=10)
 
-    def check_loans(self):
-        for borrower_name, loans in self.loan_log.items():
-            borrower = next(p for p in self.tracker.players if p.name == borrower_name)
-            for loan in loans:
-                if borrower.money >= loan["amount"]:
-                    lender = next(p for p in self.tracker.players if p.name == loan["lender"])
-                    if messagebox.askyesno("Loan Repayment", f"{borrower.name} has enough funds to repay {loan['amount']} to {lender.name}. Do you want to process the repayment?"):
-                        borrower.money -= loan["amount"]
-                        lender.money += loan["amount"]
-                        self.tracker.log_transaction(borrower, -loan["amount"], f"Repayment to {lender.name}")
-                        self.tracker.log_transaction(lender, loan["amount"], f"Repayment from {borrower.name}")
-                        loans.remove(loan)
-                        self.update_display()
+    def check_loans(self, borrower_names=None):
+        # Only borrowers whose balance or loans changed can have become able to repay;
+        # everything they can repay is offered in one prompt
+        if self._repay_prompt is not None:
+            # Fold the open prompt's borrowers into a fresh one with current balances
+            borrower_names = None if borrower_names is None else set(borrower_names) | self._repay_prompt.borrowers
+            self._repay_prompt.destroy()
+            self._repay_prompt = None
+        suggestions = self.tracker.repayment_suggestions(borrower_names)
+        if not suggestions:
+            return
+
+        prompt = tk.Toplevel(self.root)
+        prompt.title("Loan Repayment")
+        prompt.borrowers = {borrower for borrower, _, _ in suggestions}
+        self._repay_prompt = prompt
+        ttk.Label(prompt, text="These loans can be repaid now:").pack(pady=10, padx=10)
+        choices = []
+        for borrower, lender, amount in suggestions:
+            var = tk.BooleanVar(value=True)
+            ttk.Checkbutton(prompt, text=f"{borrower} repays {amount} to {lender}", variable=var).pack(anchor=tk.W, padx=10)
+            choices.append((var, borrower, lender))
+
+        def close():
+            self._repay_prompt = None
+            prompt.destroy()
+
+        def on_repay():
+            close()
+            for var, borrower, lender in choices:
+                if var.get():
+                    try:
+                        self.tracker.repay(self.tracker.get_player(borrower),
+                                           None if lender == "Bank" else self.tracker.get_player(lender))
+                    except RuleError as e:
+                        messagebox.showerror("Error", str(e))
+            self.update_display()
+
+        btn_frame = ttk.Frame(prompt)
+        btn_frame.pack(pady=10)
+        ttk.Button(btn_frame, text="Repay Selected", command=on_repay).grid(row=0, column=0, padx=5)
+        ttk.Button(btn_frame, text="Not Now", command=close).grid(row=0, column=1, padx=5)
+        prompt.protocol("WM_DELETE_WINDOW", close)
+
+    def view_property_rankings(self):
+        rankings_dialog = tk.Toplevel(self.root)
+        rankings_dialog.title("Property Rankings")
+        rankings_dialog.geometry("520x400")
+
+        rankings_text = tk.Text(rankings_dialog, height=20)
+        rankings_text.pack(fill=tk.BOTH, expand=True)
+
+        results = property_rankings(self.tracker.properties)
+        rankings_text.insert(tk.END, "Expected rent per opponent turn (payback in opponent turns):\n\n")
+        for row in results["rankings"][:30]:
+            payback = f"{row['payback_turns']:.0f}" if row["payback_turns"] else "-"
+            rankings_text.insert(tk.END, f"{row['property']} (level {row['level']}): "
+                                         f"${row['expected_rent']:.1f}, payback {payback}\n")
+
+        rankings_text.config(state=tk.DISABLED)
+
+    def view_timeline(self):
+        # Scrub through the game: shows the table as it was after transaction #N
+        timeline_dialog = tk.Toplevel(self.root)
+        timeline_dialog.title("Timeline")
+        timeline_dialog.geometry("520x420")
+
+        total = len(self.tracker.transaction_log)
+        position = tk.IntVar(value=total)
+        pending = []
+
+        timeline_text = tk.Text(timeline_dialog, height=20)
+
+        def show():
+            pending.clear()
+            index = position.get()
+            state = self.tracker.state_at(index)
+            timeline_text.config(state=tk.NORMAL)
+            timeline_text.delete(1.0, tk.END)
+            if index:
+                entry = self.tracker.transaction_log[index - 1]
+                timeline_text.insert(tk.END, f"#{index} {entry['timestamp']} {entry['player']} "
+                                             f"${entry['amount']:+} {entry['reason']}\n\n")
+            else:
+                timeline_text.insert(tk.END, "Start of the game\n\n")
+            owned = {}
+            for prop, owner, houses in zip(self.tracker.properties, state["owners"], state["houses"]):
+                if owner:
+                    owned.setdefault(owner, []).append(prop.name + (f" ({houses})" if houses else ""))
+            for name in state["players"]:
+                jail = " (in jail)" if state["in_jail"][name] else ""
+                timeline_text.insert(tk.END, f"{name}: ${state['money'][name]}{jail}\n")
+                for prop_name in owned.get(name, []):
+                    timeline_text.insert(tk.END, f"  - {prop_name}\n")
+            timeline_text.config(state=tk.DISABLED)
+
+        def on_move(value):
+            # Dragging fires many events; draw once per idle pass
+            if not pending:
+                pending.append(timeline_dialog.after_idle(show))
+
+        tk.Scale(timeline_dialog, from_=0, to=total, orient=tk.HORIZONTAL, variable=position,
+                 command=on_move).pack(fill=tk.X, padx=10)
+        timeline_text.pack(fill=tk.BOTH, expand=True)
+        show()
+
+    def rebuild_from_csv(self):
+        # Several exports of one game (or of consecutive sessions) are merged by time
+        filenames = filedialog.askopenfilenames(filetypes=[("CSV Files", "*.csv")])
+        if not filenames:
+            return
+        try:
+            gaps = self.tracker.rebuild_from_csv(list(filenames))
+        except LoadError as e:
+            messagebox.showerror("Error", f"Rebuild failed: {str(e)}")
+            return
+        self.update_display()
+        if gaps:
+            lines = "\n".join(f"#{index} {player}: expected ${expected}, found ${actual}"
+                              for index, player, expected, actual in gaps[:10])
+            more = f"\n...and {len(gaps) - 10} more" if len(gaps) > 10 else ""
+            messagebox.showwarning("Balance Check", f"{len(gaps)} transactions don't follow from the "
+                                                    f"player's previous balance:\n{lines}{more}")
+
+    def share_game(self):
+        # Stream this game to display screens and backup laptops, see core.replication
+        if self.replication_server is None:
+            try:
+                self.replication_server = self.tracker.start_replication(host="0.0.0.0")
+            except OSError as e:
+                messagebox.showerror("Error", f"Sharing failed: {str(e)}")
+                return
+        port = self.replication_server.server_address[1]
+        messagebox.showinfo("Share Game", f"Followers can connect to port {port}:\n"
+                                          f"python main.py --follow <this computer>:{port}")
+
+    def _poll_follower(self):
+        if self.follower.poll():
+            self.update_display()
+        self.root.after(100, self._poll_follower)
+
+    def toggle_timers(self):
+        if self._timers_var.get():
+            instrumentation.enable()
+        else:
+            instrumentation.disable()
+
+    def toggle_profiling(self):
+        # The raw profile is written next to the save file when the capture stops
+        if self._profiling_var.get():
+            instrumentation.start_capture()
+            self._timers_var.set(True)
+            return
+        path = os.path.splitext(self.tracker.save_file)[0] + datetime.now().strftime("-%Y%m%d-%H%M%S.prof")
+        try:
+            summary = instrumentation.stop_capture(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Writing the profile failed: {str(e)}")
+            return
+        top = "\n".join(f"{row['cumulative_seconds']:.3f} s  {row['function']}" for row in summary["functions"][:10])
+        messagebox.showinfo("Profile", f"Profile saved to {path}\nPeak traced memory: "
+                                       f"{summary['memory']['peak'] // 1024} KB\n\n{top}")
+
+    def export_performance_stats(self):
+        filename = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON Files", "*.json")])
+        if not filename:
+            return
+        try:
+            instrumentation.export(filename)
+        except OSError as e:
+            messagebox.showerror("Error", f"Export failed: {str(e)}")
 
     def view_debt_log(self):
         debt_log_dialog = tk.Toplevel(self.root)
@@ -496,37 +946,78 @@ class MonopolyGUI:
         debt_log_text.pack(fill=tk.BOTH, expand=True)
 
         debt_log_text.insert(tk.END, "Debt Log:\n")
-        for borrower_name in set(self.loan_log.keys()).union(self.bank_loans.keys()):
+        loans = self.tracker.loans
+        for borrower_name in loans.borrowers():
             debt_log_text.insert(tk.END, f"\n{borrower_name}:\n")
-            if borrower_name in self.loan_log:
-                for loan in self.loan_log[borrower_name]:
-                    debt_log_text.insert(tk.END, f"  Owes {loan['amount']} to {loan['lender']}\n")
-            if borrower_name in self.bank_loans:
-                debt_log_text.insert(tk.END, f"  Owes {self.bank_loans[borrower_name]} to the Bank\n")
+            for lender, amount in loans.loans_of(borrower_name):
+                debt_log_text.insert(tk.END, f"  Owes {amount} to {lender}\n")
+            if borrower_name in loans.bank:
+                debt_log_text.insert(tk.END, f"  Owes {loans.bank[borrower_name]} to the Bank\n")
 
         debt_log_text.config(state=tk.DISABLED)
 
     def save_game(self):
-        self.tracker.save_game()
-        self.save_game_data()
+        try:
+            self.tracker.save_game()
+        except (SaveError, OSError) as e:
+            messagebox.showerror("Error", f"Save failed: {str(e)}")
+            return
+        self._autosave_enabled = True
+        self._attach_ledger()
+        messagebox.showinfo("Success", "Game saved!")
+
+    def save_game_as(self):
+        name = simpledialog.askstring("Save As", "Save slot name:", initialvalue=slot_name(self.tracker.save_file))
+        if not name:
+            return
+        try:
+            path = slot_path(name, self.slot_catalog.folder)
+        except ValueError:
+            messagebox.showerror("Error", "Use letters, digits, spaces, - and _ for slot names")
+            return
+        if path != self.tracker.save_file and os.path.exists(path) and \
+                not messagebox.askyesno("Save As", f"Replace the save in slot {name}?"):
+            return
+        self._switch_slot(path)
+        self.save_game()
 
-    def save_game_data(self):
-        data = {
-            "loan_log": self.loan_log,
-            "bank_loans": self.bank_loans
-        }
-        with open("game_data.json", "w") as f:
-            json.dump(data, f)
+    def _switch_slot(self, path):
+        # Pending autosaves belong to the current slot, so they are written first
+        self.autosaver.flush()
+        self.tracker.use_save_file(path)
+        self._show_slot()
+
+    def _show_slot(self):
+        self.root.title(f"Monopoly Tracker - {slot_name(self.tracker.save_file)}")
+
+    def _attach_ledger(self):
+        # Like autosave, the SQLite ledger starts once this session has saved or loaded
+        if self.tracker.ledger is None:
+            try:
+                self.tracker.attach_ledger()
+            except (sqlite3.Error, OSError) as e:
+                messagebox.showwarning("Warning", f"Transaction ledger unavailable: {str(e)}")
 
     def load_game_data(self):
+        # Saves from before loans were stored in the game file kept them in game_data.json
+        if self.tracker.loans or self.tracker.game_data is not None:
+            return
         try:
             with open("game_data.json", "r") as f:
-                data = json.load(f)
-                self.loan_log = data.get("loan_log", {})
-                self.bank_loans = data.get("bank_loans", {})
+                self.tracker.loans = LoanBook.from_dict(json.load(f))
         except FileNotFoundError:
             pass
 
+    def on_close(self):
+        self.autosaver.stop()  # Writes any pending autosave first
+        if self.replication_server:
+            self.replication_server.close()
+        if self.follower:
+            self.follower.stop()
+        if self.tracker.ledger:
+            self.tracker.ledger.close()
+        self.root.destroy()
+
     def sell_property(self):
         seller = self.get_selected_player()
         if not seller:
@@ -558,28 +1049,18 @@ class MonopolyGUI:
         price_entry.pack(pady=5)
 
         def on_sell():
-            prop_name = prop_combo.get()
+            selected = prop_combo.current()
             buyer_name = buyer_combo.get()
             price = price_entry.get()
-            if prop_name and buyer_name and price:
+            if selected >= 0 and buyer_name and price:
                 try:
                     price = int(price)
-                    if price <= 0:
-                        raise ValueError("Price must be positive")
-                    prop = next(p for p in owned_props if str(p) == prop_name)
-                    buyer = next(p for p in self.tracker.players if p.name == buyer_name)
-                    if buyer.money >= price:
-                        seller.money += price
-                        buyer.money -= price
-                        seller.remove_property(prop)
-                        buyer.add_property(prop)
-                        self.tracker.log_transaction(seller, price, f"Sold {prop.name} to {buyer.name}")
-                        self.tracker.log_transaction(buyer, -price, f"Bought {prop.name} from {seller.name}")
-                        self.update_display()
-                        sell_dialog.destroy()
-                    else:
-                        messagebox.showerror("Error", "Buyer does not have enough money!")
-                except ValueError as e:
+                    prop = owned_props[selected]  # By position, since catalog names repeat
+                    buyer = self.tracker.get_player(buyer_name)
+                    self.tracker.sell_property(seller, buyer, prop, price)
+                    self.update_display()
+                    sell_dialog.destroy()
+                except (ValueError, RuleError) as e:
                     messagebox.showerror("Error", str(e))
 
         ttk.Button(sell_dialog, text="Sell", command=on_sell).pack(pady=10)
\ No newline at end of file
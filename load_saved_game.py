@@ -1,25 +1,32 @@
-import json
+import os
+import sys
+
+from core.save_format import read_document
 
 def load_saved_game(filepath):
-    with open(filepath, 'r') as f:
-        data = json.load(f)
-    return data
+    # Any save layout, returned in the current format
+    return read_document(filepath)
 
 def print_players_and_properties(data):
     players = data.get("players", [])
-    for player in players:
+    for i, player in enumerate(players):
         print(f"Player: {player['name']}")
         print(f"Money: ${player['money']}")
-        properties = player.get("properties", [])
+        properties = [prop[0] for prop, owner in zip(data["catalog"], data["owners"]) if owner == i]
         if properties:
             print("Properties:")
             for prop in properties:
-                print(f"  - {prop['name']}")
+                print(f"  - {prop}")
         else:
             print("Properties: None")
         print()
 
 if __name__ == "__main__":
-    filepath = "c:\\Users\\ADMIN\\Desktop\\Monopoly\\V2\\data\\saved_games\\latest.json"
-    data = load_saved_game(filepath)
-    print_players_and_properties(data)
+    filepath = sys.argv[1] if len(sys.argv) > 1 else os.path.join("data", "saved_games", "latest.json")
+    if os.path.isdir(filepath):
+        # A whole archive: reports across every game in it
+        from core import archive
+        archive.print_report(*archive.analyze(filepath))
+    else:
+        data = load_saved_game(filepath)
+        print_players_and_properties(data)
@@ -1,7 +1,22 @@
+import logging
+import os
+import sys
 import tkinter as tk
 from gui.main_window import MonopolyGUI
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("MONOPOLY_LOG_LEVEL", "WARNING").upper())
+    if os.environ.get("MONOPOLY_TIMERS"):
+        from core import instrumentation
+        instrumentation.enable()  # Same as Advanced > Performance Timers
+    args = sys.argv[1:]
+    follow = None
+    if args[:1] == ["--follow"] and len(args) > 1:
+        # Mirror a table that shares its game: --follow host:port
+        host, _, port = args[1].rpartition(":")
+        follow = (host or "127.0.0.1", int(port))
+        args = args[2:]
     root = tk.Tk()
-    app = MonopolyGUI(root)
+    # An optional save file path lets several tables run side by side
+    app = MonopolyGUI(root, save_file=args[0] if args else None, follow=follow)
     root.mainloop()
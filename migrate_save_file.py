@@ -0,0 +1,19 @@
+import argparse
+from core.save_format import read_document, upgrade_document, write_document
+
+def migrate_save_file(source, destination, binary=False, compress=False):
+    # Reads a save in any layout (including the original one written by
+    # create_save_file.py) and writes it in the current format
+    document = upgrade_document(read_document(source))
+    with open(destination, 'wb') as f:
+        write_document(f, document, binary, compress)
+    print(f"Migrated {source} to {destination}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a save file to the current save format")
+    parser.add_argument("source")
+    parser.add_argument("destination")
+    parser.add_argument("--binary", action="store_true", help="write the packed binary format")
+    parser.add_argument("--compress", action="store_true", help="zlib-compress the binary format")
+    args = parser.parse_args()
+    migrate_save_file(args.source, args.destination, args.binary, args.compress)
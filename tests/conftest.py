@@ -0,0 +1,23 @@
+import pytest
+
+from core.game_engine import MonopolyTracker
+from core.player import Player
+
+
+@pytest.fixture
+def save_file(tmp_path):
+    return str(tmp_path / "latest.json")
+
+
+@pytest.fixture
+def tracker(save_file):
+    return MonopolyTracker(save_file=save_file)
+
+
+@pytest.fixture
+def players(tracker):
+    # Three players with the starting $1500
+    added = [Player(name) for name in ("A", "B", "C")]
+    for player in added:
+        tracker.add_player(player)
+    return added
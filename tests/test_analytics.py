@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core import analytics, board
+
+
+def test_transition_rows_are_distributions():
+    for rules in (analytics.DEFAULT_RULES, {"jail": False}):
+        matrix, squares = analytics.transition_matrix(rules)
+        assert np.allclose(matrix.sum(axis=1), 1)
+        assert len(squares) == len(matrix)
+
+
+def test_without_jail_every_square_is_equally_likely():
+    landing, rolls_per_turn = analytics.solve({"jail": False})
+    assert np.allclose(landing, 1 / board.BOARD_SIZE)
+    assert rolls_per_turn == 1.0
+
+
+def test_jail_rules_shift_landings():
+    landing, rolls_per_turn = analytics.solve()
+    assert sum(landing) == pytest.approx(1)
+    assert landing[board.GO_TO_JAIL_SQUARE] == 0
+    assert max(range(board.BOARD_SIZE), key=landing.__getitem__) == board.JAIL_SQUARE
+    assert 1 < rolls_per_turn < 1.2  # Doubles add a roll about a sixth of the time
+
+
+@pytest.fixture
+def fresh_memory(monkeypatch):
+    monkeypatch.setattr(analytics, "_memory", {})
+
+
+def test_rankings_are_sorted_and_cover_every_level(tracker, tmp_path, fresh_memory):
+    results = analytics.property_rankings(tracker.properties, cache_dir=str(tmp_path))
+    rankings = results["rankings"]
+
+    expected = [row["expected_rent"] for row in rankings]
+    assert expected == sorted(expected, reverse=True)
+    streets = [prop for prop in tracker.properties if prop.color_group in board.HOUSE_COSTS]
+    assert sum(row["level"] == 5 for row in rankings) == len(streets)
+    hotel = next(row for row in rankings if row["property"] == "Rue de la Paix" and row["level"] == 5)
+    assert hotel["cost"] == 400 + 5 * 200
+    assert hotel["payback_turns"] == pytest.approx(hotel["cost"] / hotel["expected_rent"])
+
+
+def test_rankings_are_cached_on_disk_per_rule_set(tracker, tmp_path, fresh_memory, monkeypatch):
+    first = analytics.property_rankings(tracker.properties, cache_dir=str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 1
+
+    solve = analytics.solve
+    monkeypatch.setattr(analytics, "_memory", {})
+    monkeypatch.setattr(analytics, "solve", lambda rules: pytest.fail("solved again instead of reading the cache"))
+    assert analytics.property_rankings(tracker.properties, cache_dir=str(tmp_path)) == first
+
+    monkeypatch.setattr(analytics, "solve", solve)
+    analytics.property_rankings(tracker.properties, {"jail": False}, cache_dir=str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_landing_per_turn_follows_the_catalog(tracker, fresh_memory, tmp_path):
+    analytics.property_rankings(tracker.properties, cache_dir=str(tmp_path))  # Memoized for the call below
+    per_turn = analytics.landing_per_turn(tracker.properties)
+    assert len(per_turn) == len(tracker.properties)
+    assert all(0 < chance < 0.1 for chance in per_turn)
+
+
+def test_stations_and_utilities_are_ranked_at_base_rent_only(tracker, tmp_path, fresh_memory):
+    results = analytics.property_rankings(tracker.properties, cache_dir=str(tmp_path))
+    station = [row for row in results["rankings"] if row["property"] == "Gare du Nord"]
+    assert [row["level"] for row in station] == [0]  # Higher rents need the other stations too
+    assert station[0]["cost"] == 200
+    assert station[0]["expected_rent"] == pytest.approx(
+        station[0]["landing_probability"] * results["rolls_per_turn"] * 25)
+    utilities = [row for row in results["rankings"] if row["color_group"] == "Utility"]
+    assert len(utilities) == 2 and all(row["level"] == 0 for row in utilities)
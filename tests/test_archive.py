@@ -0,0 +1,107 @@
+import json
+import os
+
+import pytest
+
+from core import archive
+from core.export import export_log
+from core.game_engine import MonopolyTracker
+from core.player import Player
+
+
+def play_game(path, winner_buys):
+    tracker = MonopolyTracker(save_file=path)
+    a, b = Player("A"), Player("B")
+    for player in (a, b):
+        tracker.add_player(player)
+    for i in winner_buys:
+        tracker.purchase_property(a, tracker.properties[i])
+    tracker.purchase_property(b, tracker.properties[21])
+    if {0, 1} <= set(winner_buys):
+        tracker.build_house(a, tracker.properties[0])
+    tracker.charge_rent(b, tracker.properties[winner_buys[0]])
+    tracker.transfer(b, a, 100)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tracker.save_game()
+    return tracker
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "archive"
+    play_game(str(root / "2024" / "g1.json"), [0, 1])
+    game = play_game(str(root / "2024" / "g2.json"), [2])
+    export_log(game.transaction_log, str(root / "g2.csv"))
+    (root / "notes.json").write_text('{"not": "a game"}')
+    (root / ".hidden").mkdir()
+    (root / ".hidden" / "g3.json").write_text("{}")
+    return str(root)
+
+
+def test_discover_skips_hidden_files_and_sidecars(root):
+    assert archive.discover(root) == ["g2.csv", "notes.json", "2024/g1.json", "2024/g2.json"]
+
+
+def test_a_csv_export_summarizes_like_its_save(root):
+    _, from_save = archive.summarize_file(os.path.join(root, "2024", "g2.json"))
+    digest, from_csv = archive.summarize_file(os.path.join(root, "g2.csv"))
+    assert from_csv == from_save
+    assert from_save["winner"] == "A" and from_save["first_purchase"] == {"A": "Boulevard de la Villette",
+                                                                          "B": "Gare Montparnasse"}
+    assert archive.summarize_file(os.path.join(root, "g2.csv"), digest) == (digest, None)
+    assert "error" in archive.summarize_file(os.path.join(root, "notes.json"))[1]
+
+
+def test_reruns_only_parse_changed_files(root):
+    report, counts = archive.analyze(root, workers=1)
+    assert counts == {"files": 4, "parsed": 4, "reused": 0, "skipped": 1}
+    assert report["games"] == 3
+    assert archive.analyze(root, workers=1) == (report, {"files": 4, "parsed": 0, "reused": 4, "skipped": 1})
+
+    notes = os.path.join(root, "notes.json")
+    os.utime(notes, ns=(0, 0))  # Same content, new mtime: hashed, not parsed
+    assert archive.analyze(root, workers=1)[1]["parsed"] == 0
+    with open(notes, "w") as f:
+        f.write("[]")
+    assert archive.analyze(root, workers=1)[1]["parsed"] == 1
+    os.remove(notes)
+    assert archive.analyze(root, workers=1) == (report, {"files": 3, "parsed": 0, "reused": 3, "skipped": 0})
+
+
+def test_stale_caches_are_ignored(root):
+    archive.analyze(root, workers=1)
+    cache = os.path.join(root, archive.CACHE_FILE)
+    with open(cache, encoding="utf-8") as f:
+        data = json.load(f)
+    data["version"] = archive.CACHE_VERSION + 1
+    with open(cache, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    assert archive.analyze(root, workers=1)[1]["parsed"] == 4
+    with open(cache, "w", encoding="utf-8") as f:
+        f.write("{broken")
+    assert archive.analyze(root, workers=1)[1]["parsed"] == 4
+
+
+def test_workers_give_the_same_report(root):
+    single = archive.analyze(root, cache_file=False, workers=1)
+    assert archive.analyze(root, cache_file=False, workers=2) == single
+    assert not os.path.exists(os.path.join(root, archive.CACHE_FILE))
+
+
+def test_report_merges_summaries():
+    def summary(winner, first, invested, rent, curve):
+        return {"transactions": 10, "seconds": 600, "winner": winner, "first_purchase": first,
+                "invested": invested, "rent": rent, "cash_curve": curve}
+
+    result = archive.report([
+        summary("A", {"A": "X", "B": "Y"}, {"Green": 300}, {"Green": 150}, [1.0] * archive.CURVE_POINTS),
+        summary("B", {"A": "Y", "B": "X"}, {"Green": 300, "Pink": 100}, {}, [3.0] * archive.CURVE_POINTS),
+        summary(None, {"A": "X"}, {}, {}, []),
+    ])
+    assert (result["games"], result["average_transactions"], result["average_minutes"]) == (3, 10, 10)
+    assert [(row["property"], row["wins"], row["players"]) for row in result["win_rate_by_first_property"]] == [
+        ("X", 2, 2), ("Y", 0, 2)]
+    assert result["rent_roi_by_group"]["Green"] == {"invested": 600, "rent": 150, "roi": 0.25}
+    assert result["rent_roi_by_group"]["Pink"]["roi"] == 0
+    assert result["cash_curve"] == [2.0] * archive.CURVE_POINTS
+    assert archive.report([])["games"] == 0
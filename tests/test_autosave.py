@@ -0,0 +1,74 @@
+import os
+import threading
+
+from core.autosave import AutoSaver
+from core.game_engine import MonopolyTracker
+
+
+def test_submissions_coalesce_into_the_newest_state():
+    written = []
+    saver = AutoSaver(written.append, interval=60)
+    saver.submit(1)
+    assert saver.flush(timeout=5)  # The first write goes out at once
+    for state in range(2, 10):
+        saver.submit(state)
+    assert written == [1]  # The rest wait for the interval
+
+    assert saver.flush(timeout=5)
+    saver.stop(timeout=5)
+    assert written == [1, 9]
+
+
+def test_stop_writes_the_pending_state():
+    written = []
+    saver = AutoSaver(written.append, interval=60)
+    saver.submit("first")
+    saver.flush(timeout=5)
+    saver.submit("last")
+    saver.stop(timeout=5)
+    assert written == ["first", "last"]
+
+
+def test_failed_write_is_kept_as_last_error():
+    def fail(state):
+        raise OSError("disk full")
+
+    saver = AutoSaver(fail, interval=0)
+    saver.submit(1)
+    saver.flush(timeout=5)
+    saver.stop(timeout=5)
+    assert isinstance(saver.last_error, OSError)
+
+
+def test_write_runs_off_the_submitting_thread():
+    threads = []
+    saver = AutoSaver(lambda state: threads.append(threading.current_thread()), interval=0)
+    saver.submit(1)
+    saver.flush(timeout=5)
+    saver.stop(timeout=5)
+    assert threads and threads[0] is not threading.current_thread()
+
+
+def test_captured_state_ignores_later_entries(tracker, players, save_file):
+    state = tracker.capture_state({"note": "kept"})
+    tracker.adjust_money(players[0], 100)  # After the capture
+
+    assert tracker.write_state(state)
+    loaded = MonopolyTracker(save_file=save_file)
+    loaded.load_game()
+    assert loaded.players[0].money == 1500
+    assert len(loaded.transaction_log) == state["log_length"]
+    assert loaded.game_data == {"note": "kept"}
+
+
+def test_older_state_never_replaces_a_newer_one(tracker, players, save_file):
+    old = tracker.capture_state()
+    tracker.adjust_money(players[0], 100)
+    new = tracker.capture_state()
+
+    assert tracker.write_state(new)
+    assert not tracker.write_state(old)
+    loaded = MonopolyTracker(save_file=save_file)
+    loaded.load_game()
+    assert loaded.players[0].money == 1600
+    assert not os.path.exists(save_file + ".tmp")
@@ -0,0 +1,94 @@
+import pytest
+
+from core.errors import RuleError
+
+
+def snapshot(tracker):
+    return ([(p.name, p.money, [prop.name for prop in p.properties]) for p in tracker.players],
+            [prop.owner.name if prop.owner else None for prop in tracker.properties],
+            len(tracker.transaction_log))
+
+
+def test_legs_are_applied_together(tracker, players):
+    a, b, c = players
+    start = len(tracker.transaction_log)
+    with tracker.batch() as batch:
+        batch.transfer(a, b, 300)
+        batch.pay_bank(b, 1700)  # Only affordable after the first leg
+        batch.from_bank(c, 50)
+    assert len(batch) == 4
+    assert (a.money, b.money, c.money) == (1200, 100, 1550)
+
+    log = tracker.transaction_log
+    assert len(log) == start + 4
+    assert len(set(log.timestamps[start:])) == 1
+    assert [log.balances[i] for i in range(start, len(log))] == [1200, 1800, 100, 1550]
+    assert tracker.stats.player_summary("B")["money_out"] == 1700
+
+
+def test_a_leg_that_cannot_happen_cancels_the_batch(tracker, players):
+    a, b, c = players
+    before = snapshot(tracker)
+    with pytest.raises(RuleError, match="B does not have enough money"):
+        with tracker.batch() as batch:
+            batch.transfer(a, b, 100)
+            batch.transfer(b, c, 1700)
+    assert snapshot(tracker) == before
+
+
+def test_properties_can_change_hands_twice(tracker, players):
+    a, b, c = players
+    prop = tracker.properties[0]
+    tracker.purchase_property(a, prop)
+    with tracker.batch() as batch:
+        batch.sell_property(a, b, prop, 500)
+        batch.give_property(b, c, prop)
+        batch.transfer(c, b, 200)
+    assert prop.owner is c and c.properties == [prop] and not a.properties and not b.properties
+    assert (a.money, b.money, c.money) == (1500 - prop.price + 500, 1500 - 500 + 200, 1300)
+
+
+def test_only_the_owner_can_sell(tracker, players):
+    a, b, c = players
+    prop = tracker.properties[0]
+    tracker.purchase_property(a, prop)
+    before = snapshot(tracker)
+    with pytest.raises(RuleError, match="B does not own"):
+        with tracker.batch() as batch:
+            batch.sell_property(a, c, prop, 100)
+            batch.give_property(b, a, prop)
+    assert snapshot(tracker) == before
+
+
+def test_amounts_must_be_positive(tracker, players):
+    a, b, _ = players
+    batch = tracker.batch()
+    for add in (lambda: batch.transfer(a, b, 0), lambda: batch.pay_bank(a, -5),
+                lambda: batch.from_bank(a, 0), lambda: batch.sell_property(a, b, tracker.properties[0], 0)):
+        with pytest.raises(RuleError, match="must be positive"):
+            add()
+    assert len(batch) == 0
+
+
+def test_an_exception_in_the_block_discards_the_batch(tracker, players):
+    a, b, _ = players
+    before = snapshot(tracker)
+    with pytest.raises(KeyError):
+        with tracker.batch() as batch:
+            batch.transfer(a, b, 10)
+            raise KeyError("oops")
+    assert snapshot(tracker) == before
+
+
+def test_amounts_must_fit_the_log(tracker, players):
+    a, b, _ = players
+    batch = tracker.batch()
+    with pytest.raises(RuleError, match="whole number"):
+        batch.transfer(a, b, 1.5)
+    with pytest.raises(RuleError, match="out of range"):
+        batch.from_bank(a, 2 ** 31)
+    before = snapshot(tracker)
+    with pytest.raises(RuleError, match="A's balance would be out of range"):
+        with tracker.batch() as batch:
+            batch.from_bank(a, 2 ** 31 - 1)
+    assert snapshot(tracker) == before
@@ -0,0 +1,56 @@
+from core.changes import ChangeSet
+
+
+def test_empty_change_set_is_false():
+    changes = ChangeSet()
+    assert not changes
+    changes.mark_log(5)
+    changes.mark_log(3)
+    changes.mark_log(9)
+    assert changes
+    assert changes.log_start == 3
+
+
+def test_take_changes_starts_a_new_set(tracker, players):
+    tracker.take_changes()
+    a, b, _ = players
+    tracker.transfer(a, b, 100)
+    changes = tracker.take_changes()
+
+    assert changes.players == {"A", "B"}
+    assert changes.log_start == len(tracker.transaction_log) - 2
+    assert not changes.roster
+    assert not tracker.take_changes()
+
+
+def test_ownership_and_roster_changes_are_marked(tracker, players):
+    changes = tracker.take_changes()
+    assert changes.roster  # The players were added
+
+    tracker.purchase_property(players[0], tracker.properties[2])
+    changes = tracker.take_changes()
+    assert changes.properties == {tracker.properties[2].name}
+    assert changes.players == {"A"}
+
+
+def test_loans_and_moves_are_marked(tracker, players):
+    a, b, _ = players
+    tracker.take_changes()
+    tracker.lend(a, b, 100)
+    assert tracker.take_changes().loans == {"B"}
+
+    b.position = 12
+    tracker.mark_player_changed(b)
+    changes = tracker.take_changes()
+    assert changes.players == {"B"}
+    assert changes.log_start is None
+
+
+def test_load_marks_everything(tracker, players):
+    tracker.save_game()
+    tracker.take_changes()
+    tracker.load_game()
+    changes = tracker.take_changes()
+
+    assert changes.roster
+    assert changes.log_start == 0
@@ -0,0 +1,81 @@
+import pytest
+
+from core import events
+from core.transaction_log import NO_PROPERTY, TransactionLog
+
+PINK_VAUGIRARD, LIGHT_BLUE_VAUGIRARD = 15, 19
+
+
+def table_of(tracker):
+    # The live tracker in events' state layout
+    return {"players": [p.name for p in tracker.players],
+            "money": {p.name: p.money for p in tracker.players},
+            "in_jail": {p.name: p.in_jail for p in tracker.players},
+            "owners": [prop.owner.name if prop.owner else None for prop in tracker.properties],
+            "houses": [prop.houses for prop in tracker.properties],
+            "mortgaged": [prop.mortgaged for prop in tracker.properties]}
+
+
+@pytest.fixture
+def game(tracker, players):
+    a, b, c = players
+    for player in players:
+        tracker.log_transaction(player, 0, "Player created")
+    a.money = 5000
+    tracker.log_transaction(a, 3500, "Manual adjustment", "adjustment")
+    for i in (0, 1):
+        tracker.purchase_property(a, tracker.properties[i])
+    tracker.build_house(a, tracker.properties[0])
+    tracker.build_house(a, tracker.properties[0])
+    tracker.sell_house(a, tracker.properties[0])
+    tracker.purchase_property(b, tracker.properties[PINK_VAUGIRARD])
+    tracker.purchase_property(c, tracker.properties[LIGHT_BLUE_VAUGIRARD])
+    tracker.sell_property(b, c, tracker.properties[PINK_VAUGIRARD], 90)
+    tracker.mortgage(c, tracker.properties[LIGHT_BLUE_VAUGIRARD])
+    tracker.set_jail(b, True)
+    tracker.charge_rent(b, tracker.properties[1])
+    return tracker
+
+
+def test_replay_rebuilds_the_table(game):
+    state = game.state_at(len(game.transaction_log))
+    expected = table_of(game)
+    assert {key: state[key] for key in expected} == expected
+
+
+def test_state_at_seeks_to_any_entry(game):
+    log = game.transaction_log
+    purchase = next(i for i in range(len(log)) if log.event(i)["kind"] == "purchase")
+
+    before, after = game.state_at(purchase), game.state_at(purchase + 1)
+    assert before["owners"][0] is None and after["owners"][0] == "A"
+    assert after["money"]["A"] == log.balances[purchase]
+    assert game.state_at(0) == events.initial_state(len(game.properties))
+    with pytest.raises(IndexError):
+        game.state_at(len(log) + 1)
+
+
+def test_checkpoints_give_the_same_states(game):
+    log = game.transaction_log
+    timeline = events.Timeline(log, len(game.properties), interval=4)
+    for index in range(len(log) + 1):
+        assert timeline.state_at(index) == events.replay(events.initial_state(len(game.properties)), log, index)
+    assert len(timeline.checkpoints) == len(log) // 4 + 1
+
+
+def test_timeline_extends_as_the_log_grows(game):
+    game.state_at(len(game.transaction_log))
+    game.transfer(game.players[0], game.players[1], 10)
+    assert game.state_at(len(game.transaction_log))["money"]["B"] == game.players[1].money
+
+
+def test_resolve_properties_picks_the_property_ownership_allows(game):
+    log = game.transaction_log
+    untyped = TransactionLog(list(log))  # Rows only: the property has to come from the reason text
+    assert set(untyped.property_ids) == {NO_PROPERTY}
+    events.resolve_properties(untyped, game.properties)
+
+    assert list(untyped.property_ids) == list(log.property_ids)
+    state = events.replay(events.initial_state(len(game.properties)), untyped, len(untyped))
+    assert state["owners"][PINK_VAUGIRARD] == "C"
+    assert state["mortgaged"][LIGHT_BLUE_VAUGIRARD]
@@ -0,0 +1,110 @@
+import csv
+import gzip
+import io
+import os
+import threading
+
+import pytest
+
+from core.export import FIELDS, ExportJob, export_log, read_columns
+from core.transaction_log import TransactionLog
+
+START = 1_700_000_000
+
+
+@pytest.fixture
+def log():
+    log = TransactionLog()
+    for i in range(50):
+        player = ("A", 'B "the banker"', "C, junior")[i % 3]
+        if i % 5 == 0:
+            log.record("Bank", 60, "Created Rue de la Paix", timestamp=START + i * 37, property_id=0)
+        elif i % 2:
+            log.record(player, -10 - i, "Paid rent for Rue de la Paix", 1500 - i, START + i * 37,
+                       property_id=0)
+        else:
+            log.record(player, 5 * i, "Transferred from A", 1500 + i, START + i * 37)
+    return log
+
+
+def csv_of(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+    return buffer.getvalue().encode("utf-8")
+
+
+def test_csv_matches_the_csv_module(log, tmp_path):
+    path = str(tmp_path / "log.csv")
+    assert export_log(log, path, chunk_size=7) == len(log)
+    with open(path, "rb") as f:
+        assert f.read() == csv_of(log)
+    assert not os.path.exists(path + ".part")
+
+
+def test_filters_combine(log, tmp_path):
+    path = str(tmp_path / "rent.csv.gz")
+    since = START + 10 * 37
+    count = export_log(log, path, compress=True, player="A", reason_type="rent_paid", property_ids=[0],
+                       since=since, chunk_size=8)
+    expected = [row for i, row in enumerate(log) if row["player"] == "A"
+                and log.event(i)["kind"] == "rent_paid" and log.timestamps[i] >= since]
+    assert count == len(expected) > 0
+    with gzip.open(path, "rb") as f:
+        assert f.read() == csv_of(expected)
+
+    assert export_log(log, path, player="Nobody") == 0
+    assert export_log(log, path, until=START - 1) == 0
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_columns_round_trip(log, tmp_path, compress):
+    path = str(tmp_path / "log.cols")
+    assert export_log(log, path, format="columns", compress=compress, chunk_size=16, stop=40) == 40
+    loaded = read_columns(path)
+    assert list(loaded) == list(log)[:40]
+    assert [loaded.event(i) for i in range(40)] == [log.event(i) for i in range(40)]
+
+
+def test_bad_arguments(log, tmp_path):
+    with pytest.raises(ValueError, match="Unknown export format"):
+        export_log(log, str(tmp_path / "log.xml"), format="xml")
+    path = tmp_path / "junk.cols"
+    path.write_bytes(b"NOPE\x01\x00")
+    with pytest.raises(ValueError, match="Not a columnar"):
+        read_columns(str(path))
+
+
+def test_cancel_leaves_no_file(log, tmp_path):
+    path = str(tmp_path / "log.csv")
+    cancel = threading.Event()
+    assert export_log(log, path, chunk_size=10, progress=lambda scanned, total: cancel.set(),
+                      cancel=cancel) is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_failed_export_removes_the_partial_file(log, tmp_path):
+    def fail(scanned, total):
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        export_log(log, str(tmp_path / "log.csv"), progress=fail)
+    assert os.listdir(tmp_path) == []
+
+
+def test_job_exports_the_entries_logged_before_it_started(log, tmp_path):
+    path = str(tmp_path / "log.csv")
+    job = ExportJob(log, path, chunk_size=4)
+    log.record("A", 1, "Manual adjustment")
+    assert job.wait(timeout=5) and job.done
+    assert job.error is None and not job.cancelled
+    assert job.written == job.total == 50 and job.progress == 1.0
+
+
+def test_job_keeps_the_error(log, tmp_path):
+    job = ExportJob(log, str(tmp_path / "missing" / "log.csv"))
+    job.wait(timeout=5)
+    assert isinstance(job.error, FileNotFoundError) and job.written is None
+    assert job.error.__context__ is None  # The open failed, not the cleanup
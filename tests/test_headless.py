@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from core.errors import LoadError, RuleError, SaveNotFoundError, TrackerError
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def test_engine_import_skips_tkinter_and_numpy():
+    code = ("import sys, core.game_engine; "
+            "print(sorted(m for m in ('tkinter', 'numpy') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_rule_violations_raise_rule_error(tracker, players):
+    a, b, _ = players
+    prop = tracker.properties[0]
+    tracker.purchase_property(a, prop)
+
+    with pytest.raises(RuleError, match="already owned"):
+        tracker.purchase_property(b, prop)
+    with pytest.raises(RuleError):
+        tracker.transfer(a, b, 0)
+    with pytest.raises(RuleError, match="Not enough money"):
+        tracker.transfer(b, a, 10_000)
+    with pytest.raises(RuleError, match="does not own"):
+        tracker.sell_property(b, a, prop, 100)
+    assert issubclass(RuleError, TrackerError)
+
+
+def test_missing_save_raises_save_not_found(tracker):
+    with pytest.raises(SaveNotFoundError):
+        tracker.load_game()
+
+
+def test_corrupt_save_raises_load_error(tracker, save_file):
+    with open(save_file, "w", encoding="utf-8") as f:
+        f.write("{not json")
+    with pytest.raises(LoadError):
+        tracker.load_game()
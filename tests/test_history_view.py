@@ -0,0 +1,115 @@
+import pytest
+
+pytest.importorskip("tkinter")
+
+from gui import history_view
+from core.transaction_log import TransactionLog
+
+
+class FakeTree:
+    # Just enough of ttk.Treeview to run the view without a display
+    def __init__(self, parent, **options):
+        self.rows = []  # iids in display order
+        self.values = {}
+        self.writes = 0
+
+    def heading(self, col, text):
+        pass
+
+    def pack(self, **options):
+        pass
+
+    def bind(self, event, callback):
+        pass
+
+    def insert(self, parent, index, values):
+        iid = f"I{len(self.rows)}"
+        self.rows.append(iid)
+        self.values[iid] = values
+        return iid
+
+    def item(self, iid, values):
+        self.values[iid] = values
+        self.writes += 1
+
+    def move(self, iid, parent, index):
+        self.rows.remove(iid)
+        self.rows.insert(index, iid)
+
+    def shown(self):
+        return [self.values[iid][2] for iid in self.rows]
+
+
+class FakeScrollbar:
+    def __init__(self, parent, **options):
+        self.position = None
+
+    def pack(self, **options):
+        pass
+
+    def set(self, first, last):
+        self.position = (first, last)
+
+
+@pytest.fixture
+def log():
+    log = TransactionLog()
+    for i in range(20):
+        log.record("A", i, "Manual adjustment", 1500 + i, 1_700_000_000)
+    return log
+
+
+@pytest.fixture
+def view(monkeypatch, log):
+    monkeypatch.setattr(history_view.ttk, "Treeview", FakeTree)
+    monkeypatch.setattr(history_view.ttk, "Scrollbar", FakeScrollbar)
+    view = history_view.TransactionHistoryView(None, lambda: log, pool_size=5)
+    view.refresh()
+    return view
+
+
+def test_shows_newest_entries_first(view):
+    assert view.tree.shown() == ["$+19", "$+18", "$+17", "$+16", "$+15"]
+    assert view.scrollbar.position == (0, 5 / 20)
+
+
+def test_append_writes_only_new_rows(view, log):
+    writes = view.tree.writes
+    log.record("A", 20, "Manual adjustment", 1520, 1_700_000_000)
+    log.record("A", 21, "Manual adjustment", 1521, 1_700_000_000)
+    view.refresh()
+
+    assert view.tree.writes - writes == 2
+    assert view.tree.shown() == ["$+21", "$+20", "$+19", "$+18", "$+17"]
+
+
+def test_scrolled_rows_stay_put_when_entries_arrive(view, log):
+    view.scroll_by(3)
+    shown = view.tree.shown()
+    log.record("A", 20, "Manual adjustment", 1520, 1_700_000_000)
+    view.refresh()
+
+    assert view.tree.shown() == shown
+    assert view.offset == 4
+
+
+def test_scrolling_is_clamped_to_the_log(view):
+    view.scroll_to(100)
+    assert view.offset == 15
+    assert view.tree.shown() == ["$+4", "$+3", "$+2", "$+1", "$+0"]
+    view.on_scroll("moveto", "0.5")
+    assert view.offset == 10
+    view.scroll_by(-50)
+    assert view.offset == 0
+
+
+def test_replaced_log_is_rendered_from_the_top(view):
+    replacement = TransactionLog()
+    replacement.record("B", 7, "Manual adjustment", 1507, 1_700_000_000)
+    view.scroll_by(2)
+    view.get_log = lambda: replacement
+    view.refresh()
+
+    assert view.offset == 0
+    assert view.tree.shown()[0] == "$+7"
+    assert view.scrollbar.position == (0, 1)
@@ -0,0 +1,129 @@
+import pytest
+
+from core.errors import LoadError
+from core.export import export_log
+from core.game_engine import MonopolyTracker
+from core.importer import balance_gaps, merge_logs, read_csv
+from core.transaction_log import NO_BALANCE, TransactionLog
+
+START = 1_700_000_000
+
+
+@pytest.fixture
+def game(tracker, players):
+    a, b, c = players
+    tracker.purchase_property(a, tracker.properties[0])
+    tracker.purchase_property(b, tracker.properties[2])
+    tracker.mortgage(b, tracker.properties[2])
+    tracker.charge_rent(c, tracker.properties[0])
+    tracker.transfer(c, b, 25)
+    tracker.set_jail(c, True)
+    return tracker
+
+
+def exported(log, path, **options):
+    export_log(log, str(path), **options)
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_bytes", [64, 1 << 20])
+def test_exports_read_back(game, tmp_path, chunk_bytes):
+    log = game.transaction_log
+    loaded = read_csv(exported(log, tmp_path / "log.csv"), chunk_bytes=chunk_bytes)
+    assert list(loaded) == list(log)
+    assert list(loaded.kinds) == list(log.kinds)
+
+
+def test_quoted_fields_are_unescaped(tmp_path):
+    log = TransactionLog()
+    log.record('B "the banker"', 10, "Note, with a comma", 1510, START)
+    log.record("A", -5, "Two\nlines", None, START + 61)
+    log.record("A", 7, "Plain", 1502, START + 62)
+    loaded = read_csv(exported(log, tmp_path / "log.csv"), chunk_bytes=8)
+    assert list(loaded) == list(log)
+
+
+def test_malformed_files_are_refused(tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_text("")
+    with pytest.raises(ValueError, match="is empty"):
+        read_csv(str(path))
+    path.write_text("when,who\n")
+    with pytest.raises(ValueError, match="not a transaction export"):
+        read_csv(str(path))
+    header = "timestamp,player,amount,new_balance,reason\n"
+    path.write_text(header + '2024-01-01 10:00:00,A,5,1505,"Quoted"\n2024-01-01 10:00:01,A,5\n')
+    with pytest.raises(ValueError, match="line 3: expected 5 fields"):
+        read_csv(str(path))
+    path.write_text(header + "2024-01-01 10:00:00,A,five,1505,Oops\n")
+    with pytest.raises(ValueError, match="lines 2-2"):
+        read_csv(str(path))
+    path.write_text(header + "2024-01-01 10:00:00,A,99999999999,1505,Oops\n")
+    with pytest.raises(ValueError, match="out of range"):
+        read_csv(str(path))
+
+
+def test_numbers_are_checked_digit_by_digit(tmp_path):
+    path = tmp_path / "lf.csv"
+    header = "timestamp,player,amount,new_balance,reason\n"
+    path.write_bytes((header + "2024-01-01 10:00:00,A,-2147483648,,Low\n"
+                      "2024-01-01 10:00:01,B,+7, 1507,Lenient like int()\n"
+                      "2024-01-01 10:00:02,A,0,-5,Low\n").encode())
+    loaded = read_csv(str(path))
+    assert list(loaded.amounts) == [-2 ** 31, 7, 0]
+    assert list(loaded.balances) == [NO_BALANCE, 1507, -5]
+    assert [loaded.player_names[i] for i in loaded.player_ids] == ["A", "B", "A"]
+    assert [loaded.reasons[i] for i in loaded.reason_ids] == ["Low", "Lenient like int()", "Low"]
+    for amount in ("-", "1-2", "", "0x10"):
+        path.write_text(header + f"2024-01-01 10:00:00,A,{amount},1505,Oops\n")
+        with pytest.raises(ValueError, match="invalid literal"):
+            read_csv(str(path))
+
+
+def test_overlapping_exports_merge_without_duplicates(tmp_path):
+    log = TransactionLog()
+    for i in range(12):
+        log.record("AB"[i % 2], 10, "Same reason", 1500 + 10 * (i // 2 + 1), START + i // 3)
+    first = read_csv(exported(log, tmp_path / "first.csv", stop=8))
+    second = read_csv(exported(log, tmp_path / "second.csv", since=START + 2))
+    merged = merge_logs([second, first])
+    assert list(merged) == list(log)
+    assert merge_logs([first]) is first
+
+
+def test_repeated_rows_are_kept_as_often_as_one_file_has_them():
+    log = TransactionLog()
+    for _ in range(3):
+        log.record("A", 0, "Passed Go?", 1500, START)
+    other = TransactionLog()
+    other.record("A", 0, "Passed Go?", 1500, START)
+    assert len(merge_logs([log, other])) == 3
+
+
+def test_balance_gaps():
+    log = TransactionLog()
+    log.record("A", -100, "Purchased Rue de la Paix", 1400, START)
+    log.record("Bank", 100, "Sold Rue de la Paix", None, START)
+    log.record("B", 50, "Manual adjustment", 1600, START)
+    log.record("A", 20, "Manual adjustment", 1400, START)
+    assert balance_gaps(log) == [(2, "B", 1550, 1600), (3, "A", 1420, 1400)]
+    assert balance_gaps(TransactionLog()) == []
+
+
+def test_rebuild_replays_the_exported_game(game, tmp_path):
+    path = exported(game.transaction_log, tmp_path / "game.csv")
+    rebuilt = MonopolyTracker(save_file=str(tmp_path / "rebuilt.json"))
+    assert rebuilt.rebuild_from_csv(path) == []
+
+    assert [(p.name, p.money, p.in_jail) for p in rebuilt.players] == \
+        [(p.name, p.money, p.in_jail) for p in game.players]
+    assert [(prop.owner.name if prop.owner else None, prop.mortgaged) for prop in rebuilt.properties] == \
+        [(prop.owner.name if prop.owner else None, prop.mortgaged) for prop in game.properties]
+    assert list(rebuilt.transaction_log.property_ids) == list(game.transaction_log.property_ids)
+
+
+def test_rebuild_failures_become_load_errors(tracker, tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_text("nothing,useful\n")
+    with pytest.raises(LoadError, match="not a transaction export"):
+        tracker.rebuild_from_csv(str(path))
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from core import instrumentation
+from core.game_engine import MonopolyTracker
+from core.instrumentation import Histogram, timed
+
+
+class Probe:
+    @timed("probe.call", size=lambda probe, result: len(result))
+    def call(self, text, fail=False):
+        if fail:
+            raise ValueError(text)
+        return text
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    instrumentation.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_histogram_buckets_are_powers_of_two():
+    histogram = Histogram()
+    for value in (0, 1, 3, 3, 100, 5000):
+        histogram.add(value)
+    summary = histogram.to_dict()
+    assert (summary["count"], summary["total"], summary["min"], summary["max"]) == (6, 5107, 0, 5000)
+    assert summary["buckets"] == {"<1": 1, "<2": 1, "<4": 2, "<128": 1, "<8192": 1}
+    assert (summary["p50"], summary["p95"], summary["p99"]) == (4, 5000, 5000)
+    assert Histogram().to_dict()["mean"] is None
+
+
+def test_marked_methods_are_plain_until_enabled():
+    plain = MonopolyTracker.charge_rent
+    assert Probe.call.__name__ == "call" and not hasattr(Probe.call, "__wrapped__")
+    Probe().call("abc")
+    assert instrumentation.snapshot()["metrics"] == {}
+
+    instrumentation.enable()
+    instrumentation.enable()  # Wraps once
+    assert Probe.call.__wrapped__.__name__ == "call" and not hasattr(Probe.call.__wrapped__, "__wrapped__")
+    assert MonopolyTracker.charge_rent is not plain
+    instrumentation.disable()
+    assert MonopolyTracker.charge_rent is plain and not hasattr(Probe.call, "__wrapped__")
+
+
+def test_calls_and_sizes_are_recorded():
+    instrumentation.enable()
+    probe = Probe()
+    assert probe.call("abcd") == "abcd"
+    with pytest.raises(ValueError):
+        probe.call("oops", fail=True)  # Timed, but no result to size
+    metrics = instrumentation.snapshot()["metrics"]
+    assert metrics["probe.call"]["count"] == 2
+    assert metrics["probe.call.size"]["count"] == 1 and metrics["probe.call.size"]["max"] == 4
+
+
+def test_engine_hot_paths_are_timed(tracker, players):
+    instrumentation.enable()
+    a, b, _ = players
+    tracker.purchase_property(a, tracker.properties[0])
+    tracker.charge_rent(b, tracker.properties[0])
+    metrics = instrumentation.snapshot()["metrics"]
+    assert metrics["charge_rent"]["count"] == 1
+    assert metrics["log_transaction"]["count"] == 3
+
+
+def test_counters_only_count_while_enabled():
+    instrumentation.count("shortcut save")
+    instrumentation.enable()
+    instrumentation.count("shortcut save")
+    instrumentation.count("shortcut save", 2)
+    assert instrumentation.snapshot()["counters"] == {"shortcut save": 3}
+
+
+def test_capture_and_export(tmp_path):
+    assert instrumentation.stop_capture() is None
+    instrumentation.start_capture()
+    assert instrumentation.capturing() and instrumentation.enabled
+    Probe().call("x" * 10)
+    profile = str(tmp_path / "run.prof")
+    summary = instrumentation.stop_capture(profile)
+    assert not instrumentation.capturing()
+    assert summary["profile"] == profile and summary["functions"] and summary["memory"]["peak"] > 0
+
+    path = str(tmp_path / "perf.json")
+    instrumentation.export(path)
+    with open(path, encoding="utf-8") as f:
+        exported = json.load(f)
+    assert exported["metrics"]["probe.call"]["count"] == 1
+    assert exported["last_capture"]["profile"] == profile
@@ -0,0 +1,101 @@
+import os
+
+from core.game_engine import MonopolyTracker
+from core.journal import TransactionJournal
+from core.player import Player
+
+PINK_VAUGIRARD, LIGHT_BLUE_VAUGIRARD = 15, 19  # Catalog indexes of the two Rue de Vaugirard
+
+
+def journaled_game(save_file):
+    tracker = MonopolyTracker(journaled=True, save_file=save_file)
+    for name in ("A", "B"):
+        tracker.add_player(Player(name))
+    tracker.save_game()  # First save writes the snapshot the journal continues
+    return tracker
+
+
+def reload(save_file):
+    tracker = MonopolyTracker(journaled=True, save_file=save_file)
+    tracker.load_game()
+    return tracker
+
+
+def test_save_appends_to_journal_without_rewriting_snapshot(save_file):
+    tracker = journaled_game(save_file)
+    snapshot_mtime = os.stat(save_file).st_mtime_ns
+    a, b = tracker.players
+    tracker.transfer(a, b, 200)
+    tracker.adjust_money(a, -50)
+    tracker.save_game()
+
+    assert os.stat(save_file).st_mtime_ns == snapshot_mtime
+    assert len(tracker.journal.read()) == 3  # Two transfer legs and the adjustment
+    loaded = reload(save_file)
+    assert [(p.name, p.money) for p in loaded.players] == [("A", 1250), ("B", 1700)]
+    assert len(loaded.transaction_log) == len(tracker.transaction_log)
+    assert loaded.transaction_log[-1] == tracker.transaction_log[-1]
+
+
+def test_replay_continues_journal_after_reload(save_file):
+    tracker = journaled_game(save_file)
+    tracker.adjust_money(tracker.players[0], 10)
+    tracker.save_game()
+    loaded = reload(save_file)
+    loaded.adjust_money(loaded.players[0], 5)
+    loaded.save_game()
+
+    assert [record["seq"] for record in loaded.journal.read()] == [1, 2]
+    assert reload(save_file).players[0].money == 1515
+
+
+def test_snapshot_written_after_interval(save_file):
+    tracker = journaled_game(save_file)
+    tracker.snapshot_interval = 2
+    for _ in range(3):
+        tracker.adjust_money(tracker.players[0], 1)
+    tracker.save_game()
+
+    assert tracker.journal.read() == []
+    assert reload(save_file).players[0].money == 1503
+
+
+def test_replay_keeps_properties_with_the_same_name_apart(save_file):
+    tracker = journaled_game(save_file)
+    a = tracker.players[0]
+    pink = tracker.properties[PINK_VAUGIRARD]
+    tracker.purchase_property(a, pink)
+    tracker.mortgage(a, pink)
+    tracker.save_game()
+
+    loaded = reload(save_file)
+    assert loaded.properties[PINK_VAUGIRARD].owner is loaded.players[0]
+    assert loaded.properties[PINK_VAUGIRARD].mortgaged
+    assert loaded.properties[LIGHT_BLUE_VAUGIRARD].owner is None
+
+
+def test_replay_reads_records_that_name_properties(save_file):
+    tracker = journaled_game(save_file)
+    tracker.journal.append({"player": {"name": "A", "money": 1300, "properties": ["Rue de la Paix"],
+                                       "houses": {"Rue de la Paix": 2}, "mortgaged": [],
+                                       "position": 0, "in_jail": False}})
+    tracker.save_game()
+
+    prop = reload(save_file).properties[0]
+    assert (prop.name, prop.owner.name, prop.houses) == ("Rue de la Paix", "A", 2)
+
+
+def test_torn_record_is_cut_off(tmp_path):
+    path = str(tmp_path / "game.journal")
+    journal = TransactionJournal(path)
+    journal.reset(0)
+    journal.append({"a": 1})
+    journal.append({"a": 2})
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"a": 3, "se')
+    size = os.path.getsize(path)
+
+    assert [record["a"] for record in journal.read()] == [1, 2]
+    assert os.path.getsize(path) < size
+    assert [record["seq"] for record in journal.read(after_seq=1)] == [2]
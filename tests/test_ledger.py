@@ -0,0 +1,92 @@
+import os
+import sqlite3
+
+import pytest
+
+from core.game_engine import MonopolyTracker
+from core.ledger import SQLiteLedger
+
+
+@pytest.fixture
+def game(tracker, players):
+    a, b, c = players
+    tracker.attach_ledger()
+    tracker.purchase_property(a, tracker.properties[0])
+    tracker.purchase_property(b, tracker.properties[2])
+    tracker.charge_rent(b, tracker.properties[0])
+    tracker.charge_rent(c, tracker.properties[0])
+    tracker.transfer(c, a, 25)
+    tracker.lend(a, b, 40)
+    return tracker
+
+
+def reasons_of(rows):
+    return [row["reason"] for row in rows]
+
+
+def test_ledger_is_created_next_to_the_save(game, save_file):
+    assert game.ledger.path == os.path.splitext(save_file)[0] + ".db"
+    count, = sqlite3.connect(game.ledger.path).execute("SELECT COUNT(*) FROM transactions").fetchone()
+    assert count <= len(game.transaction_log)  # The rest is still buffered
+    game.ledger.flush()
+    count, = sqlite3.connect(game.ledger.path).execute("SELECT COUNT(*) FROM transactions").fetchone()
+    assert count == len(game.transaction_log)
+
+
+def test_queries_filter_by_player_reason_and_property(game):
+    assert reasons_of(game.query_transactions(player="A", reason_type="rent_received")) == [
+        "Received rent for Rue de la Paix"] * 2
+    assert reasons_of(game.query_transactions(property="Rue de la Paix")) == [
+        "Created Rue de la Paix", "Purchased Rue de la Paix",
+        "Paid rent for Rue de la Paix", "Received rent for Rue de la Paix",
+        "Paid rent for Rue de la Paix", "Received rent for Rue de la Paix"]
+    assert reasons_of(game.query_transactions(color_group="Green", reason_type="purchase")) == [
+        "Purchased Boulevard de la Villette"]
+    assert reasons_of(game.query_transactions(player="C", limit=1)) == ["Transferred to A"]
+
+
+def test_queries_match_the_in_memory_scan(game):
+    ledger = game.ledger
+    filters = [{"player": "B"}, {"reason_type": "purchase"}, {"property": "Rue de la Paix", "limit": 2},
+               {"color_group": "Dark Blue"}]
+    for kwargs in filters:
+        game.ledger = None
+        expected = game.query_transactions(**kwargs)
+        game.ledger = ledger
+        assert game.query_transactions(**kwargs) == expected
+
+
+def test_time_bounds_are_inclusive(game):
+    log = game.transaction_log
+    first, last = log.timestamps[0], log.timestamps[-1]
+    assert len(game.query_transactions(since=first, until=last)) == len(log)
+    assert game.query_transactions(since=last + 1) == []
+
+
+def test_game_loads_back_from_the_ledger(game, save_file):
+    game.save_game()
+    game.ledger.close()
+    loaded = MonopolyTracker(save_file=save_file)
+    loaded.load_ledger()
+
+    assert [(p.name, p.money) for p in loaded.players] == [(p.name, p.money) for p in game.players]
+    assert loaded.properties[0].owner.name == "A"
+    assert list(loaded.transaction_log) == list(game.transaction_log)
+    assert loaded.loans.to_dict() == game.loans.to_dict()
+    loaded.ledger.close()
+
+
+def test_sync_appends_the_missing_tail_or_rewrites(game, tmp_path):
+    game.ledger.flush()
+    log = game.transaction_log
+    path = str(tmp_path / "copy.db")
+    copy = SQLiteLedger(path)
+    copy.add_log(log, 0)
+    game.adjust_money(game.players[0], 5)
+    copy.sync(game.players, game.properties, log, game.loans)
+    assert copy.query() == list(log)
+
+    other = MonopolyTracker(save_file=str(tmp_path / "other.json"))
+    copy.sync(other.players, other.properties, other.transaction_log)
+    assert copy.query() == list(other.transaction_log)
+    copy.close()
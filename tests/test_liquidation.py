@@ -0,0 +1,111 @@
+import itertools
+
+import pytest
+
+from core import analytics
+from core.board import HOUSE_COSTS
+from core.errors import RuleError
+from core.liquidation import _group_options, _holdings, liquidation_plan, mortgage_value, unmortgage_cost
+
+
+@pytest.fixture(autouse=True)
+def landing(monkeypatch):
+    # A fixed, uneven landing distribution instead of the cached Markov solution
+    monkeypatch.setattr(analytics, "landing_per_turn", lambda properties: [
+        0.01 + 0.003 * (i % 7) for i in range(len(properties))])
+
+
+@pytest.fixture
+def owner(tracker, players):
+    a = players[0]
+    tracker.adjust_money(a, 10000)
+    for i in (0, 1, 2, 3, 4, 21, 22):
+        tracker.purchase_property(a, tracker.properties[i])
+    for i, houses in ((0, 3), (1, 2), (2, 1), (3, 1), (4, 2)):
+        for _ in range(houses):
+            tracker.build_house(a, tracker.properties[i])
+    a.money = 0
+    return a
+
+
+def best_by_search(player, debt, tracker):
+    # Least lost rent over every combination of the groups' options
+    groups = _holdings(player, tracker.rent_engine, tracker.properties)
+    options = [_group_options(tuple(item for _, item in props)) for props in groups]
+    return min((sum(option[1] for option in combo) for combo in itertools.product(*options)
+                if sum(option[0] for option in combo) >= debt), default=None)
+
+
+def test_mortgage_prices():
+    class Prop:
+        price = 350
+
+    assert mortgage_value(Prop) == 175
+    assert unmortgage_cost(Prop) == 192
+
+
+def test_nothing_to_raise(tracker, owner):
+    owner.money = 500
+    plan = liquidation_plan(owner, 400, tracker.rent_engine, tracker.properties)
+    assert plan == {"covered": True, "cash": 0, "lost_rent": 0.0, "house_sales": [], "mortgages": []}
+
+
+@pytest.mark.parametrize("debt", [1, 99, 100, 250, 640, 1000, 1500, 1900])
+def test_plan_is_the_cheapest_that_covers_the_debt(tracker, owner, debt):
+    plan = liquidation_plan(owner, debt, tracker.rent_engine, tracker.properties)
+    assert plan["covered"] and plan["cash"] >= debt
+    assert plan["lost_rent"] == pytest.approx(best_by_search(owner, debt, tracker))
+    refunds = sum(HOUSE_COSTS[prop.color_group] // 2 * count for prop, count in plan["house_sales"])
+    assert plan["cash"] == refunds + sum(mortgage_value(prop) for prop in plan["mortgages"])
+    sold = dict(plan["house_sales"])
+    for prop in plan["mortgages"]:
+        group = [other for other in owner.properties if other.color_group == prop.color_group]
+        assert all(sold.get(other, 0) == other.houses for other in group)
+
+
+def test_options_are_pareto_pruned(tracker, owner):
+    for props in _holdings(owner, tracker.rent_engine, tracker.properties):
+        options = _group_options(tuple(item for _, item in props))
+        assert options[0][:2] == (0, 0)
+        assert all(a[0] < b[0] and a[1] < b[1] for a, b in zip(options, options[1:]))
+
+
+def test_too_much_debt_sells_every_building(tracker, owner):
+    plan = liquidation_plan(owner, 100000, tracker.rent_engine, tracker.properties)
+    assert not plan["covered"] and plan["mortgages"] == []
+    assert dict(plan["house_sales"]) == {prop: prop.houses for prop in owner.properties if prop.houses}
+
+
+def test_rent_is_paid_after_raising_money(tracker, players, owner):
+    payer, creditor = owner, players[1]
+    tracker.purchase_property(creditor, tracker.properties[23])
+    rent = tracker.rent_engine.rent_for(tracker.properties[23])
+    payer.money = 10
+    plan = tracker.charge_rent(payer, tracker.properties[23])
+    assert plan["covered"]
+    assert payer.money == 10 + plan["cash"] - rent
+    assert all(prop.mortgaged for prop in plan["mortgages"])
+
+
+def test_uncovered_debt_is_bankruptcy(tracker, players, owner):
+    creditor = players[1]
+    tracker.handle_bankruptcy(owner, creditor, 100000)
+    assert owner.properties == [] and owner.money == 0
+    assert all(prop.owner is creditor and prop.houses == 0 for prop in tracker.properties[:5])
+    assert creditor.money == 1500 + sum(HOUSE_COSTS[tracker.properties[i].color_group] // 2 * houses
+                                        for i, houses in ((0, 3), (1, 2), (2, 1), (3, 1), (4, 2)))
+
+
+def test_mortgage_rules(tracker, players, owner):
+    with pytest.raises(RuleError, match="Sell the buildings"):
+        tracker.mortgage(owner, tracker.properties[0])
+    with pytest.raises(RuleError, match="does not own"):
+        tracker.mortgage(players[1], tracker.properties[21])
+    tracker.mortgage(owner, tracker.properties[21])
+    with pytest.raises(RuleError, match="already mortgaged"):
+        tracker.mortgage(owner, tracker.properties[21])
+    with pytest.raises(RuleError, match="Not enough money"):
+        tracker.unmortgage(owner, tracker.properties[21])
+    owner.money = 1000
+    tracker.unmortgage(owner, tracker.properties[21])
+    assert owner.money == 1000 - unmortgage_cost(tracker.properties[21])
@@ -0,0 +1,82 @@
+import pytest
+
+from core.errors import RuleError
+from core.loans import BANK_LOAN_LIMIT, LoanBook
+
+
+@pytest.fixture
+def book():
+    book = LoanBook()
+    book.add("A", "B", 300)
+    book.add("A", "C", 100)
+    book.add("A", "B", 50)
+    book.add("D", "B", 20)
+    return book
+
+
+def test_smallest_loan_overall_and_per_lender(book):
+    assert book.smallest("A") == 50
+    assert book.smallest("A", "C") == 100
+    assert book.smallest("A", "D") is None
+    assert book.loans_of("A") == [("B", 50), ("C", 100), ("B", 300)]
+
+
+def test_remove_takes_the_smallest_from_that_lender(book):
+    assert book.remove("A", "B") == 50
+    assert book.smallest("A") == 100
+    assert book.remove("A", "B") == 300
+    assert book.lenders_of("A") == ["C"]
+    with pytest.raises(RuleError, match="owes nothing to B"):
+        book.remove("A", "B")
+    book.remove("A", "C")
+    assert book.borrowers() == ["D"]
+
+
+def test_suggestions_last_as_long_as_the_money(book):
+    assert book.suggestions("A", 40) == []
+    assert book.suggestions("A", 160) == [("B", 50), ("C", 100)]
+    assert book.suggestions("A", 10_000) == [("B", 50), ("C", 100), ("B", 300)]
+
+
+def test_bank_loans_are_capped(book):
+    book.add_bank("A", BANK_LOAN_LIMIT - 10)
+    with pytest.raises(RuleError, match="exceeds"):
+        book.add_bank("A", 20)
+    with pytest.raises(RuleError):
+        book.add_bank("A", 0)
+    assert book.lenders_of("A")[-1] == "Bank"
+    assert book.remove("A", "Bank") == BANK_LOAN_LIMIT - 10
+
+
+def test_dict_round_trip(book):
+    book.add_bank("D", 100)
+    copy = LoanBook.from_dict(book.to_dict())
+    assert copy.to_dict() == book.to_dict()
+    assert not LoanBook.from_dict(None)
+
+
+def test_engine_moves_money_and_replays_from_the_log(tracker, players):
+    a, b, c = players
+    tracker.lend(b, a, 200)
+    tracker.lend(c, a, 100)
+    tracker.bank_loan(a, 150)
+    tracker.repay(a, c)
+    tracker.repay(a)
+
+    assert (a.money, b.money, c.money) == (1500 + 200, 1300, 1500)
+    assert tracker.loans.loans_of("A") == [("B", 200)]
+    assert "A" not in tracker.loans.bank
+    assert LoanBook.from_log(tracker.transaction_log).to_dict() == tracker.loans.to_dict()
+
+
+def test_engine_refuses_unaffordable_repayments(tracker, players):
+    a, b, _ = players
+    tracker.lend(b, a, 200)
+    a.money = 100
+    with pytest.raises(RuleError, match="Not enough money"):
+        tracker.repay(a, b)
+    with pytest.raises(RuleError, match="owes nothing"):
+        tracker.repay(b, a)
+    assert tracker.repayment_suggestions() == []
+    a.money = 500
+    assert tracker.repayment_suggestions(["A"]) == [("A", "B", 200)]
@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from gui import main_window
+
+PINK_VAUGIRARD, LIGHT_BLUE_VAUGIRARD = 15, 19
+
+
+class FakeWidget:
+    # Just enough of the Tk widgets the dialogs build to run them without a display
+    created = []
+
+    def __init__(self, parent=None, **options):
+        self.options = options
+        self.selected = -1
+        self.text = ""
+        FakeWidget.created.append(self)
+
+    def pack(self, **options):
+        pass
+
+    def title(self, text):
+        pass
+
+    def geometry(self, size):
+        pass
+
+    def destroy(self):
+        self.destroyed = True
+
+    def current(self, index=None):
+        if index is None:
+            return self.selected
+        self.selected = index
+
+    def get(self):
+        if "values" in self.options:
+            return self.options["values"][self.selected] if self.selected >= 0 else ""
+        return self.text
+
+
+@pytest.fixture
+def gui(monkeypatch, tracker, players):
+    FakeWidget.created = []
+    errors = []
+    for module, name in ((main_window.tk, "Toplevel"), (main_window.ttk, "Label"), (main_window.ttk, "Button"),
+                         (main_window.ttk, "Entry"), (main_window, "Combobox")):
+        monkeypatch.setattr(module, name, FakeWidget)
+    monkeypatch.setattr(main_window.messagebox, "showerror", lambda title, message: errors.append(message))
+    selected = players[0]
+    return SimpleNamespace(tracker=tracker, root=None, errors=errors, players=players,
+                           get_selected_player=lambda: selected, update_display=lambda: None,
+                           show_player_details=lambda: None, _show_liquidation=lambda *args: None)
+
+
+def widgets(kind):
+    return [widget for widget in FakeWidget.created if kind(widget)]
+
+
+def press(label):
+    button, = widgets(lambda widget: widget.options.get("text") == label)
+    button.options["command"]()
+
+
+def test_selling_picks_the_listed_property_not_its_namesake(gui):
+    seller, buyer, _ = gui.players
+    tracker = gui.tracker
+    tracker.purchase_property(seller, tracker.properties[PINK_VAUGIRARD])
+    tracker.purchase_property(seller, tracker.properties[LIGHT_BLUE_VAUGIRARD])
+    main_window.MonopolyGUI.sell_property(gui)
+
+    props, buyers = widgets(lambda widget: "values" in widget.options)
+    entry, = widgets(lambda widget: not widget.options)[1:]  # After the dialog itself
+    props.current(seller.properties.index(tracker.properties[LIGHT_BLUE_VAUGIRARD]))
+    entry.text = "70"
+    press("Sell")
+
+    assert gui.errors == []
+    assert tracker.properties[LIGHT_BLUE_VAUGIRARD].owner is buyer
+    assert tracker.properties[PINK_VAUGIRARD].owner is seller
+
+
+def test_rent_errors_are_shown_and_keep_the_dialog(gui):
+    payer, owner, _ = gui.players
+    tracker = gui.tracker
+    tracker.purchase_property(owner, tracker.properties[0])
+    owner.money = 2 ** 31 - 1  # The rent would overflow the owner's balance
+    main_window.MonopolyGUI.pay_rent(gui)
+    press("Pay Rent")
+
+    assert len(gui.errors) == 1 and "out of range" in gui.errors[0]
+    dialog = FakeWidget.created[0]
+    assert not getattr(dialog, "destroyed", False)
+    assert payer.money == 1500
+
+
+def test_money_errors_are_shown(gui, monkeypatch):
+    monkeypatch.setattr(main_window.simpledialog, "askinteger", lambda title, prompt: 2 ** 31)
+    main_window.MonopolyGUI.update_money(gui)
+    assert len(gui.errors) == 1 and "out of range" in gui.errors[0]
+    assert gui.players[0].money == 1500
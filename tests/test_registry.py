@@ -0,0 +1,64 @@
+import pytest
+
+from core.errors import RuleError
+
+PINK_VAUGIRARD, LIGHT_BLUE_VAUGIRARD = 15, 19  # Catalog indexes of the two Rue de Vaugirard
+
+
+def test_players_are_found_by_name(tracker, players):
+    assert tracker.get_player("B") is players[1]
+    assert tracker.has_player("a")  # Case-insensitive, like the GUI's duplicate check
+    assert not tracker.has_player("D")
+
+
+def test_available_and_owned_follow_purchases(tracker, players):
+    a, b, _ = players
+    first, second = tracker.properties[0], tracker.properties[5]
+    tracker.purchase_property(a, second)
+    tracker.purchase_property(b, first)
+
+    assert first not in tracker.available_properties()
+    assert tracker.owned_properties() == [first, second]  # Catalog order
+    assert tracker.owned_properties(exclude=a) == [first]
+    b.remove_property(first)
+    assert first in tracker.available_properties()
+    assert tracker.owned_properties() == [second]
+
+
+def test_properties_sharing_a_name_are_tracked_apart(tracker, players):
+    a, b, _ = players
+    pink, light_blue = tracker.properties[PINK_VAUGIRARD], tracker.properties[LIGHT_BLUE_VAUGIRARD]
+    assert pink.name == light_blue.name
+    tracker.purchase_property(a, pink)
+
+    assert light_blue in tracker.available_properties()
+    assert pink not in tracker.available_properties()
+    tracker.purchase_property(b, light_blue)
+    assert tracker.owned_properties(exclude=a) == [light_blue]
+    assert tracker.registry.index_of(pink) == PINK_VAUGIRARD
+
+
+def test_reset_resolves_owner_names(tracker, players):
+    prop = tracker.properties[0]
+    prop.owner = "A"
+    tracker.players[0].properties = [prop]
+    tracker.registry.reset(tracker.players, tracker.properties)
+
+    assert prop.owner is players[0]
+    assert tracker.owned_properties() == [prop]
+
+
+def test_batch_tracks_pending_owners_per_property(tracker, players):
+    a, b, c = players
+    pink, light_blue = tracker.properties[PINK_VAUGIRARD], tracker.properties[LIGHT_BLUE_VAUGIRARD]
+    tracker.purchase_property(a, pink)
+    tracker.purchase_property(a, light_blue)
+    with tracker.batch() as batch:
+        batch.sell_property(a, b, pink, 10)
+        batch.sell_property(a, c, light_blue, 10)
+
+    assert (pink.owner, light_blue.owner) == (b, c)
+    with pytest.raises(RuleError):
+        with tracker.batch() as batch:
+            batch.give_property(b, a, pink)
+            batch.give_property(b, a, pink)  # b no longer owns it after the first leg
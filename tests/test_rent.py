@@ -0,0 +1,120 @@
+import pytest
+
+from core.errors import RuleError
+from core.rent import HOTEL, RentEngine
+
+DARK_BLUE = (0, 1)
+PINK = (14, 15, 16)
+LIGHT_BLUE = (17, 18, 19, 20)
+RAILROADS = (21, 22, 23, 24)
+UTILITIES = (25, 26)
+
+
+@pytest.fixture
+def rich(tracker, players):
+    for player in players:
+        player.money = 100_000
+    return players
+
+
+def buy(tracker, player, indexes):
+    for i in indexes:
+        tracker.purchase_property(player, tracker.properties[i])
+
+
+def test_base_rent_doubles_with_a_monopoly(tracker, rich):
+    a, b, _ = rich
+    paix, champs = (tracker.properties[i] for i in DARK_BLUE)
+    buy(tracker, a, [0])
+    assert tracker.rent_engine.rent_for(paix) == 50
+    assert not tracker.rent_engine.has_monopoly(paix)
+
+    buy(tracker, a, [1])
+    assert tracker.rent_engine.rent_for(paix) == 100
+    a.remove_property(champs)
+    assert tracker.rent_engine.rent_for(paix) == 50
+
+
+def test_houses_and_hotels_follow_the_rent_table(tracker, rich):
+    a = rich[0]
+    buy(tracker, a, DARK_BLUE)
+    paix = tracker.properties[0]
+    for _ in range(HOTEL):
+        tracker.build_house(a, paix)
+
+    assert tracker.rent_engine.rent_for(paix) == 2000
+    with pytest.raises(RuleError, match="already has a hotel"):
+        tracker.build_house(a, paix)
+    tracker.sell_house(a, paix)
+    assert tracker.rent_engine.rent_for(paix) == 1700
+
+
+def test_building_needs_the_whole_group(tracker, rich):
+    a, b, _ = rich
+    buy(tracker, a, PINK[:2])
+    with pytest.raises(RuleError, match="whole Pink group"):
+        tracker.build_house(a, tracker.properties[PINK[0]])
+    buy(tracker, b, LIGHT_BLUE[:3])
+    with pytest.raises(RuleError):
+        tracker.build_house(b, tracker.properties[LIGHT_BLUE[0]])
+
+
+def test_same_named_properties_count_in_their_own_groups(tracker, rich):
+    a, b, _ = rich
+    buy(tracker, a, PINK)
+    buy(tracker, b, LIGHT_BLUE[:3])  # Includes the Light Blue Rue de Vaugirard
+
+    assert tracker.rent_engine.has_monopoly(tracker.properties[PINK[0]])
+    assert not tracker.rent_engine.has_monopoly(tracker.properties[LIGHT_BLUE[0]])
+    assert tracker.rent_engine.owned_in_group("B", "Light Blue") == 3
+
+
+def test_stations_and_utilities_scale_with_holdings(tracker, rich):
+    a = rich[0]
+    station, utility = tracker.properties[RAILROADS[0]], tracker.properties[UTILITIES[0]]
+    buy(tracker, a, RAILROADS[:3])
+    buy(tracker, a, UTILITIES[:1])
+    assert tracker.rent_engine.rent_for(station) == 100
+    assert tracker.rent_engine.rent_for(utility, dice_roll=8) == 32
+
+    buy(tracker, a, UTILITIES[1:])
+    assert tracker.rent_engine.rent_for(utility, dice_roll=8) == 80
+    assert tracker.rent_engine.rent_for(utility) == 70  # Average roll
+
+
+def test_mortgaged_and_unowned_charge_nothing(tracker, rich):
+    a = rich[0]
+    paix = tracker.properties[0]
+    assert tracker.rent_engine.rent_for(paix) == 0
+    buy(tracker, a, [0])
+    tracker.mortgage(a, paix)
+    assert tracker.rent_engine.rent_for(paix) == 0
+
+
+def test_batched_rents_match_single_lookups(tracker, rich):
+    pytest.importorskip("numpy")
+    a = rich[0]
+    buy(tracker, a, DARK_BLUE + RAILROADS[:2] + UTILITIES)
+    props = [tracker.properties[i] for i in (0, 1, 21, 25, 5)]
+    levels = [0, 3, 0, 0, 0]
+    rents = tracker.rent_engine.rents_for(props, levels).tolist()
+
+    assert rents == [100, 1100, 50, 70, 0]
+
+
+def test_charge_rent_moves_money_and_logs_both_sides(tracker, rich):
+    a, b, _ = rich
+    buy(tracker, a, [0])
+    tracker.charge_rent(b, tracker.properties[0])
+
+    assert (a.money, b.money) == (100_000 - 400 + 50, 100_000 - 50)
+    assert [row["reason"] for row in tracker.transaction_log[-2:]] == [
+        "Paid rent for Rue de la Paix", "Received rent for Rue de la Paix"]
+    assert tracker.charge_rent(a, tracker.properties[0]) is None  # Owners don't pay themselves
+
+
+def test_engine_built_from_owned_catalog(tracker, rich):
+    buy(tracker, rich[0], DARK_BLUE)
+    engine = RentEngine(tracker.properties)
+    assert engine.has_monopoly(tracker.properties[1])
+    assert engine.rent_levels(tracker.properties[1]) == [70, 175, 500, 1100, 1300, 1500]
@@ -0,0 +1,131 @@
+import json
+import threading
+import time
+
+import pytest
+
+from core.game_engine import MonopolyTracker
+from core.player import Player
+from core.replication import ReplicationFollower, ReplicationLog, ReplicationServer
+
+
+def game_of(tracker):
+    return ([(p.name, p.money, p.position, p.in_jail, [tracker.registry.index_of(prop) for prop in p.properties])
+             for p in tracker.players],
+            [(prop.owner.name if prop.owner else None, prop.houses, prop.mortgaged) for prop in tracker.properties],
+            list(tracker.transaction_log), tracker.loans.to_dict())
+
+
+def play(tracker, turn):
+    a, b, c = tracker.players
+    tracker.transfer(a, b, 10 + turn)
+    b.position = turn % 40
+    tracker.mark_player_changed(b)
+    if turn % 3 == 0:
+        tracker.lend(c, a, 5)
+    elif turn % 3 == 1:
+        tracker.repay(a, c)
+
+
+@pytest.fixture
+def leader(tmp_path):
+    tracker = MonopolyTracker(save_file=str(tmp_path / "leader.json"))
+    tracker.replication = ReplicationLog(tracker, snapshot_interval=5)
+    for name in ("A", "B", "C"):
+        tracker.add_player(Player(name))
+    server = ReplicationServer(tracker.replication, port=0)
+    server.start()
+    yield tracker, server.server_address[1]
+    server.close()
+
+
+@pytest.fixture
+def follow(tmp_path):
+    followers = []
+
+    def start(port):
+        tracker = MonopolyTracker(save_file=str(tmp_path / f"follower{len(followers)}.json"))
+        follower = ReplicationFollower(tracker, port=port, retry=0.05)
+        follower.start()
+        followers.append(follower)
+        return follower
+
+    yield start
+    for follower in followers:
+        follower.stop()
+
+
+def caught_up(follower, leader, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        follower.poll()
+        if follower.seq == leader.replication.seq:
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_late_follower_starts_from_a_snapshot(leader, follow):
+    tracker, port = leader
+    for turn in range(20):
+        play(tracker, turn)
+    follower = follow(port)
+    assert caught_up(follower, tracker)
+    assert game_of(follower.tracker) == game_of(tracker)
+
+
+def test_follower_keeps_up_with_live_changes(leader, follow):
+    tracker, port = leader
+    follower = follow(port)
+    assert caught_up(follower, tracker)
+    a, b, c = tracker.players
+    tracker.purchase_property(a, tracker.properties[0])
+    tracker.purchase_property(a, tracker.properties[1])
+    tracker.build_house(a, tracker.properties[0])
+    with tracker.batch() as batch:
+        batch.sell_property(a, c, tracker.properties[1], 300)
+        batch.from_bank(b, 50)
+    tracker.bank_loan(b, 100)
+    for turn in range(12):
+        play(tracker, turn)
+    assert caught_up(follower, tracker)
+    assert game_of(follower.tracker) == game_of(tracker)
+
+
+def test_a_load_on_the_leader_resyncs_followers(leader, follow, tmp_path):
+    tracker, port = leader
+    follower = follow(port)
+    play(tracker, 0)
+    tracker.save_game()
+    for turn in range(1, 4):
+        play(tracker, turn)
+    assert caught_up(follower, tracker)
+    tracker.load_game()
+    assert caught_up(follower, tracker)
+    assert game_of(follower.tracker) == game_of(tracker)
+
+
+def test_records_are_trimmed_at_snapshots(tmp_path):
+    tracker = MonopolyTracker(save_file=str(tmp_path / "leader.json"))
+    log = ReplicationLog(tracker, snapshot_interval=4)
+    for seq in range(1, 15):
+        log.publish({"game_data": {"n": seq}})
+        assert log.first + len(log.lines) - 1 == log.seq == seq
+        assert len(log.lines) < 2 * log.snapshot_interval
+
+    def streamed(after_seq):
+        written = []
+        thread = threading.Thread(target=log.stream, args=(written.append, after_seq))
+        thread.start()
+        while not written:
+            time.sleep(0.01)
+        return written, thread
+
+    written, recent = streamed(12)  # Still kept: just the missing records
+    assert [json.loads(line)["seq"] for line in b"".join(written).splitlines()] == [13, 14]
+    written, old = streamed(3)  # Trimmed: a snapshot first
+    assert json.loads(written[0])["seq"] == log._snapshot[0]
+    log.close()
+    recent.join(5)
+    old.join(5)
+    assert not recent.is_alive() and not old.is_alive()
@@ -0,0 +1,120 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from core import save_format
+from core.errors import LoadError
+from core.game_engine import MonopolyTracker
+from create_save_file import create_save_file
+from migrate_save_file import migrate_save_file
+
+PINK_VAUGIRARD = 15
+SHIPPED_SAVE = os.path.join(os.path.dirname(__file__), "..", "data", "saved_games", "latest.json")
+
+
+def played(tracker, players):
+    a, b, _ = players
+    tracker.purchase_property(a, tracker.properties[PINK_VAUGIRARD])
+    tracker.purchase_property(b, tracker.properties[0])
+    tracker.mortgage(b, tracker.properties[0])
+    tracker.transfer(a, b, 75)
+    a.position, a.in_jail = 12, True
+    tracker.lend(b, a, 30)
+    return tracker
+
+
+def game_of(tracker):
+    return ([(p.name, p.money, p.position, p.in_jail, [tracker.registry.index_of(prop) for prop in p.properties])
+             for p in tracker.players],
+            [(prop.owner.name if prop.owner else None, prop.houses, prop.mortgaged) for prop in tracker.properties],
+            list(tracker.transaction_log), tracker.loans.to_dict())
+
+
+@pytest.mark.parametrize("binary, compress", [(False, False), (True, False), (True, True)])
+def test_save_round_trips(tracker, players, save_file, binary, compress):
+    played(tracker, players)
+    tracker.binary_saves, tracker.compress_saves = binary, compress
+    tracker.save_game({"note": 1})
+
+    loaded = MonopolyTracker(save_file=save_file)
+    loaded.load_game()
+    assert game_of(loaded) == game_of(tracker)
+    assert loaded.game_data == {"note": 1}
+    assert [loaded.transaction_log.event(i) for i in range(len(loaded.transaction_log))] == \
+        [tracker.transaction_log.event(i) for i in range(len(tracker.transaction_log))]
+
+
+def test_catalog_is_stored_once(tracker, players, save_file):
+    played(tracker, players)
+    tracker.save_game()
+    with open(save_file, encoding="utf-8") as f:
+        document = json.load(f)
+
+    assert document["format"] == save_format.FORMAT_VERSION
+    assert "properties" not in document["players"][0]
+    assert document["owners"][PINK_VAUGIRARD] == 0
+    assert document["mortgaged"][0] == 1
+
+
+def test_original_layout_is_migrated_on_load(tmp_path):
+    path = str(tmp_path / "v1.json")
+    create_save_file(path)
+    tracker = MonopolyTracker(save_file=path)
+    tracker.load_game()
+
+    john, jane = tracker.players
+    assert (john.name, john.money, jane.money) == ("John", 1300, 1450)
+    assert [prop.name for prop in john.properties] == ["Rue de la Paix"]
+    assert tracker.properties[0].owner is john
+    rent = tracker.transaction_log.event(len(tracker.transaction_log) - 1)
+    assert (rent["kind"], rent["property_id"]) == ("rent_received", 0)
+
+
+def test_embedded_properties_are_matched_by_name_and_price(tracker):
+    catalog = [{"name": prop.name, "price": prop.price, "rent": prop.rent, "color_group": prop.color_group}
+               for prop in tracker.properties]
+    pink = catalog[PINK_VAUGIRARD]
+    data = {"players": [{"name": "John", "money": 1500, "properties": [dict(pink, owner="John")]}],
+            "properties": catalog}  # Ownership only recorded on the player
+    document = save_format.migrate_v1(data)
+    assert [i for i, owner in enumerate(document["owners"]) if owner == 0] == [PINK_VAUGIRARD]
+
+    data["players"][0]["properties"] = [pink["name"]]  # A bare name takes the first unowned match
+    assert save_format.migrate_v1(data)["owners"][PINK_VAUGIRARD] == 0
+
+
+def test_migrate_script_upgrades_the_shipped_save(tmp_path):
+    source = str(tmp_path / "old.json")
+    shutil.copy(SHIPPED_SAVE, source)
+    for binary in (False, True):
+        destination = str(tmp_path / f"new-{binary}.save")
+        migrate_save_file(source, destination, binary=binary, compress=binary)
+        document = save_format.read_document(destination)
+        assert document["format"] == save_format.FORMAT_VERSION
+        assert "property_ids" in document["transactions"]
+        assert [p["name"] for p in document["players"]] == ["a", "b", "c"]
+
+
+def test_version_2_documents_get_event_columns(tracker, players):
+    played(tracker, players)
+    document = tracker.capture_state()["document"]
+    document["format"] = 2
+    document["transactions"] = {name: values for name, values in tracker.transaction_log.columns().items()
+                                if name not in ("kinds", "property_ids")}
+    upgraded = save_format.upgrade_document(document)
+
+    assert upgraded["format"] == save_format.FORMAT_VERSION
+    assert list(upgraded["transactions"]["kinds"]) == list(tracker.transaction_log.kinds)
+
+
+def test_unknown_versions_are_refused(tracker, save_file):
+    with open(save_file, "w", encoding="utf-8") as f:
+        json.dump({"format": 99}, f)
+    with pytest.raises(LoadError, match="Unsupported save format"):
+        tracker.load_game()
+    with open(save_file, "wb") as f:
+        f.write(save_format.HEADER.pack(save_format.MAGIC, 99, 0))
+    with pytest.raises(LoadError, match="Unsupported save format"):
+        tracker.load_game()
@@ -0,0 +1,140 @@
+import asyncio
+import json
+
+import pytest
+
+from core.server import GameServer
+
+PINK_VAUGIRARD = 15
+
+
+@pytest.fixture
+def server(tmp_path):
+    return GameServer(str(tmp_path / "games"))
+
+
+def call(server, op, game="g1", **args):
+    line = json.dumps({"id": 7, "op": op, "game": game, "args": args})
+    response = json.loads(asyncio.run(server.handle(line)))
+    assert response["id"] == 7
+    return response
+
+
+def ok(server, op, game="g1", **args):
+    response = call(server, op, game, **args)
+    assert response["ok"], response["error"]
+    return response["result"]
+
+
+def error(server, op, game="g1", **args):
+    response = call(server, op, game, **args)
+    assert not response["ok"]
+    return response["error"]
+
+
+@pytest.fixture
+def game(server):
+    ok(server, "open")
+    for name in ("A", "B"):
+        ok(server, "add_player", name=name)
+    return server
+
+
+def test_games_are_opened_by_id(server):
+    assert ok(server, "open")["players"] == {}
+    assert ok(server, "games") == ["g1"]
+    assert "Invalid game id" in error(server, "open", game="../etc")
+    assert "is not open" in error(server, "state", game="g2")
+    assert "Unknown operation" in error(server, "fly")
+    assert "Bad request" in json.loads(asyncio.run(server.handle(b"{not json")))["error"]
+
+
+def test_players_are_created_once(game):
+    log = game.games["g1"].tracker.transaction_log
+    assert [row["reason"] for row in log if row["player"] in ("A", "B")] == ["Player created"] * 2
+    assert "already exists" in error(game, "add_player", name="A")
+    assert "non-empty string" in error(game, "add_player", name="")
+    assert "non-empty string" in error(game, "add_player", name=3)
+
+
+def test_properties_by_index_or_unique_name(game):
+    ok(game, "purchase", player="A", property=0)
+    ok(game, "purchase", player="B", property="Boulevard de la Villette")
+    ok(game, "purchase", player="B", property=PINK_VAUGIRARD)
+    state = ok(game, "state")
+    assert state["players"]["A"]["properties"] == ["Rue de la Paix"]
+    assert state["properties"][PINK_VAUGIRARD]["owner"] == "B"
+
+    assert "use the catalog index" in error(game, "purchase", player="A", property="Rue de Vaugirard")
+    assert "No property named" in error(game, "purchase", player="A", property="Park Place")
+    assert "between 0 and" in error(game, "purchase", player="A", property=len(state["properties"]))
+    assert "No property named True" in error(game, "purchase", player="A", property=True)
+    assert "No player named" in error(game, "purchase", player="Z", property=1)
+
+
+@pytest.mark.parametrize("op, args, message", [
+    ("transfer", {"payer": "A", "recipient": "B", "amount": 1.5}, "whole number"),
+    ("transfer", {"payer": "A", "recipient": "B", "amount": True}, "whole number"),
+    ("transfer", {"payer": "A", "recipient": "B", "amount": 0}, "between 1 and"),
+    ("transfer", {"payer": "A", "recipient": "B", "amount": 2 ** 40}, "between 1 and"),
+    ("transfer", {"payer": "A", "recipient": "B", "amount": 5000}, "enough money"),
+    ("adjust", {"player": "A", "amount": 2 ** 31 - 1}, "out of range"),
+    ("move", {"player": "A", "position": 40}, "between 0 and 39"),
+    ("rent", {"payer": "A", "property": 0, "dice_roll": 13}, "between 2 and 12"),
+    ("transfer", {"payer": "A", "amount": 5}, "Bad request"),
+])
+def test_bad_arguments_change_nothing(game, op, args, message):
+    before = ok(game, "state")
+    assert message in error(game, op, **args)
+    assert ok(game, "state") == before
+
+
+def test_actions_apply(game):
+    ok(game, "adjust", player="A", amount=-100)
+    ok(game, "transfer", payer="A", recipient="B", amount=400)
+    ok(game, "move", player="B", position=39)
+    ok(game, "lend", lender="B", borrower="A", amount=50)
+    players = ok(game, "state")["players"]
+    assert (players["A"]["money"], players["B"]["money"], players["B"]["position"]) == (1050, 1850, 39)
+    start = ok(game, "state")["transactions"] - 5  # adjust, transfer (2), loan (2)
+    rows = ok(game, "transactions", start=start, limit=2)
+    assert [row["reason"] for row in rows] == ["Manual adjustment", "Transferred to B"]
+
+
+def test_close_saves_and_open_reloads(game):
+    ok(game, "adjust", player="A", amount=25)
+    ok(game, "close")
+    assert ok(game, "games") == []
+    assert ok(game, "open")["players"]["A"]["money"] == 1525
+
+
+def test_subscribers_get_diffs(server):
+    async def scenario():
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+            async def send(op, **args):
+                writer.write((json.dumps({"id": op, "op": op, "game": "g1", "args": args}) + "\n").encode())
+                await writer.drain()
+                while True:
+                    message = json.loads(await asyncio.wait_for(reader.readline(), 5))
+                    if message.get("id") == op:
+                        return message
+                    events.append(message)
+
+            events = []
+            await send("open")
+            assert (await send("subscribe"))["result"]["seq"] == 0
+            await send("add_player", name="A")
+            await send("adjust", player="A", amount=10)
+            await send("state")
+            writer.close()
+            return events
+
+    events = asyncio.run(scenario())
+    assert [(event["event"], event["seq"]) for event in events] == [("diff", 1), ("diff", 2)]
+    assert "snapshot" in events[0]["diff"]  # A new player changes the roster
+    assert events[1]["diff"]["players"]["A"]["money"] == 1510
+    assert events[1]["diff"]["transactions"]["rows"][-1]["reason"] == "Manual adjustment"
@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from core import board
+from core.simulator import SimulationResult, TableState, simulate, simulate_shard
+
+
+@pytest.fixture
+def table(tracker, players):
+    a, b, _ = players
+    for prop in tracker.properties[:3]:
+        tracker.purchase_property(a, prop)
+    return tracker
+
+
+def test_table_state_maps_owned_squares(table):
+    state = TableState.from_tracker(table)
+    squares = board.property_squares(table.properties)
+
+    assert state.names == ["A", "B", "C"]
+    assert [state.square_owner[square] for square in squares[:4]] == [0, 0, 0, -1]
+    assert state.square_rent[squares[0]] == table.rent_engine.rent_for(table.properties[0])
+    assert state.balances == [p.money for p in table.players]
+
+
+def test_same_seed_gives_the_same_games(table):
+    first = simulate(table, games=200, turns=50, workers=1, seed=7)
+    second = simulate(table, games=200, turns=50, workers=1, seed=7)
+
+    assert first.bankruptcies == second.bankruptcies
+    assert first.balance_totals == second.balance_totals
+    assert first.games == 200
+    assert 0 < first.turns <= 200 * 50
+
+
+def test_results_are_averaged_per_game(table):
+    result = simulate(table, games=100, turns=100, workers=1, seed=1)
+
+    assert set(result.bankruptcy_odds()) == {"A", "B", "C"}
+    assert all(0 <= odds <= 1 for odds in result.bankruptcy_odds().values())
+    assert sum(result.expected_rent_by_group().values()) >= 0
+    assert set(result.expected_rent_by_group()) == set(prop.color_group for prop in table.properties)
+
+
+def test_rent_only_reaches_owned_groups(table):
+    result = simulate_shard(TableState.from_tracker(table), games=300, turns=60, seed=3)
+    owned_groups = {prop.color_group for prop in table.properties[:3]}
+    rent = result.expected_rent_by_group()
+
+    assert all(rent[group] > 0 for group in owned_groups)
+    assert all(rent[group] == 0 for group in rent if group not in owned_groups)
+
+
+def test_merge_adds_shards():
+    a = SimulationResult(["A"], ["g"], 10, 100, [1], [500], [30])
+    b = SimulationResult(["A"], ["g"], 30, 300, [2], [1500], [90])
+    merged = a.merge(b)
+
+    assert (merged.games, merged.turns) == (40, 400)
+    assert merged.bankruptcy_odds() == {"A": 3 / 40}
+    assert merged.expected_balances() == {"A": 50}
+    assert merged.expected_rent_by_group() == {"g": 3}
@@ -0,0 +1,99 @@
+import json
+import os
+
+import pytest
+
+from core import slots
+from core.game_engine import MonopolyTracker
+from core.player import Player
+
+
+def save_slot(folder, name, money, saved_at=None):
+    tracker = MonopolyTracker(save_file=slots.slot_path(name, str(folder)))
+    player = Player("A")
+    tracker.add_player(player)
+    tracker.adjust_money(player, money - player.money)
+    tracker.save_game()
+    if saved_at is not None:
+        with open(slots.metadata_path(tracker.save_file), encoding="utf-8") as f:
+            metadata = json.load(f)
+        slots.write_metadata(tracker.save_file, dict(metadata, saved_at=saved_at))
+    return tracker
+
+
+def test_slot_names_are_file_names(tmp_path):
+    assert slots.slot_path("Game 2", str(tmp_path)) == str(tmp_path / "Game 2.json")
+    assert slots.slot_name(str(tmp_path / "Game 2.json")) == "Game 2"
+    for name in ("", "../up", " padded", "a" * 65, None):
+        with pytest.raises(ValueError, match="Invalid save slot name"):
+            slots.slot_path(name, str(tmp_path))
+
+
+def test_catalog_lists_the_newest_slot_first(tmp_path):
+    tracker = save_slot(tmp_path, "older", 1000, saved_at=100)
+    save_slot(tmp_path, "newer", 2000, saved_at=200)
+    (tmp_path / "notes.txt").write_text("skipped")
+    listed = slots.SlotCatalog(str(tmp_path)).refresh()
+
+    assert [slot["name"] for slot in listed] == ["newer", "older"]
+    older = listed[1]
+    assert older["players"] == [("A", 1000)]
+    assert older["transactions"] == len(tracker.transaction_log)
+    assert older["path"] == tracker.save_file
+    assert older["size"] == os.path.getsize(tracker.save_file)
+
+
+def test_unchanged_slots_are_not_read_again(tmp_path, monkeypatch):
+    save_slot(tmp_path, "one", 1000)
+    save_slot(tmp_path, "two", 1000)
+    catalog = slots.SlotCatalog(str(tmp_path))
+    catalog.refresh()
+
+    reads = []
+    read_metadata = slots.read_metadata
+    monkeypatch.setattr(slots, "read_metadata",
+                        lambda path, stat=None: reads.append(path) or read_metadata(path, stat))
+    catalog.refresh()
+    assert reads == []
+    save_slot(tmp_path, "two", 30000)  # A different size, whatever the clock resolution
+    assert dict(catalog.refresh()[0]["players"]) == {"A": 30000}
+    assert reads == [slots.slot_path("two", str(tmp_path))]
+
+
+def test_stale_or_missing_sidecars_are_rebuilt(tmp_path):
+    tracker = save_slot(tmp_path, "game", 1000)
+    sidecar = slots.metadata_path(tracker.save_file)
+    with open(sidecar, encoding="utf-8") as f:
+        metadata = json.load(f)
+    with open(sidecar, "w", encoding="utf-8") as f:
+        json.dump(dict(metadata, players=[["Ghost", 1]], save_size=1), f)  # Left by an older save
+    assert slots.read_metadata(tracker.save_file) is None
+    assert slots.SlotCatalog(str(tmp_path)).refresh()[0]["players"] == [("A", 1000)]
+
+    os.remove(sidecar)
+    assert slots.SlotCatalog(str(tmp_path)).refresh()[0]["players"] == [("A", 1000)]
+    assert slots.read_metadata(tracker.save_file)["players"] == [["A", 1000]]
+
+
+def test_unreadable_saves_are_skipped(tmp_path):
+    save_slot(tmp_path, "good", 1000)
+    (tmp_path / "broken.json").write_text("{not json")
+    assert [slot["name"] for slot in slots.SlotCatalog(str(tmp_path)).refresh()] == ["good"]
+    assert slots.SlotCatalog(str(tmp_path / "missing")).refresh() == []
+
+
+def test_switching_slots_saves_elsewhere(tmp_path, tracker, players):
+    first = slots.slot_path("first", str(tmp_path))
+    second = slots.slot_path("second", str(tmp_path))
+    tracker.use_save_file(first)
+    tracker.save_game()
+    tracker.adjust_money(players[0], 5)
+    tracker.use_save_file(second)
+    tracker.save_game()
+
+    loaded = MonopolyTracker(save_file=first)
+    loaded.load_game()
+    assert loaded.players[0].money == 1500
+    loaded.use_save_file(second)
+    loaded.load_game()
+    assert loaded.players[0].money == 1505
@@ -0,0 +1,81 @@
+from array import array
+
+import pytest
+
+from core.board import HOUSE_COSTS
+from core.stats import BUCKET_SECONDS, GameStats, net_worth
+from core.transaction_log import TransactionLog
+
+
+@pytest.fixture
+def game(tracker, players):
+    a, b, c = players
+    tracker.purchase_property(a, tracker.properties[0])
+    tracker.purchase_property(a, tracker.properties[1])
+    tracker.build_house(a, tracker.properties[0])
+    tracker.charge_rent(b, tracker.properties[0])
+    tracker.charge_rent(c, tracker.properties[1])
+    tracker.transfer(c, b, 40)
+    return tracker
+
+
+def totals_of(stats):
+    return (stats.players, stats.property_rent, stats.property_landings, stats.group_rent, stats.histogram)
+
+
+def recorded(log, properties):
+    # The totals log_transaction would have kept, entry by entry
+    stats = GameStats(properties)
+    for i in range(len(log)):
+        stats.record(log.kinds[i], log.player_names[log.player_ids[i]], log.amounts[i],
+                     log.property_ids[i], log.timestamps[i])
+    return stats
+
+
+def test_running_totals_match_a_rebuild(game):
+    rebuilt = GameStats.from_log(game.transaction_log, game.properties)
+    assert totals_of(rebuilt) == totals_of(game.stats)
+    assert totals_of(GameStats.from_log(TransactionLog(), game.properties)) == totals_of(GameStats(game.properties))
+
+
+def test_sparse_logs_take_the_sorted_path(game):
+    log = game.transaction_log
+    log.timestamps = array("q", (i * 1000 * BUCKET_SECONDS for i in range(len(log))))
+    assert totals_of(GameStats.from_log(log, game.properties)) == totals_of(recorded(log, game.properties))
+
+
+def rents_of(game):
+    log = game.transaction_log
+    return {log.property_ids[i]: log.amounts[i] for i in range(len(log)) if log.event(i)["kind"] == "rent_received"}
+
+
+def test_rent_is_credited_to_properties_and_groups(game):
+    rents = rents_of(game)
+    stats = game.stats
+    assert stats.property_rent[:2] == [rents[0], rents[1]]
+    assert stats.property_landings[:2] == [1, 1] and sum(stats.property_landings) == 2
+    assert stats.group_rent == {"Dark Blue": rents[0] + rents[1]}
+
+
+def test_player_summary(game):
+    summary = game.stats.player_summary("B")
+    assert summary["rent_paid"] == rents_of(game)[0] and summary["rent_paid_count"] == 1
+    assert summary["money_in"] == 40
+    assert game.stats.player_summary("A")["rent_received_count"] == 2
+    assert game.stats.player_summary("Nobody")["transactions"] == 0
+
+
+def test_recent_flow_is_bucketed(tracker, players):
+    stats = GameStats(tracker.properties)
+    stats.record(0, "A", 100, -1, 0)
+    stats.record(0, "A", -30, -1, BUCKET_SECONDS)
+    stats.record(0, "A", -20, -1, BUCKET_SECONDS + 1)
+    assert stats.recent_flow("A", buckets=3) == [0, 100, -50]
+    assert stats.recent_flow("A", buckets=2, now=3 * BUCKET_SECONDS) == [0, 0]
+    assert stats.recent_flow("B", buckets=2) == [0, 0]
+
+
+def test_net_worth_counts_properties_and_houses(game):
+    a = game.players[0]
+    first, second = game.properties[0], game.properties[1]
+    assert net_worth(a) == a.money + first.price + second.price + HOUSE_COSTS["Dark Blue"]
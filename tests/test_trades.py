@@ -0,0 +1,88 @@
+import pytest
+
+from core import analytics
+from core.errors import RuleError
+from core.player import Player
+from core.trades import PER_PAIR, describe
+
+
+@pytest.fixture(autouse=True)
+def landing(monkeypatch):
+    monkeypatch.setattr(analytics, "landing_per_turn", lambda properties: [
+        0.01 + 0.003 * (i % 7) for i in range(len(properties))])
+
+
+@pytest.fixture
+def split(tracker, players):
+    # Dark Blue and Green split between A and B, C holds a railroad
+    a, b, c = players
+    for player, indexes in ((a, (0, 2, 3)), (b, (1, 4, 21)), (c, (22,))):
+        for i in indexes:
+            tracker.purchase_property(player, tracker.properties[i])
+    return tracker
+
+
+def test_suggestions_help_both_sides(split):
+    trades = split.trade_suggestions()
+    assert trades
+    assert [trade["surplus"] for trade in trades] == sorted((trade["surplus"] for trade in trades), reverse=True)
+    pairs = {}
+    for trade in trades:
+        assert trade["gains"][0] > 0 and trade["gains"][1] > 0
+        assert trade["surplus"] == pytest.approx(sum(trade["gains"]))
+        assert split.trades.evaluate(trade["a"], trade["b"], trade["give"], trade["take"], trade["cash"],
+                                     len(split.players)) == pytest.approx(trade["gains"])
+        pair = (trade["a"].name, trade["b"].name)
+        pairs[pair] = pairs.get(pair, 0) + 1
+        assert all(prop.owner is trade["a"] for prop in trade["give"])
+        assert all(prop.owner is trade["b"] for prop in trade["take"])
+    assert max(pairs.values()) <= PER_PAIR
+    assert len(split.trade_suggestions(limit=1)) == 1
+
+
+def test_two_players_have_nothing_to_gain(tracker):
+    a, b = Player("A"), Player("B")
+    for player in (a, b):
+        tracker.add_player(player)
+    tracker.purchase_property(a, tracker.properties[0])
+    tracker.purchase_property(b, tracker.properties[1])
+    assert tracker.trade_suggestions() == []
+    gain_a, gain_b = tracker.trades.evaluate(a, b, [tracker.properties[0]], [], 0, 2)
+    assert gain_a == pytest.approx(-gain_b)
+
+
+def test_unaffordable_trades_are_left_out(split):
+    for trade in split.trade_suggestions():
+        payer = trade["a"] if trade["cash"] > 0 else trade["b"]
+        payer.money = 0
+    assert all(trade["cash"] == 0 for trade in split.trade_suggestions())
+
+
+def test_suggestions_follow_ownership_changes(split):
+    before = split.trade_suggestions()
+    assert split.trade_suggestions() == before  # Cached
+    split.sell_property(split.players[1], split.players[0], split.properties[1], 100)
+    after = split.trade_suggestions()
+    assert after != before
+    for trade in after:
+        assert all(prop.owner is trade["a"] for prop in trade["give"])
+        assert all(prop.owner is trade["b"] for prop in trade["take"])
+
+
+def test_execute_trade(split):
+    trade = split.trade_suggestions()[0]
+    a, b, cash = trade["a"], trade["b"], trade["cash"]
+    money = (a.money, b.money)
+    split.execute_trade(trade)
+    assert all(prop.owner is b for prop in trade["give"]) and all(prop.owner is a for prop in trade["take"])
+    assert (a.money, b.money) == (money[0] - cash, money[1] + cash)
+    assert describe(trade).startswith(f"{a.name} gives ")
+
+
+def test_mortgaged_properties_cannot_be_traded(split):
+    a, b, _ = split.players
+    split.mortgage(a, split.properties[0])
+    trade = {"a": a, "b": b, "give": [split.properties[0]], "take": [], "cash": 0}
+    with pytest.raises(RuleError, match="buildings or a mortgage"):
+        split.execute_trade(trade)
+    assert all(split.properties[0] not in t["give"] + t["take"] for t in split.trade_suggestions())
@@ -0,0 +1,103 @@
+import pytest
+
+from core.errors import RuleError
+from core.transaction_log import TransactionLog, COLUMNS, NO_PROPERTY
+
+NOW = 1_700_000_000
+
+
+def lengths(log):
+    return {len(getattr(log, name)) for name in COLUMNS}
+
+
+def test_record_round_trips_as_dict_rows():
+    log = TransactionLog()
+    log.record("A", -50, "Paid rent for Rue de la Paix", 1450, NOW)
+    log.record("Bank", 400, "Created Rue de la Paix", timestamp=NOW, kind="created", property_id=0)
+
+    assert log[0] == {"timestamp": log.format_time(NOW), "player": "A", "amount": -50,
+                      "new_balance": 1450, "reason": "Paid rent for Rue de la Paix"}
+    assert "new_balance" not in log[1]
+    assert log[-1]["player"] == "Bank"
+    assert [row["amount"] for row in log] == [-50, 400]
+    assert log.player_names == ["A", "Bank"]
+
+
+def test_event_view_types_the_entry():
+    log = TransactionLog()
+    log.record("A", -50, "Paid rent for Rue de la Paix", 1450, NOW, property_id=0)
+    event = log.event(0)
+
+    assert event["kind"] == "rent_paid"
+    assert event["balance"] == 1450
+    assert event["property_id"] == 0
+
+
+def test_columns_round_trip():
+    log = TransactionLog()
+    for i in range(5):
+        log.record(f"P{i % 2}", i, "Manual adjustment", 1500 + i, NOW + i)
+    copy = TransactionLog.from_columns(log.columns())
+
+    assert list(copy) == list(log)
+    assert len(TransactionLog.from_columns(log.columns(3))) == 3
+
+
+def test_entries_constructor_matches_dicts():
+    rows = [{"timestamp": "2024-01-01 12:00:00", "player": "A", "amount": 5, "new_balance": 1505,
+             "reason": "Manual adjustment"}]
+    assert list(TransactionLog(rows)) == rows
+
+
+@pytest.mark.parametrize("amount, error", [(3_000_000_000, OverflowError), (-2 ** 31 - 1, OverflowError),
+                                           (1.5, TypeError), ("10", TypeError)])
+def test_bad_amount_leaves_columns_aligned(amount, error):
+    log = TransactionLog()
+    log.record("A", 1, "Manual adjustment", 1501, NOW)
+    with pytest.raises(error):
+        log.record("B", amount, "Manual adjustment", 1500, NOW)
+
+    assert lengths(log) == {1}
+    assert log.player_names == ["A"]
+
+
+def test_bad_balance_leaves_columns_aligned():
+    log = TransactionLog()
+    with pytest.raises(OverflowError):
+        log.record("A", 1, "Manual adjustment", 2 ** 31, NOW)
+    assert lengths(log) == {0}
+
+
+def test_record_many_is_all_or_nothing():
+    log = TransactionLog()
+    rows = [("A", 10, "Received from B", 1510, "transfer_in", NO_PROPERTY),
+            ("B", 2 ** 40, "Transferred to A", 1490, "transfer_out", NO_PROPERTY)]
+    with pytest.raises(OverflowError):
+        log.record_many(rows, NOW)
+    assert lengths(log) == {0}
+
+    log.record_many(rows[:1], NOW)
+    assert log[0]["amount"] == 10
+
+
+def test_slices_and_bounds():
+    log = TransactionLog()
+    for i in range(3):
+        log.record("A", i, "Manual adjustment", None, NOW)
+
+    assert [row["amount"] for row in log[1:]] == [1, 2]
+    with pytest.raises(IndexError):
+        log[3]
+
+
+@pytest.mark.parametrize("amount", [3_000_000_000, 1.5])
+def test_engine_rejects_amount_before_moving_money(tracker, players, amount):
+    a = players[0]
+    before = len(tracker.transaction_log)
+    with pytest.raises(RuleError):
+        tracker.adjust_money(a, amount)
+    with pytest.raises(RuleError):
+        tracker.transfer(players[1], a, 2 ** 31 - 1)
+
+    assert a.money == 1500
+    assert lengths(tracker.transaction_log) == {before}